@@ -355,6 +355,13 @@ def main():
 
 
 if __name__ == "__main__":
+    # Event loops created from here on (broker WebSockets, OMS) use libuv
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     try:
         main()
     except KeyboardInterrupt:
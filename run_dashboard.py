@@ -13,4 +13,11 @@ sys.path.insert(0, str(Path(__file__).parent / 'src'))
 from src.dashboard.app import run_dashboard
 
 if __name__ == '__main__':
+    # Event loops created from here on (broker WebSockets, OMS) use libuv
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     run_dashboard(host='0.0.0.0', port=8050, debug=False)
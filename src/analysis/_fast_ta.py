@@ -0,0 +1,161 @@
+"""
+Fast Technical Indicator Kernels
+Single-pass RSI, MACD and ADX that reproduce the ta library's output
+"""
+
+import numpy as np
+
+from ..utils.jit import njit
+
+
+@njit(cache=True)
+def _ewm(values: np.ndarray, alpha: float, min_periods: int) -> np.ndarray:
+    """
+    Exponential moving average matching pandas ewm(adjust=False).mean()
+
+    Leading NaNs are skipped; the first valid value seeds the average and the
+    output stays NaN until min_periods valid values have been seen.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+
+    avg = 0.0
+    seen = 0
+    for i in range(n):
+        value = values[i]
+        if np.isnan(value):
+            continue
+        if seen == 0:
+            avg = value
+        else:
+            avg = (1.0 - alpha) * avg + alpha * value
+        seen += 1
+        if seen >= min_periods:
+            out[i] = avg
+
+    return out
+
+
+@njit(cache=True)
+def rsi(close: np.ndarray, window: int = 14) -> np.ndarray:
+    """RSI with Wilder smoothing, as ta.momentum.RSIIndicator(close, window).rsi()"""
+    n = len(close)
+    out = np.full(n, np.nan)
+    alpha = 1.0 / window
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(n):
+        # The first bar has no change and counts as a zero move
+        change = close[i] - close[i - 1] if i > 0 else 0.0
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+
+        if i == 0:
+            avg_gain = gain
+            avg_loss = loss
+        else:
+            avg_gain = (1.0 - alpha) * avg_gain + alpha * gain
+            avg_loss = (1.0 - alpha) * avg_loss + alpha * loss
+
+        if i >= window - 1:
+            if avg_loss == 0:
+                out[i] = 100.0
+            else:
+                out[i] = 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+
+    return out
+
+
+def rsi_step(avg_gain: float, avg_loss: float, change: float, window: int = 14):
+    """
+    Advance RSI by one bar without recomputing the window
+
+    Args:
+        avg_gain: Smoothed gain after the previous bar
+        avg_loss: Smoothed loss after the previous bar
+        change: Close-to-close change of the new bar
+        window: RSI period
+
+    Returns:
+        Tuple of (avg_gain, avg_loss, rsi) after the new bar
+    """
+    alpha = 1.0 / window
+    avg_gain = (1.0 - alpha) * avg_gain + alpha * max(change, 0.0)
+    avg_loss = (1.0 - alpha) * avg_loss + alpha * max(-change, 0.0)
+
+    if avg_loss == 0:
+        return avg_gain, avg_loss, 100.0
+    return avg_gain, avg_loss, 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+
+
+@njit(cache=True)
+def macd(close: np.ndarray, window_fast: int = 12, window_slow: int = 26, window_sign: int = 9):
+    """
+    MACD line, signal and histogram, as ta.trend.MACD(close)
+
+    Returns:
+        Tuple of (macd, macd_signal, macd_diff) arrays
+    """
+    ema_fast = _ewm(close, 2.0 / (window_fast + 1), window_fast)
+    ema_slow = _ewm(close, 2.0 / (window_slow + 1), window_slow)
+    macd_line = ema_fast - ema_slow
+    macd_signal = _ewm(macd_line, 2.0 / (window_sign + 1), window_sign)
+    return macd_line, macd_signal, macd_line - macd_signal
+
+
+@njit(cache=True)
+def adx(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> np.ndarray:
+    """
+    Average Directional Index, as ta.trend.ADXIndicator(high, low, close, window).adx()
+
+    Follows ta's layout exactly: the first window - 1 slots are zero and the
+    smoothed series starts after a further window bars. Needs at least
+    2 * window bars.
+    """
+    n = len(close)
+    length = n - (window - 1)
+    if length <= window:
+        raise ValueError("ADX needs at least 2 * window bars")
+
+    # Wilder-smoothed true range and directional movement, seeded from bars 1..window
+    trs = np.zeros(length)
+    dip = np.zeros(length)
+    din = np.zeros(length)
+    for t in range(1, window + 1):
+        trs[0] += max(high[t], close[t - 1]) - min(low[t], close[t - 1])
+        up = high[t] - high[t - 1]
+        down = low[t - 1] - low[t]
+        if up > down and up > 0:
+            dip[0] += up
+        if down > up and down > 0:
+            din[0] += down
+
+    for i in range(1, length - 1):
+        t = window + i
+        true_range = max(high[t], close[t - 1]) - min(low[t], close[t - 1])
+        up = high[t] - high[t - 1]
+        down = low[t - 1] - low[t]
+        trs[i] = trs[i - 1] - (trs[i - 1] / window) + true_range
+        dip[i] = dip[i - 1] - (dip[i - 1] / window) + (up if up > down and up > 0 else 0.0)
+        din[i] = din[i - 1] - (din[i - 1] / window) + (down if down > up and down > 0 else 0.0)
+
+    directional_index = np.zeros(length)
+    for i in range(length):
+        if trs[i] != 0:
+            di_pos = 100 * (dip[i] / trs[i])
+            di_neg = 100 * (din[i] / trs[i])
+        else:
+            di_pos = 0.0
+            di_neg = 0.0
+        if di_pos + di_neg != 0:
+            directional_index[i] = 100 * np.abs((di_pos - di_neg) / (di_pos + di_neg))
+
+    out = np.zeros(n)
+    smoothed = directional_index[0:window].mean()
+    out[window - 1 + window] = smoothed
+    for i in range(window + 1, length):
+        smoothed = ((smoothed * (window - 1)) + directional_index[i - 1]) / float(window)
+        out[window - 1 + i] = smoothed
+
+    return out
@@ -5,7 +5,7 @@ Detects 50+ candlestick patterns using TA-Lib (with fallback to mock data)
 
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 import random
 
 
@@ -144,12 +144,16 @@ class CandlestickPatternDetector:
 
         return mock_patterns
 
-    def get_active_patterns(self, index: int = -1) -> List[Dict[str, Any]]:
+    def get_active_patterns(self, index: int = -1, min_confidence: float = 0.0,
+                            pattern_types: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
         """
         Get all patterns active at a specific candle
 
         Args:
             index: Candle index (-1 = latest)
+            min_confidence: Skip patterns scoring below this (0-100)
+            pattern_types: Only return these types, e.g. {'bullish_reversal'}
+                (default: all)
 
         Returns:
             list: [{'name': 'hammer', 'signal': 100, 'type': 'bullish_reversal'}, ...]
@@ -165,15 +169,26 @@ class CandlestickPatternDetector:
                 # Mock data returns single signal
                 signal = signals
 
-            if signal != 0:
-                active.append({
-                    'name': pattern_name,
-                    'signal': int(signal),  # 100 = bullish, -100 = bearish
-                    'type': self._get_pattern_type(pattern_name, signal),
-                    'confidence': self._calculate_confidence(pattern_name),
-                    'description': self.PATTERN_DESCRIPTIONS.get(pattern_name, 'Pattern detected'),
-                    'source': 'candlestick'
-                })
+            if signal == 0:
+                continue
+
+            # Reject on the cheap gates before building the result dict
+            pattern_type = self._get_pattern_type(pattern_name, signal)
+            if pattern_types is not None and pattern_type not in pattern_types:
+                continue
+
+            confidence = self._calculate_confidence(pattern_name)
+            if confidence < min_confidence:
+                continue
+
+            active.append({
+                'name': pattern_name,
+                'signal': int(signal),  # 100 = bullish, -100 = bearish
+                'type': pattern_type,
+                'confidence': confidence,
+                'description': self.PATTERN_DESCRIPTIONS.get(pattern_name, 'Pattern detected'),
+                'source': 'candlestick'
+            })
 
         return active
 
@@ -3,12 +3,325 @@ Chart Pattern Detection
 Detects classical chart patterns like double bottom, head & shoulders, triangles, etc.
 """
 
+import weakref
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterator, Optional, Tuple
 from datetime import datetime
 from scipy.signal import argrelextrema
 
+from ..utils.jit import njit, prange, NUMBA_AVAILABLE
+
+
+# Pivot positions per source DataFrame, keyed by id() since DataFrames are
+# unhashable. Entries are evicted when the frame is garbage collected.
+_PIVOT_CACHE: Dict[int, Tuple[Tuple, np.ndarray, np.ndarray]] = {}
+
+
+def _cached_pivot_positions(df: pd.DataFrame, high: np.ndarray, low: np.ndarray,
+                            order: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return (pivot_high_pos, pivot_low_pos) for df, reusing earlier results
+
+    Detectors built on the same frame (e.g. a min_confidence sweep) share one
+    argrelextrema pass. The cache entry is validated against the frame length
+    and last index label, so appended candles trigger a recompute.
+    """
+    frame_id = id(df)
+    key = (order, len(df), df.index[-1] if len(df) else None)
+
+    entry = _PIVOT_CACHE.get(frame_id)
+    if entry is not None and entry[0] == key:
+        return entry[1], entry[2]
+
+    # Local maxima (resistance) and local minima (support)
+    high_pos = argrelextrema(high, np.greater_equal, order=order)[0]
+    low_pos = argrelextrema(low, np.less_equal, order=order)[0]
+    high_pos.flags.writeable = False
+    low_pos.flags.writeable = False
+
+    if entry is None:
+        weakref.finalize(df, _PIVOT_CACHE.pop, frame_id, None)
+    _PIVOT_CACHE[frame_id] = (key, high_pos, low_pos)
+
+    return high_pos, low_pos
+
+
+@njit(cache=True)
+def _rolling_window_stats_jit(values: np.ndarray, window: int):
+    """
+    Rolling max, min, least-squares slope and mean in a single pass
+
+    Max/min use monotonic index deques (amortized O(1) per step). The slope
+    is recomputed per window from centered x offsets rather than updated
+    incrementally, so long series don't accumulate rounding drift.
+    """
+    n = len(values)
+    n_windows = n - window + 1
+    win_max = np.empty(n_windows)
+    win_min = np.empty(n_windows)
+    slope = np.empty(n_windows)
+    mean = np.empty(n_windows)
+
+    max_deque = np.empty(n, dtype=np.int64)
+    min_deque = np.empty(n, dtype=np.int64)
+    max_head = max_tail = 0
+    min_head = min_tail = 0
+
+    x_center = (window - 1) / 2.0
+    sxx = window * (window * window - 1) / 12.0
+
+    for i in range(n):
+        value = values[i]
+        while max_tail > max_head and values[max_deque[max_tail - 1]] <= value:
+            max_tail -= 1
+        max_deque[max_tail] = i
+        max_tail += 1
+        while min_tail > min_head and values[min_deque[min_tail - 1]] >= value:
+            min_tail -= 1
+        min_deque[min_tail] = i
+        min_tail += 1
+
+        start = i - window + 1
+        if start < 0:
+            continue
+        if max_deque[max_head] < start:
+            max_head += 1
+        if min_deque[min_head] < start:
+            min_head += 1
+
+        win_max[start] = values[max_deque[max_head]]
+        win_min[start] = values[min_deque[min_head]]
+
+        total = 0.0
+        sxy = 0.0
+        for k in range(window):
+            y = values[start + k]
+            total += y
+            sxy += (k - x_center) * y
+        mean[start] = total / window
+        slope[start] = sxy / sxx
+
+    return win_max, win_min, slope, mean
+
+
+def _rolling_window_stats_numpy(values: np.ndarray, window: int):
+    """NumPy fallback for _rolling_window_stats_jit over a strided window view"""
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    x_centered = np.arange(window) - (window - 1) / 2
+    sxx = window * (window * window - 1) / 12
+    return windows.max(axis=1), windows.min(axis=1), windows @ x_centered / sxx, windows.mean(axis=1)
+
+
+def _rolling_window_stats(values: np.ndarray, window: int):
+    """
+    Compute rolling (max, min, slope, mean) for every full window of values
+
+    Element k of each array describes values[k:k + window]. The slope is the
+    degree-1 least-squares fit against x = 0..window-1, as np.polyfit gives.
+    """
+    if NUMBA_AVAILABLE:
+        return _rolling_window_stats_jit(values, window)
+    return _rolling_window_stats_numpy(values, window)
+
+
+@njit(parallel=True, cache=True)
+def _flag_scan_jit(close: np.ndarray, high: np.ndarray, low: np.ndarray,
+                   pole_len: int, flag_len: int):
+    """
+    Pole change and flag consolidation stats for every candidate flag start
+
+    Each start index writes only its own output slot, so the scan runs in
+    parallel with no synchronization. Slots that cannot start a flag stay NaN.
+    """
+    n = len(close)
+    pole_change = np.full(n, np.nan)
+    flag_high = np.full(n, np.nan)
+    flag_low = np.full(n, np.nan)
+    flag_range = np.full(n, np.nan)
+    flag_slope = np.full(n, np.nan)
+
+    x_center = (flag_len - 1) / 2.0
+    sxx = flag_len * (flag_len * flag_len - 1) / 12.0
+
+    for i in prange(pole_len, n - flag_len):
+        pole_start = close[i - pole_len]
+        pole_change[i] = (close[i - 1] - pole_start) / pole_start
+
+        hi = high[i]
+        lo = low[i]
+        total = 0.0
+        sxy = 0.0
+        for k in range(flag_len):
+            hi = max(hi, high[i + k])
+            lo = min(lo, low[i + k])
+            y = close[i + k]
+            total += y
+            sxy += (k - x_center) * y
+
+        flag_high[i] = hi
+        flag_low[i] = lo
+        flag_range[i] = (hi - lo) / (total / flag_len)
+        flag_slope[i] = sxy / sxx
+
+    return pole_change, flag_high, flag_low, flag_range, flag_slope
+
+
+def _flag_scan_numpy(close: np.ndarray, high: np.ndarray, low: np.ndarray,
+                     pole_len: int, flag_len: int):
+    """NumPy fallback for _flag_scan_jit"""
+    n = len(close)
+    pole_change = np.full(n, np.nan)
+    flag_high = np.full(n, np.nan)
+    flag_low = np.full(n, np.nan)
+    flag_range = np.full(n, np.nan)
+    flag_slope = np.full(n, np.nan)
+
+    starts = np.arange(pole_len, n - flag_len)
+    if len(starts) == 0:
+        return pole_change, flag_high, flag_low, flag_range, flag_slope
+
+    pole_start = close[starts - pole_len]
+    pole_change[starts] = (close[starts - 1] - pole_start) / pole_start
+
+    high_windows = np.lib.stride_tricks.sliding_window_view(high, flag_len)[starts]
+    low_windows = np.lib.stride_tricks.sliding_window_view(low, flag_len)[starts]
+    close_windows = np.lib.stride_tricks.sliding_window_view(close, flag_len)[starts]
+
+    x_centered = np.arange(flag_len) - (flag_len - 1) / 2
+    sxx = flag_len * (flag_len * flag_len - 1) / 12
+
+    flag_high[starts] = high_windows.max(axis=1)
+    flag_low[starts] = low_windows.min(axis=1)
+    flag_range[starts] = (flag_high[starts] - flag_low[starts]) / close_windows.mean(axis=1)
+    flag_slope[starts] = close_windows @ x_centered / sxx
+
+    return pole_change, flag_high, flag_low, flag_range, flag_slope
+
+
+def _flag_scan(close: np.ndarray, high: np.ndarray, low: np.ndarray,
+               pole_len: int, flag_len: int):
+    """
+    Compute (pole_change, flag_high, flag_low, flag_range, flag_slope) per start
+
+    Slot i describes a pole over close[i - pole_len:i] followed by a flag over
+    candles [i, i + flag_len). Positions that cannot start a flag are NaN.
+    """
+    if NUMBA_AVAILABLE:
+        return _flag_scan_jit(close, high, low, pole_len, flag_len)
+    return _flag_scan_numpy(close, high, low, pole_len, flag_len)
+
+
+# Windows whose total sum of squares is below this are treated as flat
+_MIN_WINDOW_SST = 1e-12
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _rounding_fits_jit(values: np.ndarray, window: int):
+    """
+    Quadratic fit curvature and r^2 for every window start, without a window view
+
+    Uses the closed-form normal equations with x and y centred on each window,
+    which decouples the linear term and leaves a scalar solve for curvature.
+    Degenerate (flat) windows get r^2 = NaN, matching the NumPy path.
+    """
+    n_windows = len(values) - window
+    curvature = np.empty(max(n_windows, 0))
+    r_squared = np.empty(max(n_windows, 0))
+
+    # Moments of x centred on the window: sum(x) = sum(x^3) = 0
+    x_center = (window - 1) / 2.0
+    s2 = 0.0
+    s4 = 0.0
+    for k in range(window):
+        x = k - x_center
+        s2 += x * x
+        s4 += x * x * x * x
+    det = s4 - s2 * s2 / window
+
+    for i in prange(n_windows):
+        mean = 0.0
+        for k in range(window):
+            mean += values[i + k]
+        mean /= window
+
+        sxy = 0.0
+        sxxy = 0.0
+        sst = 0.0
+        for k in range(window):
+            x = k - x_center
+            y = values[i + k] - mean
+            sxy += x * y
+            sxxy += x * x * y
+            sst += y * y
+
+        a = sxxy / det
+        b = sxy / s2
+        c = -a * s2 / window
+
+        ssr = 0.0
+        for k in range(window):
+            x = k - x_center
+            resid = values[i + k] - mean - (a * x * x + b * x + c)
+            ssr += resid * resid
+
+        curvature[i] = a
+        r_squared[i] = 1.0 - ssr / sst if sst > _MIN_WINDOW_SST else np.nan
+
+    return curvature, r_squared
+
+
+# Quadratic design matrix for the 30-candle rounding window and its
+# pseudoinverse, so each window's fit is a single matrix product
+_V30 = np.vander(np.arange(30, dtype=np.float64), 3)
+_PINV30 = np.linalg.pinv(_V30)
+
+
+def _rounding_fits_numpy(values: np.ndarray, window: int):
+    """
+    NumPy fallback for _rounding_fits_jit
+
+    All windows share the same Vandermonde matrix, so one product with its
+    precomputed pseudoinverse fits every window at once.
+    """
+    n_windows = len(values) - window
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)[:n_windows]
+
+    if window == 30:
+        vander, pinv = _V30, _PINV30
+    else:
+        vander = np.vander(np.arange(window, dtype=np.float64), 3)
+        pinv = np.linalg.pinv(vander)
+    coeffs = pinv @ windows.T
+
+    # Goodness of fit; flat windows have no variance to explain and get NaN,
+    # which never passes the threshold
+    residuals = windows - (vander @ coeffs).T
+    centered = windows - windows.mean(axis=1, keepdims=True)
+    ssr = np.einsum('ij,ij->i', residuals, residuals)
+    sst = np.einsum('ij,ij->i', centered, centered)
+
+    r_squared = np.full(n_windows, np.nan)
+    varied = sst > _MIN_WINDOW_SST
+    r_squared[varied] = 1 - ssr[varied] / sst[varied]
+
+    return coeffs[0], r_squared
+
+
+def _rounding_fits(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fit y = ax^2 + bx + c to every window of values
+
+    Element k describes values[k:k + window] for each start that leaves at
+    least one candle after the window.
+
+    Returns:
+        Tuple of (curvature a, r_squared) per window start
+    """
+    if NUMBA_AVAILABLE:
+        return _rounding_fits_jit(values, window)
+    return _rounding_fits_numpy(values, window)
+
 
 class ChartPatternDetector:
     """
@@ -25,128 +338,256 @@ class ChartPatternDetector:
     8. Rounding Bottom / Rounding Top
     """
 
-    def __init__(self, df: pd.DataFrame, min_confidence: float = 0.7):
+    def __init__(self, df: pd.DataFrame, min_confidence: float = 0.7, copy: bool = False):
         """
         Initialize chart pattern detector
 
+        The DataFrame is kept as a read-only reference and never modified;
+        pivots and price series are held as separate NumPy arrays.
+
         Args:
-            df: DataFrame with OHLCV data
+            df: DataFrame with OHLCV data (pandas, or polars/Arrow-backed
+                frames exposing to_pandas())
             min_confidence: Minimum confidence threshold (0.0-1.0)
+            copy: Keep a private copy of df instead of a reference (use when
+                the caller mutates the frame while the detector is alive)
         """
-        self.df = df.copy()
+        # Detectors run on NumPy arrays, so non-pandas frames only need a
+        # single conversion at the boundary (zero-copy for Arrow numerics)
+        if not isinstance(df, pd.DataFrame) and hasattr(df, 'to_pandas'):
+            df = df.to_pandas()
+
+        self.df = df.copy() if copy else df
         self.min_confidence = min_confidence
 
-        # Ensure index is datetime
+        # Pattern timestamps come from the 'time' column when present
         if 'time' in self.df.columns:
-            self.df['time'] = pd.to_datetime(self.df['time'])
-            self.df.set_index('time', inplace=True)
+            self._index = pd.DatetimeIndex(pd.to_datetime(self.df['time']))
+        else:
+            self._index = self.df.index
+
+        # Raw price arrays for positional access in the detectors
+        self._high = self.df['high'].to_numpy(dtype=np.float64)
+        self._low = self.df['low'].to_numpy(dtype=np.float64)
+        self._close = self.df['close'].to_numpy(dtype=np.float64)
+
+        # Rolling high/low statistics shared by the fixed-window detectors
+        self._window_stats_cache: Dict[int, Dict[str, np.ndarray]] = {}
+        self._flag_stats: Optional[Tuple[np.ndarray, ...]] = None
 
         # Find pivots (local maxima and minima)
         self._find_pivot_points()
 
     def _find_pivot_points(self, order: int = 5):
         """Find pivot highs and lows"""
-        # Local maxima (resistance)
-        self.df['pivot_high'] = self.df.iloc[argrelextrema(
-            self.df['high'].values, np.greater_equal, order=order)[0]]['high']
-
-        # Local minima (support)
-        self.df['pivot_low'] = self.df.iloc[argrelextrema(
-            self.df['low'].values, np.less_equal, order=order)[0]]['low']
+        self._pivot_high_pos, self._pivot_low_pos = _cached_pivot_positions(
+            self.df, self._high, self._low, order)
 
-    def detect_all_patterns(self) -> List[Dict]:
-        """Detect all chart patterns"""
-        patterns = []
-
-        # Reversal patterns
-        patterns.extend(self.detect_double_bottom())
-        patterns.extend(self.detect_double_top())
-        patterns.extend(self.detect_triple_bottom())
-        patterns.extend(self.detect_triple_top())
-        patterns.extend(self.detect_head_and_shoulders())
-        patterns.extend(self.detect_inverse_head_and_shoulders())
-
-        # Continuation patterns
-        patterns.extend(self.detect_ascending_triangle())
-        patterns.extend(self.detect_descending_triangle())
-        patterns.extend(self.detect_symmetrical_triangle())
-        patterns.extend(self.detect_rising_wedge())
-        patterns.extend(self.detect_falling_wedge())
-        patterns.extend(self.detect_bull_flag())
-        patterns.extend(self.detect_bear_flag())
-
-        # Other patterns
-        patterns.extend(self.detect_cup_and_handle())
-        patterns.extend(self.detect_rounding_bottom())
-        patterns.extend(self.detect_rounding_top())
-
-        # Filter by confidence
-        return [p for p in patterns if p['confidence'] >= self.min_confidence]
+        self._pivot_high_vals = self._high[self._pivot_high_pos]
+        self._pivot_low_vals = self._low[self._pivot_low_pos]
 
-    # ===== DOUBLE BOTTOM / TOP =====
-
-    def detect_double_bottom(self) -> List[Dict]:
+    def _window_stats(self, window: int) -> Dict[str, np.ndarray]:
         """
-        Detect double bottom pattern
+        Rolling max/min/slope/mean of highs and lows for every window start
 
-        Pattern: Two troughs at approximately same level with peak in middle
-        Signal: Bullish reversal
+        Computed once per window size and shared by every detector that
+        scans the same window length.
+        """
+        stats = self._window_stats_cache.get(window)
+        if stats is None:
+            high_max, high_min, high_slope, high_mean = _rolling_window_stats(self._high, window)
+            low_max, low_min, low_slope, low_mean = _rolling_window_stats(self._low, window)
+            stats = {
+                'high_max': high_max, 'high_min': high_min,
+                'high_slope': high_slope, 'high_mean': high_mean,
+                'low_max': low_max, 'low_min': low_min,
+                'low_slope': low_slope, 'low_mean': low_mean,
+            }
+            self._window_stats_cache[window] = stats
+        return stats
+
+    def _flag_scan_stats(self) -> Tuple[np.ndarray, ...]:
+        """Pole/flag statistics shared by the bull and bear flag detectors"""
+        if self._flag_stats is None:
+            self._flag_stats = _flag_scan(self._close, self._high, self._low,
+                                          pole_len=15, flag_len=10)
+        return self._flag_stats
+
+    @staticmethod
+    def _similar_pivot_pairs(values: np.ndarray, max_diff_pct: float = 3.0) -> Tuple[np.ndarray, np.ndarray]:
         """
-        patterns = []
-        pivot_lows = self.df['pivot_low'].dropna()
+        Find all pivot pairs (i < j) whose prices are within max_diff_pct of each other
 
-        if len(pivot_lows) < 2:
-            return patterns
+        Pivot prices are sorted once and each pivot's similarity band is
+        located with a binary search, so only candidate pairs inside a band
+        are materialised instead of the full pivot-by-pivot matrix.
 
-        for i in range(len(pivot_lows) - 1):
-            low1_idx = pivot_lows.index[i]
-            low1_price = pivot_lows.iloc[i]
+        Returns:
+            Tuple of (i, j) index arrays into values, ordered by i then j
+        """
+        n = len(values)
+        if n < 2:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+
+        order = np.argsort(values, kind='stable')
+        sorted_vals = values[order]
+
+        # Bands are widened slightly and the exact test is reapplied below,
+        # so rounding at the band edges cannot change the result
+        tol = np.abs(values) * (max_diff_pct / 100) * (1 + 1e-9)
+        lo = np.searchsorted(sorted_vals, values - tol, side='left')
+        hi = np.searchsorted(sorted_vals, values + tol, side='right')
+
+        counts = hi - lo
+        i = np.repeat(np.arange(n), counts)
+        starts = np.repeat(lo - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+        j = order[np.arange(len(i)) + starts]
+
+        keep = j > i
+        i, j = i[keep], j[keep]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            keep = np.abs(values[i] - values[j]) / values[i] * 100 <= max_diff_pct
+        i, j = i[keep], j[keep]
+
+        pair_order = np.lexsort((j, i))
+        return i[pair_order], j[pair_order]
 
-            for j in range(i + 1, len(pivot_lows)):
-                low2_idx = pivot_lows.index[j]
-                low2_price = pivot_lows.iloc[j]
+    def detect_all_patterns(self) -> List[Dict]:
+        """Detect all chart patterns"""
+        return list(self.iter_all_patterns())
 
-                # Check if lows are at similar level (within 3%)
-                price_diff_pct = abs(low1_price - low2_price) / low1_price * 100
+    def detect_all_patterns_df(self) -> pd.DataFrame:
+        """
+        Detect all chart patterns as a single DataFrame
 
-                if price_diff_pct > 3.0:
-                    continue
+        Each detector produces its results as columns, which become one
+        DataFrame per detector and are concatenated once; no per-pattern
+        dict is built. Pattern-specific fields are NaN for rows whose
+        pattern doesn't define them.
+        """
+        frames = [pd.DataFrame(columns) for columns in self._iter_pattern_columns()
+                  if len(columns['confidence'])]
+        if not frames:
+            return pd.DataFrame(columns=['name', 'type', 'confidence', 'start_time', 'end_time'])
+        return pd.concat(frames, ignore_index=True)
 
-                # Check if there's a peak between the lows
-                between_data = self.df.loc[low1_idx:low2_idx]
-                peak_price = between_data['high'].max()
-                peak_idx = between_data['high'].idxmax()
+    def iter_all_patterns(self) -> Iterator[Dict]:
+        """
+        Lazily yield all chart patterns, one detector at a time
 
-                # Peak should be at least 5% higher than lows
-                if (peak_price - low1_price) / low1_price < 0.05:
-                    continue
+        Every detector applies min_confidence before building its result
+        columns, so no separate filtering pass is needed here.
+        """
+        for columns in self._iter_pattern_columns():
+            yield from self._records(columns)
+
+    def _iter_pattern_columns(self) -> Iterator[Dict]:
+        """Yield every detector's result columns, skipping detectors without data"""
+        detectors = (
+            # Reversal patterns
+            self._double_bottom_columns,
+            self._double_top_columns,
+            self._triple_bottom_columns,
+            self._triple_top_columns,
+            self._head_and_shoulders_columns,
+            self._inverse_head_and_shoulders_columns,
+
+            # Continuation patterns
+            self._ascending_triangle_columns,
+            self._descending_triangle_columns,
+            self._symmetrical_triangle_columns,
+            self._rising_wedge_columns,
+            self._falling_wedge_columns,
+            self._bull_flag_columns,
+            self._bear_flag_columns,
+
+            # Other patterns
+            self._cup_and_handle_columns,
+            self._rounding_bottom_columns,
+            self._rounding_top_columns,
+        )
+        for detector in detectors:
+            columns = detector()
+            if columns is not None:
+                yield columns
+
+    @staticmethod
+    def _records(columns: Optional[Dict]) -> List[Dict]:
+        """
+        Turn a detector's result columns into one dict per pattern
 
-                # Calculate confidence
-                # - Similar lows = higher confidence
-                # - Clear peak = higher confidence
-                # - Adequate spacing = higher confidence
-                similarity_score = 1.0 - (price_diff_pct / 3.0)
-                peak_height = (peak_price - low1_price) / low1_price
-                peak_score = min(1.0, peak_height / 0.10)  # 10% peak is perfect
+        Args:
+            columns: 'name' and 'type' strings plus one array per field,
+                or None when the detector had too little data
+        """
+        if columns is None:
+            return []
+        head = {'name': columns['name'], 'type': columns['type']}
+        fields = [key for key in columns if key not in head]
+        return [{**head, **dict(zip(fields, row))} for row in zip(*(columns[key] for key in fields))]
 
-                spacing_candles = len(between_data)
-                spacing_score = min(1.0, spacing_candles / 20)  # 20 candles is ideal
+    @staticmethod
+    def _range_extreme(values: np.ndarray, starts: np.ndarray, ends: np.ndarray, func) -> np.ndarray:
+        """Apply func (np.max / np.min) to values[start:end + 1] for each pair"""
+        return np.array([func(values[a:b + 1]) for a, b in zip(starts, ends)], dtype=float)
 
-                confidence = (similarity_score * 0.5 + peak_score * 0.3 + spacing_score * 0.2)
+    # ===== DOUBLE BOTTOM / TOP =====
 
-                patterns.append({
-                    'name': 'Double Bottom',
-                    'type': 'bullish_reversal',
-                    'confidence': round(confidence * 100, 1),
-                    'start_time': low1_idx,
-                    'end_time': low2_idx,
-                    'support_level': round((low1_price + low2_price) / 2, 2),
-                    'resistance_level': round(peak_price, 2),
-                    'target': round(peak_price + (peak_price - low1_price), 2),
-                    'stop_loss': round(low2_price * 0.98, 2)
-                })
+    def detect_double_bottom(self) -> List[Dict]:
+        """
+        Detect double bottom pattern
 
-        return patterns
+        Pattern: Two troughs at approximately same level with peak in middle
+        Signal: Bullish reversal
+        """
+        return self._records(self._double_bottom_columns())
+
+    def _double_bottom_columns(self) -> Optional[Dict]:
+        """Result columns for detect_double_bottom"""
+        pivot_pos = self._pivot_low_pos
+        pivot_vals = self._pivot_low_vals
+
+        if len(pivot_vals) < 2:
+            return None
+
+        i, j = self._similar_pivot_pairs(pivot_vals)
+        pos1, pos2 = pivot_pos[i], pivot_pos[j]
+        low1_price = pivot_vals[i]
+        low2_price = pivot_vals[j]
+        price_diff_pct = np.abs(low1_price - low2_price) / low1_price * 100
+
+        # Check if there's a peak between the lows
+        peak_price = self._range_extreme(self._high, pos1, pos2, np.max)
+
+        # Calculate confidence
+        # - Similar lows = higher confidence
+        # - Clear peak = higher confidence
+        # - Adequate spacing = higher confidence
+        similarity_score = 1.0 - (price_diff_pct / 3.0)
+        peak_height = (peak_price - low1_price) / low1_price
+        peak_score = np.minimum(1.0, peak_height / 0.10)  # 10% peak is perfect
+
+        spacing_candles = pos2 - pos1 + 1
+        spacing_score = np.minimum(1.0, spacing_candles / 20)  # 20 candles is ideal
+
+        confidence = (similarity_score * 0.5 + peak_score * 0.3 + spacing_score * 0.2)
+
+        # Peak should be at least 5% higher than lows
+        k = np.flatnonzero((peak_height >= 0.05) & (confidence >= self.min_confidence))
+        low1_price, low2_price, peak_price = low1_price[k], low2_price[k], peak_price[k]
+
+        return {
+            'name': 'Double Bottom',
+            'type': 'bullish_reversal',
+            'confidence': np.round(confidence[k] * 100, 1),
+            'start_time': self._index[pos1[k]],
+            'end_time': self._index[pos2[k]],
+            'support_level': np.round((low1_price + low2_price) / 2, 2),
+            'resistance_level': np.round(peak_price, 2),
+            'target': np.round(peak_price + (peak_price - low1_price), 2),
+            'stop_loss': np.round(low2_price * 0.98, 2)
+        }
 
     def detect_double_top(self) -> List[Dict]:
         """
@@ -155,128 +596,126 @@ class ChartPatternDetector:
         Pattern: Two peaks at approximately same level with trough in middle
         Signal: Bearish reversal
         """
-        patterns = []
-        pivot_highs = self.df['pivot_high'].dropna()
-
-        if len(pivot_highs) < 2:
-            return patterns
-
-        for i in range(len(pivot_highs) - 1):
-            high1_idx = pivot_highs.index[i]
-            high1_price = pivot_highs.iloc[i]
-
-            for j in range(i + 1, len(pivot_highs)):
-                high2_idx = pivot_highs.index[j]
-                high2_price = pivot_highs.iloc[j]
-
-                # Check if highs are at similar level (within 3%)
-                price_diff_pct = abs(high1_price - high2_price) / high1_price * 100
-
-                if price_diff_pct > 3.0:
-                    continue
-
-                # Check if there's a trough between the highs
-                between_data = self.df.loc[high1_idx:high2_idx]
-                trough_price = between_data['low'].min()
-                trough_idx = between_data['low'].idxmin()
-
-                # Trough should be at least 5% lower than highs
-                if (high1_price - trough_price) / high1_price < 0.05:
-                    continue
-
-                # Calculate confidence (same logic as double bottom)
-                similarity_score = 1.0 - (price_diff_pct / 3.0)
-                trough_depth = (high1_price - trough_price) / high1_price
-                depth_score = min(1.0, trough_depth / 0.10)
+        return self._records(self._double_top_columns())
+
+    def _double_top_columns(self) -> Optional[Dict]:
+        """Result columns for detect_double_top"""
+        pivot_pos = self._pivot_high_pos
+        pivot_vals = self._pivot_high_vals
+
+        if len(pivot_vals) < 2:
+            return None
+
+        i, j = self._similar_pivot_pairs(pivot_vals)
+        pos1, pos2 = pivot_pos[i], pivot_pos[j]
+        high1_price = pivot_vals[i]
+        high2_price = pivot_vals[j]
+        price_diff_pct = np.abs(high1_price - high2_price) / high1_price * 100
+
+        # Check if there's a trough between the highs
+        trough_price = self._range_extreme(self._low, pos1, pos2, np.min)
+
+        # Calculate confidence (same logic as double bottom)
+        similarity_score = 1.0 - (price_diff_pct / 3.0)
+        trough_depth = (high1_price - trough_price) / high1_price
+        depth_score = np.minimum(1.0, trough_depth / 0.10)
+
+        spacing_candles = pos2 - pos1 + 1
+        spacing_score = np.minimum(1.0, spacing_candles / 20)
+
+        confidence = (similarity_score * 0.5 + depth_score * 0.3 + spacing_score * 0.2)
+
+        # Trough should be at least 5% lower than highs
+        k = np.flatnonzero((trough_depth >= 0.05) & (confidence >= self.min_confidence))
+        high1_price, high2_price, trough_price = high1_price[k], high2_price[k], trough_price[k]
+
+        return {
+            'name': 'Double Top',
+            'type': 'bearish_reversal',
+            'confidence': np.round(confidence[k] * 100, 1),
+            'start_time': self._index[pos1[k]],
+            'end_time': self._index[pos2[k]],
+            'resistance_level': np.round((high1_price + high2_price) / 2, 2),
+            'support_level': np.round(trough_price, 2),
+            'target': np.round(trough_price - (high1_price - trough_price), 2),
+            'stop_loss': np.round(high2_price * 1.02, 2)
+        }
 
-                spacing_candles = len(between_data)
-                spacing_score = min(1.0, spacing_candles / 20)
-
-                confidence = (similarity_score * 0.5 + depth_score * 0.3 + spacing_score * 0.2)
-
-                patterns.append({
-                    'name': 'Double Top',
-                    'type': 'bearish_reversal',
-                    'confidence': round(confidence * 100, 1),
-                    'start_time': high1_idx,
-                    'end_time': high2_idx,
-                    'resistance_level': round((high1_price + high2_price) / 2, 2),
-                    'support_level': round(trough_price, 2),
-                    'target': round(trough_price - (high1_price - trough_price), 2),
-                    'stop_loss': round(high2_price * 1.02, 2)
-                })
+    # ===== TRIPLE BOTTOM / TOP =====
 
-        return patterns
+    @staticmethod
+    def _triple_pivot_deviation(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compare every run of three consecutive pivots in one vectorized pass
 
-    # ===== TRIPLE BOTTOM / TOP =====
+        Returns:
+            Tuple of (average price, max relative deviation from the average)
+            for each window of three pivots
+        """
+        windows = np.lib.stride_tricks.sliding_window_view(values, 3)
+        avg = (windows[:, 0] + windows[:, 1] + windows[:, 2]) / 3
+        max_dev = (np.abs(windows - avg[:, None]) / avg[:, None]).max(axis=1)
+        return avg, max_dev
 
     def detect_triple_bottom(self) -> List[Dict]:
         """Detect triple bottom pattern - three lows at similar level"""
-        patterns = []
-        pivot_lows = self.df['pivot_low'].dropna()
+        return self._records(self._triple_bottom_columns())
 
-        if len(pivot_lows) < 3:
-            return patterns
+    def _triple_bottom_columns(self) -> Optional[Dict]:
+        """Result columns for detect_triple_bottom"""
+        pivot_pos = self._pivot_low_pos
+        pivot_vals = self._pivot_low_vals
 
-        for i in range(len(pivot_lows) - 2):
-            low1 = pivot_lows.iloc[i]
-            low2 = pivot_lows.iloc[i + 1]
-            low3 = pivot_lows.iloc[i + 2]
+        if len(pivot_vals) < 3:
+            return None
 
-            # Check if all three lows are within 3% of each other
-            avg_low = (low1 + low2 + low3) / 3
-            if all(abs(low - avg_low) / avg_low < 0.03 for low in [low1, low2, low3]):
+        # Check if all three lows are within 3% of each other
+        avg_lows, max_devs = self._triple_pivot_deviation(pivot_vals)
 
-                idx1 = pivot_lows.index[i]
-                idx3 = pivot_lows.index[i + 2]
+        confidences = 1.0 - max_devs
 
-                confidence = 1.0 - max(abs(low - avg_low) / avg_low for low in [low1, low2, low3])
+        i = np.flatnonzero((max_devs < 0.03) & (confidences >= self.min_confidence))
+        avg_low = avg_lows[i]
 
-                patterns.append({
-                    'name': 'Triple Bottom',
-                    'type': 'bullish_reversal',
-                    'confidence': round(confidence * 100, 1),
-                    'start_time': idx1,
-                    'end_time': idx3,
-                    'support_level': round(avg_low, 2),
-                    'stop_loss': round(avg_low * 0.98, 2)
-                })
-
-        return patterns
+        return {
+            'name': 'Triple Bottom',
+            'type': 'bullish_reversal',
+            'confidence': np.round(confidences[i] * 100, 1),
+            'start_time': self._index[pivot_pos[i]],
+            'end_time': self._index[pivot_pos[i + 2]],
+            'support_level': np.round(avg_low, 2),
+            'stop_loss': np.round(avg_low * 0.98, 2)
+        }
 
     def detect_triple_top(self) -> List[Dict]:
         """Detect triple top pattern - three highs at similar level"""
-        patterns = []
-        pivot_highs = self.df['pivot_high'].dropna()
-
-        if len(pivot_highs) < 3:
-            return patterns
+        return self._records(self._triple_top_columns())
 
-        for i in range(len(pivot_highs) - 2):
-            high1 = pivot_highs.iloc[i]
-            high2 = pivot_highs.iloc[i + 1]
-            high3 = pivot_highs.iloc[i + 2]
+    def _triple_top_columns(self) -> Optional[Dict]:
+        """Result columns for detect_triple_top"""
+        pivot_pos = self._pivot_high_pos
+        pivot_vals = self._pivot_high_vals
 
-            # Check if all three highs are within 3% of each other
-            avg_high = (high1 + high2 + high3) / 3
-            if all(abs(high - avg_high) / avg_high < 0.03 for high in [high1, high2, high3]):
+        if len(pivot_vals) < 3:
+            return None
 
-                idx1 = pivot_highs.index[i]
-                idx3 = pivot_highs.index[i + 2]
+        # Check if all three highs are within 3% of each other
+        avg_highs, max_devs = self._triple_pivot_deviation(pivot_vals)
 
-                confidence = 1.0 - max(abs(high - avg_high) / avg_high for high in [high1, high2, high3])
+        confidences = 1.0 - max_devs
 
-                patterns.append({
-                    'name': 'Triple Top',
-                    'type': 'bearish_reversal',
-                    'confidence': round(confidence * 100, 1),
-                    'start_time': idx1,
-                    'end_time': idx3,
-                    'resistance_level': round(avg_high, 2),
-                    'stop_loss': round(avg_high * 1.02, 2)
-                })
+        i = np.flatnonzero((max_devs < 0.03) & (confidences >= self.min_confidence))
+        avg_high = avg_highs[i]
 
-        return patterns
+        return {
+            'name': 'Triple Top',
+            'type': 'bearish_reversal',
+            'confidence': np.round(confidences[i] * 100, 1),
+            'start_time': self._index[pivot_pos[i]],
+            'end_time': self._index[pivot_pos[i + 2]],
+            'resistance_level': np.round(avg_high, 2),
+            'stop_loss': np.round(avg_high * 1.02, 2)
+        }
 
     # ===== HEAD AND SHOULDERS =====
 
@@ -287,64 +726,54 @@ class ChartPatternDetector:
         Pattern: Three peaks - left shoulder, head (highest), right shoulder
         Signal: Bearish reversal
         """
-        patterns = []
-        pivot_highs = self.df['pivot_high'].dropna()
-
-        if len(pivot_highs) < 3:
-            return patterns
-
-        for i in range(len(pivot_highs) - 2):
-            left_shoulder = pivot_highs.iloc[i]
-            head = pivot_highs.iloc[i + 1]
-            right_shoulder = pivot_highs.iloc[i + 2]
-
-            # Head should be highest
-            if not (head > left_shoulder and head > right_shoulder):
-                continue
-
-            # Shoulders should be at similar level (within 5%)
-            shoulder_diff = abs(left_shoulder - right_shoulder) / left_shoulder
-            if shoulder_diff > 0.05:
-                continue
-
-            # Head should be significantly higher (at least 5%)
-            if (head - left_shoulder) / left_shoulder < 0.05:
-                continue
-
-            idx_left = pivot_highs.index[i]
-            idx_head = pivot_highs.index[i + 1]
-            idx_right = pivot_highs.index[i + 2]
-
-            # Find neckline (support connecting troughs between shoulders and head)
-            between_left_head = self.df.loc[idx_left:idx_head]
-            between_head_right = self.df.loc[idx_head:idx_right]
-
-            neckline_left = between_left_head['low'].min()
-            neckline_right = between_head_right['low'].min()
-            neckline = (neckline_left + neckline_right) / 2
-
-            # Calculate confidence
-            symmetry_score = 1.0 - shoulder_diff
-            head_prominence = (head - left_shoulder) / left_shoulder
-            prominence_score = min(1.0, head_prominence / 0.10)
-
-            confidence = (symmetry_score * 0.6 + prominence_score * 0.4)
-
-            patterns.append({
-                'name': 'Head and Shoulders',
-                'type': 'bearish_reversal',
-                'confidence': round(confidence * 100, 1),
-                'start_time': idx_left,
-                'end_time': idx_right,
-                'left_shoulder': round(left_shoulder, 2),
-                'head': round(head, 2),
-                'right_shoulder': round(right_shoulder, 2),
-                'neckline': round(neckline, 2),
-                'target': round(neckline - (head - neckline), 2),
-                'stop_loss': round(right_shoulder * 1.02, 2)
-            })
-
-        return patterns
+        return self._records(self._head_and_shoulders_columns())
+
+    def _head_and_shoulders_columns(self) -> Optional[Dict]:
+        """Result columns for detect_head_and_shoulders"""
+        pivot_pos = self._pivot_high_pos
+        pivot_vals = self._pivot_high_vals
+
+        if len(pivot_vals) < 3:
+            return None
+
+        left_shoulders = pivot_vals[:-2]
+        heads = pivot_vals[1:-1]
+        right_shoulders = pivot_vals[2:]
+
+        # Shoulders at similar level (within 5%), head significantly higher
+        # (at least 5%); confidence doesn't depend on the neckline
+        shoulder_diff = np.abs(left_shoulders - right_shoulders) / left_shoulders
+        head_prominence = (heads - left_shoulders) / left_shoulders
+        symmetry_score = 1.0 - shoulder_diff
+        prominence_score = np.minimum(1.0, head_prominence / 0.10)
+        confidences = (symmetry_score * 0.6 + prominence_score * 0.4)
+
+        matches = ((heads > left_shoulders) & (heads > right_shoulders)
+                   & (shoulder_diff <= 0.05) & (head_prominence >= 0.05)
+                   & (confidences >= self.min_confidence))
+
+        i = np.flatnonzero(matches)
+        left_shoulder, head, right_shoulder = pivot_vals[i], pivot_vals[i + 1], pivot_vals[i + 2]
+        pos_left, pos_head, pos_right = pivot_pos[i], pivot_pos[i + 1], pivot_pos[i + 2]
+
+        # Find neckline (support connecting troughs between shoulders and head)
+        neckline_left = self._range_extreme(self._low, pos_left, pos_head, np.min)
+        neckline_right = self._range_extreme(self._low, pos_head, pos_right, np.min)
+        neckline = (neckline_left + neckline_right) / 2
+
+        return {
+            'name': 'Head and Shoulders',
+            'type': 'bearish_reversal',
+            'confidence': np.round(confidences[i] * 100, 1),
+            'start_time': self._index[pos_left],
+            'end_time': self._index[pos_right],
+            'left_shoulder': np.round(left_shoulder, 2),
+            'head': np.round(head, 2),
+            'right_shoulder': np.round(right_shoulder, 2),
+            'neckline': np.round(neckline, 2),
+            'target': np.round(neckline - (head - neckline), 2),
+            'stop_loss': np.round(right_shoulder * 1.02, 2)
+        }
 
     def detect_inverse_head_and_shoulders(self) -> List[Dict]:
         """
@@ -353,64 +782,54 @@ class ChartPatternDetector:
         Pattern: Three troughs - left shoulder, head (lowest), right shoulder
         Signal: Bullish reversal
         """
-        patterns = []
-        pivot_lows = self.df['pivot_low'].dropna()
-
-        if len(pivot_lows) < 3:
-            return patterns
-
-        for i in range(len(pivot_lows) - 2):
-            left_shoulder = pivot_lows.iloc[i]
-            head = pivot_lows.iloc[i + 1]
-            right_shoulder = pivot_lows.iloc[i + 2]
-
-            # Head should be lowest
-            if not (head < left_shoulder and head < right_shoulder):
-                continue
-
-            # Shoulders should be at similar level (within 5%)
-            shoulder_diff = abs(left_shoulder - right_shoulder) / left_shoulder
-            if shoulder_diff > 0.05:
-                continue
-
-            # Head should be significantly lower (at least 5%)
-            if (left_shoulder - head) / left_shoulder < 0.05:
-                continue
-
-            idx_left = pivot_lows.index[i]
-            idx_head = pivot_lows.index[i + 1]
-            idx_right = pivot_lows.index[i + 2]
-
-            # Find neckline (resistance)
-            between_left_head = self.df.loc[idx_left:idx_head]
-            between_head_right = self.df.loc[idx_head:idx_right]
-
-            neckline_left = between_left_head['high'].max()
-            neckline_right = between_head_right['high'].max()
-            neckline = (neckline_left + neckline_right) / 2
-
-            # Calculate confidence
-            symmetry_score = 1.0 - shoulder_diff
-            head_prominence = (left_shoulder - head) / left_shoulder
-            prominence_score = min(1.0, head_prominence / 0.10)
-
-            confidence = (symmetry_score * 0.6 + prominence_score * 0.4)
-
-            patterns.append({
-                'name': 'Inverse Head and Shoulders',
-                'type': 'bullish_reversal',
-                'confidence': round(confidence * 100, 1),
-                'start_time': idx_left,
-                'end_time': idx_right,
-                'left_shoulder': round(left_shoulder, 2),
-                'head': round(head, 2),
-                'right_shoulder': round(right_shoulder, 2),
-                'neckline': round(neckline, 2),
-                'target': round(neckline + (neckline - head), 2),
-                'stop_loss': round(right_shoulder * 0.98, 2)
-            })
-
-        return patterns
+        return self._records(self._inverse_head_and_shoulders_columns())
+
+    def _inverse_head_and_shoulders_columns(self) -> Optional[Dict]:
+        """Result columns for detect_inverse_head_and_shoulders"""
+        pivot_pos = self._pivot_low_pos
+        pivot_vals = self._pivot_low_vals
+
+        if len(pivot_vals) < 3:
+            return None
+
+        left_shoulders = pivot_vals[:-2]
+        heads = pivot_vals[1:-1]
+        right_shoulders = pivot_vals[2:]
+
+        # Shoulders at similar level (within 5%), head significantly lower
+        # (at least 5%); confidence doesn't depend on the neckline
+        shoulder_diff = np.abs(left_shoulders - right_shoulders) / left_shoulders
+        head_prominence = (left_shoulders - heads) / left_shoulders
+        symmetry_score = 1.0 - shoulder_diff
+        prominence_score = np.minimum(1.0, head_prominence / 0.10)
+        confidences = (symmetry_score * 0.6 + prominence_score * 0.4)
+
+        matches = ((heads < left_shoulders) & (heads < right_shoulders)
+                   & (shoulder_diff <= 0.05) & (head_prominence >= 0.05)
+                   & (confidences >= self.min_confidence))
+
+        i = np.flatnonzero(matches)
+        left_shoulder, head, right_shoulder = pivot_vals[i], pivot_vals[i + 1], pivot_vals[i + 2]
+        pos_left, pos_head, pos_right = pivot_pos[i], pivot_pos[i + 1], pivot_pos[i + 2]
+
+        # Find neckline (resistance)
+        neckline_left = self._range_extreme(self._high, pos_left, pos_head, np.max)
+        neckline_right = self._range_extreme(self._high, pos_head, pos_right, np.max)
+        neckline = (neckline_left + neckline_right) / 2
+
+        return {
+            'name': 'Inverse Head and Shoulders',
+            'type': 'bullish_reversal',
+            'confidence': np.round(confidences[i] * 100, 1),
+            'start_time': self._index[pos_left],
+            'end_time': self._index[pos_right],
+            'left_shoulder': np.round(left_shoulder, 2),
+            'head': np.round(head, 2),
+            'right_shoulder': np.round(right_shoulder, 2),
+            'neckline': np.round(neckline, 2),
+            'target': np.round(neckline + (neckline - head), 2),
+            'stop_loss': np.round(right_shoulder * 0.98, 2)
+        }
 
     # ===== TRIANGLES =====
 
@@ -421,53 +840,44 @@ class ChartPatternDetector:
         Pattern: Flat resistance + rising support
         Signal: Bullish continuation
         """
-        patterns = []
+        return self._records(self._ascending_triangle_columns())
 
+    def _ascending_triangle_columns(self) -> Optional[Dict]:
+        """Result columns for detect_ascending_triangle"""
         # Need at least 20 candles for triangle
         if len(self.df) < 20:
-            return patterns
+            return None
 
         # Look for flat top (resistance) and rising lows (support)
         window = 20
-        for i in range(window, len(self.df)):
-            window_data = self.df.iloc[i-window:i]
-
-            highs = window_data['high']
-            lows = window_data['low']
-
-            # Check if highs are relatively flat (< 2% variation)
-            high_max = highs.max()
-            high_min = highs.min()
-            if (high_max - high_min) / high_min > 0.02:
-                continue
-
-            # Check if lows are rising (linear regression slope > 0)
-            x = np.arange(len(lows))
-            slope_lows, _ = np.polyfit(x, lows.values, 1)
-
-            if slope_lows <= 0:
-                continue
-
-            # Calculate confidence based on flatness of top and steepness of bottom
-            flatness_score = 1.0 - ((high_max - high_min) / high_min / 0.02)
-            slope_score = min(1.0, slope_lows / high_min * 100)
-
-            confidence = (flatness_score * 0.6 + slope_score * 0.4)
-
-            if confidence >= self.min_confidence:
-                patterns.append({
-                    'name': 'Ascending Triangle',
-                    'type': 'bullish_continuation',
-                    'confidence': round(confidence * 100, 1),
-                    'start_time': window_data.index[0],
-                    'end_time': window_data.index[-1],
-                    'resistance_level': round(high_max, 2),
-                    'support_slope': round(slope_lows, 4),
-                    'target': round(high_max * 1.05, 2),
-                    'stop_loss': round(lows.iloc[-1] * 0.98, 2)
-                })
-
-        return patterns
+        n_windows = len(self.df) - window
+        stats = self._window_stats(window)
+        high_max = stats['high_max'][:n_windows]
+        high_min = stats['high_min'][:n_windows]
+        slope_lows = stats['low_slope'][:n_windows]
+
+        # Highs relatively flat (< 2% variation), lows rising (slope > 0)
+        high_range = (high_max - high_min) / high_min
+        flatness_score = 1.0 - (high_range / 0.02)
+        slope_score = np.minimum(1.0, slope_lows / high_min * 100)
+        confidence = (flatness_score * 0.6 + slope_score * 0.4)
+
+        matches = (high_range <= 0.02) & (slope_lows > 0) & (confidence >= self.min_confidence)
+
+        start = np.flatnonzero(matches)
+        end = start + window - 1
+
+        return {
+            'name': 'Ascending Triangle',
+            'type': 'bullish_continuation',
+            'confidence': np.round(confidence[start] * 100, 1),
+            'start_time': self._index[start],
+            'end_time': self._index[end],
+            'resistance_level': np.round(high_max[start], 2),
+            'support_slope': np.round(slope_lows[start], 4),
+            'target': np.round(high_max[start] * 1.05, 2),
+            'stop_loss': np.round(self._low[end] * 0.98, 2)
+        }
 
     def detect_descending_triangle(self) -> List[Dict]:
         """
@@ -476,51 +886,42 @@ class ChartPatternDetector:
         Pattern: Flat support + falling resistance
         Signal: Bearish continuation
         """
-        patterns = []
+        return self._records(self._descending_triangle_columns())
 
+    def _descending_triangle_columns(self) -> Optional[Dict]:
+        """Result columns for detect_descending_triangle"""
         if len(self.df) < 20:
-            return patterns
+            return None
 
         window = 20
-        for i in range(window, len(self.df)):
-            window_data = self.df.iloc[i-window:i]
-
-            highs = window_data['high']
-            lows = window_data['low']
-
-            # Check if lows are relatively flat (< 2% variation)
-            low_max = lows.max()
-            low_min = lows.min()
-            if (low_max - low_min) / low_min > 0.02:
-                continue
-
-            # Check if highs are falling (linear regression slope < 0)
-            x = np.arange(len(highs))
-            slope_highs, _ = np.polyfit(x, highs.values, 1)
-
-            if slope_highs >= 0:
-                continue
-
-            # Calculate confidence
-            flatness_score = 1.0 - ((low_max - low_min) / low_min / 0.02)
-            slope_score = min(1.0, abs(slope_highs) / low_min * 100)
-
-            confidence = (flatness_score * 0.6 + slope_score * 0.4)
-
-            if confidence >= self.min_confidence:
-                patterns.append({
-                    'name': 'Descending Triangle',
-                    'type': 'bearish_continuation',
-                    'confidence': round(confidence * 100, 1),
-                    'start_time': window_data.index[0],
-                    'end_time': window_data.index[-1],
-                    'support_level': round(low_min, 2),
-                    'resistance_slope': round(slope_highs, 4),
-                    'target': round(low_min * 0.95, 2),
-                    'stop_loss': round(highs.iloc[-1] * 1.02, 2)
-                })
-
-        return patterns
+        n_windows = len(self.df) - window
+        stats = self._window_stats(window)
+        low_max = stats['low_max'][:n_windows]
+        low_min = stats['low_min'][:n_windows]
+        slope_highs = stats['high_slope'][:n_windows]
+
+        # Lows relatively flat (< 2% variation), highs falling (slope < 0)
+        low_range = (low_max - low_min) / low_min
+        flatness_score = 1.0 - (low_range / 0.02)
+        slope_score = np.minimum(1.0, np.abs(slope_highs) / low_min * 100)
+        confidence = (flatness_score * 0.6 + slope_score * 0.4)
+
+        matches = (low_range <= 0.02) & (slope_highs < 0) & (confidence >= self.min_confidence)
+
+        start = np.flatnonzero(matches)
+        end = start + window - 1
+
+        return {
+            'name': 'Descending Triangle',
+            'type': 'bearish_continuation',
+            'confidence': np.round(confidence[start] * 100, 1),
+            'start_time': self._index[start],
+            'end_time': self._index[end],
+            'support_level': np.round(low_min[start], 2),
+            'resistance_slope': np.round(slope_highs[start], 4),
+            'target': np.round(low_min[start] * 0.95, 2),
+            'stop_loss': np.round(self._high[end] * 1.02, 2)
+        }
 
     def detect_symmetrical_triangle(self) -> List[Dict]:
         """
@@ -529,51 +930,45 @@ class ChartPatternDetector:
         Pattern: Converging support and resistance
         Signal: Continuation (direction of breakout)
         """
-        patterns = []
+        return self._records(self._symmetrical_triangle_columns())
 
+    def _symmetrical_triangle_columns(self) -> Optional[Dict]:
+        """Result columns for detect_symmetrical_triangle"""
         if len(self.df) < 20:
-            return patterns
+            return None
 
         window = 20
-        for i in range(window, len(self.df)):
-            window_data = self.df.iloc[i-window:i]
-
-            highs = window_data['high']
-            lows = window_data['low']
-
-            # Calculate slopes
-            x = np.arange(len(highs))
-            slope_highs, _ = np.polyfit(x, highs.values, 1)
-            slope_lows, _ = np.polyfit(x, lows.values, 1)
-
-            # Highs should be falling, lows should be rising
-            if slope_highs >= 0 or slope_lows <= 0:
-                continue
-
-            # Slopes should be converging (similar magnitude)
-            slope_ratio = abs(slope_highs) / abs(slope_lows)
-            if slope_ratio < 0.5 or slope_ratio > 2.0:
-                continue
-
-            # Calculate confidence
-            symmetry_score = 1.0 - abs(1.0 - slope_ratio)
-            convergence_score = min(1.0, (abs(slope_highs) + abs(slope_lows)) / (highs.mean() * 0.01))
-
-            confidence = (symmetry_score * 0.7 + convergence_score * 0.3)
-
-            if confidence >= self.min_confidence:
-                patterns.append({
-                    'name': 'Symmetrical Triangle',
-                    'type': 'neutral_continuation',
-                    'confidence': round(confidence * 100, 1),
-                    'start_time': window_data.index[0],
-                    'end_time': window_data.index[-1],
-                    'upper_slope': round(slope_highs, 4),
-                    'lower_slope': round(slope_lows, 4),
-                    'apex_estimate': round((highs.iloc[-1] + lows.iloc[-1]) / 2, 2)
-                })
-
-        return patterns
+        n_windows = len(self.df) - window
+        stats = self._window_stats(window)
+        slope_highs = stats['high_slope'][:n_windows]
+        slope_lows = stats['low_slope'][:n_windows]
+        high_mean = stats['high_mean'][:n_windows]
+
+        # Highs should be falling, lows should be rising, with slopes
+        # converging at a similar magnitude
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope_ratio = np.abs(slope_highs) / np.abs(slope_lows)
+        symmetry_score = 1.0 - np.abs(1.0 - slope_ratio)
+        convergence_score = np.minimum(1.0, (np.abs(slope_highs) + np.abs(slope_lows)) / (high_mean * 0.01))
+        confidence = (symmetry_score * 0.7 + convergence_score * 0.3)
+
+        matches = ((slope_highs < 0) & (slope_lows > 0)
+                   & (slope_ratio >= 0.5) & (slope_ratio <= 2.0)
+                   & (confidence >= self.min_confidence))
+
+        start = np.flatnonzero(matches)
+        end = start + window - 1
+
+        return {
+            'name': 'Symmetrical Triangle',
+            'type': 'neutral_continuation',
+            'confidence': np.round(confidence[start] * 100, 1),
+            'start_time': self._index[start],
+            'end_time': self._index[end],
+            'upper_slope': np.round(slope_highs[start], 4),
+            'lower_slope': np.round(slope_lows[start], 4),
+            'apex_estimate': np.round((self._high[end] + self._low[end]) / 2, 2)
+        }
 
     # ===== WEDGES =====
 
@@ -584,47 +979,40 @@ class ChartPatternDetector:
         Pattern: Both support and resistance rising, converging
         Signal: Bearish reversal
         """
-        patterns = []
+        return self._records(self._rising_wedge_columns())
 
+    def _rising_wedge_columns(self) -> Optional[Dict]:
+        """Result columns for detect_rising_wedge"""
         if len(self.df) < 20:
-            return patterns
+            return None
 
         window = 20
-        for i in range(window, len(self.df)):
-            window_data = self.df.iloc[i-window:i]
-
-            highs = window_data['high']
-            lows = window_data['low']
-
-            # Calculate slopes
-            x = np.arange(len(highs))
-            slope_highs, _ = np.polyfit(x, highs.values, 1)
-            slope_lows, _ = np.polyfit(x, lows.values, 1)
-
-            # Both should be rising
-            if slope_highs <= 0 or slope_lows <= 0:
-                continue
-
-            # Should be converging (resistance rising slower than support)
-            if slope_highs >= slope_lows:
-                continue
-
-            confidence = min(1.0, (slope_lows - slope_highs) / lows.mean() * 100)
-
-            if confidence >= self.min_confidence:
-                patterns.append({
-                    'name': 'Rising Wedge',
-                    'type': 'bearish_reversal',
-                    'confidence': round(confidence * 100, 1),
-                    'start_time': window_data.index[0],
-                    'end_time': window_data.index[-1],
-                    'upper_slope': round(slope_highs, 4),
-                    'lower_slope': round(slope_lows, 4),
-                    'target': round(lows.iloc[0] * 0.95, 2),
-                    'stop_loss': round(highs.iloc[-1] * 1.02, 2)
-                })
-
-        return patterns
+        n_windows = len(self.df) - window
+        stats = self._window_stats(window)
+        slope_highs = stats['high_slope'][:n_windows]
+        slope_lows = stats['low_slope'][:n_windows]
+        low_mean = stats['low_mean'][:n_windows]
+
+        # Both rising, converging (resistance rising slower than support)
+        confidence = np.minimum(1.0, (slope_lows - slope_highs) / low_mean * 100)
+
+        matches = ((slope_highs > 0) & (slope_lows > 0) & (slope_highs < slope_lows)
+                   & (confidence >= self.min_confidence))
+
+        start = np.flatnonzero(matches)
+        end = start + window - 1
+
+        return {
+            'name': 'Rising Wedge',
+            'type': 'bearish_reversal',
+            'confidence': np.round(confidence[start] * 100, 1),
+            'start_time': self._index[start],
+            'end_time': self._index[end],
+            'upper_slope': np.round(slope_highs[start], 4),
+            'lower_slope': np.round(slope_lows[start], 4),
+            'target': np.round(self._low[start] * 0.95, 2),
+            'stop_loss': np.round(self._high[end] * 1.02, 2)
+        }
 
     def detect_falling_wedge(self) -> List[Dict]:
         """
@@ -633,47 +1021,41 @@ class ChartPatternDetector:
         Pattern: Both support and resistance falling, converging
         Signal: Bullish reversal
         """
-        patterns = []
+        return self._records(self._falling_wedge_columns())
 
+    def _falling_wedge_columns(self) -> Optional[Dict]:
+        """Result columns for detect_falling_wedge"""
         if len(self.df) < 20:
-            return patterns
+            return None
 
         window = 20
-        for i in range(window, len(self.df)):
-            window_data = self.df.iloc[i-window:i]
-
-            highs = window_data['high']
-            lows = window_data['low']
-
-            # Calculate slopes
-            x = np.arange(len(highs))
-            slope_highs, _ = np.polyfit(x, highs.values, 1)
-            slope_lows, _ = np.polyfit(x, lows.values, 1)
-
-            # Both should be falling
-            if slope_highs >= 0 or slope_lows >= 0:
-                continue
-
-            # Should be converging (support falling slower than resistance)
-            if abs(slope_lows) >= abs(slope_highs):
-                continue
-
-            confidence = min(1.0, (abs(slope_highs) - abs(slope_lows)) / lows.mean() * 100)
-
-            if confidence >= self.min_confidence:
-                patterns.append({
-                    'name': 'Falling Wedge',
-                    'type': 'bullish_reversal',
-                    'confidence': round(confidence * 100, 1),
-                    'start_time': window_data.index[0],
-                    'end_time': window_data.index[-1],
-                    'upper_slope': round(slope_highs, 4),
-                    'lower_slope': round(slope_lows, 4),
-                    'target': round(highs.iloc[0] * 1.05, 2),
-                    'stop_loss': round(lows.iloc[-1] * 0.98, 2)
-                })
-
-        return patterns
+        n_windows = len(self.df) - window
+        stats = self._window_stats(window)
+        slope_highs = stats['high_slope'][:n_windows]
+        slope_lows = stats['low_slope'][:n_windows]
+        low_mean = stats['low_mean'][:n_windows]
+
+        # Both falling, converging (support falling slower than resistance)
+        confidence = np.minimum(1.0, (np.abs(slope_highs) - np.abs(slope_lows)) / low_mean * 100)
+
+        matches = ((slope_highs < 0) & (slope_lows < 0)
+                   & (np.abs(slope_lows) < np.abs(slope_highs))
+                   & (confidence >= self.min_confidence))
+
+        start = np.flatnonzero(matches)
+        end = start + window - 1
+
+        return {
+            'name': 'Falling Wedge',
+            'type': 'bullish_reversal',
+            'confidence': np.round(confidence[start] * 100, 1),
+            'start_time': self._index[start],
+            'end_time': self._index[end],
+            'upper_slope': np.round(slope_highs[start], 4),
+            'lower_slope': np.round(slope_lows[start], 4),
+            'target': np.round(self._high[start] * 1.05, 2),
+            'stop_loss': np.round(self._low[end] * 0.98, 2)
+        }
 
     # ===== FLAGS =====
 
@@ -684,52 +1066,36 @@ class ChartPatternDetector:
         Pattern: Sharp rise (pole) + small consolidation (flag) sloping down
         Signal: Bullish continuation
         """
-        patterns = []
+        return self._records(self._bull_flag_columns())
 
+    def _bull_flag_columns(self) -> Optional[Dict]:
+        """Result columns for detect_bull_flag"""
         if len(self.df) < 30:
-            return patterns
-
-        # Look for sharp move up followed by consolidation
-        for i in range(15, len(self.df) - 10):
-            # Pole: Previous 15 candles
-            pole_data = self.df.iloc[i-15:i]
-            pole_gain = (pole_data['close'].iloc[-1] - pole_data['close'].iloc[0]) / pole_data['close'].iloc[0]
-
-            # Need at least 5% gain for pole
-            if pole_gain < 0.05:
-                continue
-
-            # Flag: Next 10 candles (consolidation)
-            flag_data = self.df.iloc[i:i+10]
-            flag_range = (flag_data['high'].max() - flag_data['low'].min()) / flag_data['close'].mean()
-
-            # Flag should be consolidating (< 3% range)
-            if flag_range > 0.03:
-                continue
-
-            # Check if flag is sloping down slightly
-            x = np.arange(len(flag_data))
-            slope, _ = np.polyfit(x, flag_data['close'].values, 1)
-
-            if slope > 0:
-                continue
-
-            confidence = min(1.0, pole_gain / 0.10)  # 10% pole = 100% confidence
-
-            if confidence >= self.min_confidence:
-                patterns.append({
-                    'name': 'Bull Flag',
-                    'type': 'bullish_continuation',
-                    'confidence': round(confidence * 100, 1),
-                    'start_time': pole_data.index[0],
-                    'end_time': flag_data.index[-1],
-                    'pole_height': round(pole_gain * 100, 1),
-                    'flag_slope': round(slope, 4),
-                    'target': round(flag_data['close'].iloc[-1] * (1 + pole_gain), 2),
-                    'stop_loss': round(flag_data['low'].min() * 0.98, 2)
-                })
-
-        return patterns
+            return None
+
+        # Pole: previous 15 candles, flag: next 10 candles (consolidation)
+        pole_gain, _, flag_low, flag_range, slope = self._flag_scan_stats()
+
+        confidence = np.minimum(1.0, pole_gain / 0.10)  # 10% pole = 100% confidence
+
+        # At least 5% pole gain, flag consolidating (< 3% range) and
+        # sloping down slightly
+        matches = ((pole_gain >= 0.05) & (flag_range <= 0.03) & (slope <= 0)
+                   & (confidence >= self.min_confidence))
+
+        i = np.flatnonzero(matches)
+
+        return {
+            'name': 'Bull Flag',
+            'type': 'bullish_continuation',
+            'confidence': np.round(confidence[i] * 100, 1),
+            'start_time': self._index[i - 15],
+            'end_time': self._index[i + 9],
+            'pole_height': np.round(pole_gain[i] * 100, 1),
+            'flag_slope': np.round(slope[i], 4),
+            'target': np.round(self._close[i + 9] * (1 + pole_gain[i]), 2),
+            'stop_loss': np.round(flag_low[i] * 0.98, 2)
+        }
 
     def detect_bear_flag(self) -> List[Dict]:
         """
@@ -738,51 +1104,37 @@ class ChartPatternDetector:
         Pattern: Sharp drop (pole) + small consolidation (flag) sloping up
         Signal: Bearish continuation
         """
-        patterns = []
+        return self._records(self._bear_flag_columns())
 
+    def _bear_flag_columns(self) -> Optional[Dict]:
+        """Result columns for detect_bear_flag"""
         if len(self.df) < 30:
-            return patterns
-
-        for i in range(15, len(self.df) - 10):
-            # Pole: Previous 15 candles (downtrend)
-            pole_data = self.df.iloc[i-15:i]
-            pole_loss = (pole_data['close'].iloc[0] - pole_data['close'].iloc[-1]) / pole_data['close'].iloc[0]
-
-            # Need at least 5% drop for pole
-            if pole_loss < 0.05:
-                continue
+            return None
 
-            # Flag: Next 10 candles (consolidation)
-            flag_data = self.df.iloc[i:i+10]
-            flag_range = (flag_data['high'].max() - flag_data['low'].min()) / flag_data['close'].mean()
+        # Pole: previous 15 candles (downtrend), flag: next 10 candles
+        pole_change, flag_high, _, flag_range, slope = self._flag_scan_stats()
+        pole_loss = -pole_change
 
-            # Flag should be consolidating (< 3% range)
-            if flag_range > 0.03:
-                continue
+        confidence = np.minimum(1.0, pole_loss / 0.10)
 
-            # Check if flag is sloping up slightly
-            x = np.arange(len(flag_data))
-            slope, _ = np.polyfit(x, flag_data['close'].values, 1)
+        # At least 5% pole drop, flag consolidating (< 3% range) and
+        # sloping up slightly
+        matches = ((pole_loss >= 0.05) & (flag_range <= 0.03) & (slope >= 0)
+                   & (confidence >= self.min_confidence))
 
-            if slope < 0:
-                continue
+        i = np.flatnonzero(matches)
 
-            confidence = min(1.0, pole_loss / 0.10)
-
-            if confidence >= self.min_confidence:
-                patterns.append({
-                    'name': 'Bear Flag',
-                    'type': 'bearish_continuation',
-                    'confidence': round(confidence * 100, 1),
-                    'start_time': pole_data.index[0],
-                    'end_time': flag_data.index[-1],
-                    'pole_height': round(pole_loss * 100, 1),
-                    'flag_slope': round(slope, 4),
-                    'target': round(flag_data['close'].iloc[-1] * (1 - pole_loss), 2),
-                    'stop_loss': round(flag_data['high'].max() * 1.02, 2)
-                })
-
-        return patterns
+        return {
+            'name': 'Bear Flag',
+            'type': 'bearish_continuation',
+            'confidence': np.round(confidence[i] * 100, 1),
+            'start_time': self._index[i - 15],
+            'end_time': self._index[i + 9],
+            'pole_height': np.round(pole_loss[i] * 100, 1),
+            'flag_slope': np.round(slope[i], 4),
+            'target': np.round(self._close[i + 9] * (1 - pole_loss[i]), 2),
+            'stop_loss': np.round(flag_high[i] * 1.02, 2)
+        }
 
     # ===== OTHER PATTERNS =====
 
@@ -793,54 +1145,52 @@ class ChartPatternDetector:
         Pattern: U-shaped recovery (cup) + small pullback (handle)
         Signal: Bullish continuation
         """
-        patterns = []
+        return self._records(self._cup_and_handle_columns())
 
+    def _cup_and_handle_columns(self) -> Optional[Dict]:
+        """Result columns for detect_cup_and_handle"""
         if len(self.df) < 40:
-            return patterns
-
-        # Look for U-shaped pattern followed by small consolidation
-        for i in range(30, len(self.df) - 10):
-            cup_data = self.df.iloc[i-30:i]
-
-            # Cup should have low in middle
-            cup_low_idx = cup_data['low'].idxmin()
-            cup_low_pos = cup_data.index.get_loc(cup_low_idx) / len(cup_data)
-
-            # Low should be roughly in middle (40-60% through)
-            if cup_low_pos < 0.4 or cup_low_pos > 0.6:
-                continue
-
-            # Handle: Next 10 candles (small pullback)
-            handle_data = self.df.iloc[i:i+10]
-            handle_depth = (cup_data['close'].iloc[-1] - handle_data['low'].min()) / cup_data['close'].iloc[-1]
-
-            # Handle should be shallow (< 5% pullback)
-            if handle_depth > 0.05:
-                continue
-
-            # Cup depth
-            cup_depth = (cup_data['close'].iloc[0] - cup_data['low'].min()) / cup_data['close'].iloc[0]
-
-            # Cup should be significant (> 10%)
-            if cup_depth < 0.10:
-                continue
-
-            confidence = min(1.0, cup_depth / 0.20)  # 20% cup = 100% confidence
-
-            if confidence >= self.min_confidence:
-                patterns.append({
-                    'name': 'Cup and Handle',
-                    'type': 'bullish_continuation',
-                    'confidence': round(confidence * 100, 1),
-                    'start_time': cup_data.index[0],
-                    'end_time': handle_data.index[-1],
-                    'cup_depth': round(cup_depth * 100, 1),
-                    'handle_depth': round(handle_depth * 100, 1),
-                    'target': round(handle_data['close'].iloc[-1] * (1 + cup_depth), 2),
-                    'stop_loss': round(handle_data['low'].min() * 0.98, 2)
-                })
-
-        return patterns
+            return None
+
+        # Cup: 30 candles ending before i, handle: the 10 candles from i,
+        # for every i in [30, len - 10)
+        n_cups = len(self.df) - 40
+        cups = np.lib.stride_tricks.sliding_window_view(self._low, 30)[:n_cups]
+        handles = np.lib.stride_tricks.sliding_window_view(self._low, 10)[30:30 + n_cups]
+        i = np.arange(30, 30 + n_cups)
+
+        # Cup should have low roughly in middle (40-60% through)
+        cup_low_rel = np.argmin(cups, axis=1)
+        cup_low_pos = cup_low_rel / 30
+
+        # Cup depth should be significant (> 10%)
+        cup_open = self._close[i - 30]
+        cup_depth = (cup_open - cups[np.arange(n_cups), cup_low_rel]) / cup_open
+
+        confidence = np.minimum(1.0, cup_depth / 0.20)  # 20% cup = 100% confidence
+
+        # Handle should be shallow (< 5% pullback)
+        cup_close = self._close[i - 1]
+        handle_low = handles.min(axis=1)
+        handle_depth = (cup_close - handle_low) / cup_close
+
+        matches = ((cup_low_pos >= 0.4) & (cup_low_pos <= 0.6) & (cup_depth >= 0.10)
+                   & (confidence >= self.min_confidence) & (handle_depth <= 0.05))
+
+        k = np.flatnonzero(matches)
+        i = i[k]
+
+        return {
+            'name': 'Cup and Handle',
+            'type': 'bullish_continuation',
+            'confidence': np.round(confidence[k] * 100, 1),
+            'start_time': self._index[i - 30],
+            'end_time': self._index[i + 9],
+            'cup_depth': np.round(cup_depth[k] * 100, 1),
+            'handle_depth': np.round(handle_depth[k] * 100, 1),
+            'target': np.round(self._close[i + 9] * (1 + cup_depth[k]), 2),
+            'stop_loss': np.round(handle_low[k] * 0.98, 2)
+        }
 
     def detect_rounding_bottom(self) -> List[Dict]:
         """
@@ -849,48 +1199,29 @@ class ChartPatternDetector:
         Pattern: Gradual U-shaped recovery
         Signal: Bullish reversal
         """
-        patterns = []
+        return self._records(self._rounding_bottom_columns())
 
+    def _rounding_bottom_columns(self) -> Optional[Dict]:
+        """Result columns for detect_rounding_bottom"""
         if len(self.df) < 30:
-            return patterns
+            return None
 
+        # Fit parabola to lows
         window = 30
-        for i in range(window, len(self.df)):
-            window_data = self.df.iloc[i-window:i]
-
-            # Fit parabola to lows
-            x = np.arange(len(window_data))
-            lows = window_data['low'].values
-
-            # Fit quadratic (y = ax^2 + bx + c)
-            try:
-                coeffs = np.polyfit(x, lows, 2)
-                a, b, c = coeffs
-
-                # For U-shape, a should be positive (opening upward)
-                if a <= 0:
-                    continue
-
-                # Calculate goodness of fit
-                fitted = np.polyval(coeffs, x)
-                r_squared = 1 - (np.sum((lows - fitted) ** 2) / np.sum((lows - np.mean(lows)) ** 2))
-
-                confidence = r_squared
-
-                if confidence >= self.min_confidence:
-                    patterns.append({
-                        'name': 'Rounding Bottom',
-                        'type': 'bullish_reversal',
-                        'confidence': round(confidence * 100, 1),
-                        'start_time': window_data.index[0],
-                        'end_time': window_data.index[-1],
-                        'curvature': round(a, 6),
-                        'r_squared': round(r_squared, 3)
-                    })
-            except:
-                continue
-
-        return patterns
+        curvature, r_squared = _rounding_fits(self._low, window)
+
+        # For U-shape, a should be positive (opening upward)
+        start = np.flatnonzero((curvature > 0) & (r_squared >= self.min_confidence))
+
+        return {
+            'name': 'Rounding Bottom',
+            'type': 'bullish_reversal',
+            'confidence': np.round(r_squared[start] * 100, 1),
+            'start_time': self._index[start],
+            'end_time': self._index[start + window - 1],
+            'curvature': np.round(curvature[start], 6),
+            'r_squared': np.round(r_squared[start], 3)
+        }
 
     def detect_rounding_top(self) -> List[Dict]:
         """
@@ -899,44 +1230,26 @@ class ChartPatternDetector:
         Pattern: Gradual inverted U-shaped decline
         Signal: Bearish reversal
         """
-        patterns = []
+        return self._records(self._rounding_top_columns())
 
+    def _rounding_top_columns(self) -> Optional[Dict]:
+        """Result columns for detect_rounding_top"""
         if len(self.df) < 30:
-            return patterns
+            return None
 
+        # Fit parabola to highs
         window = 30
-        for i in range(window, len(self.df)):
-            window_data = self.df.iloc[i-window:i]
-
-            # Fit parabola to highs
-            x = np.arange(len(window_data))
-            highs = window_data['high'].values
-
-            try:
-                coeffs = np.polyfit(x, highs, 2)
-                a, b, c = coeffs
-
-                # For inverted U-shape, a should be negative (opening downward)
-                if a >= 0:
-                    continue
-
-                # Calculate goodness of fit
-                fitted = np.polyval(coeffs, x)
-                r_squared = 1 - (np.sum((highs - fitted) ** 2) / np.sum((highs - np.mean(highs)) ** 2))
-
-                confidence = r_squared
-
-                if confidence >= self.min_confidence:
-                    patterns.append({
-                        'name': 'Rounding Top',
-                        'type': 'bearish_reversal',
-                        'confidence': round(confidence * 100, 1),
-                        'start_time': window_data.index[0],
-                        'end_time': window_data.index[-1],
-                        'curvature': round(a, 6),
-                        'r_squared': round(r_squared, 3)
-                    })
-            except:
-                continue
-
-        return patterns
+        curvature, r_squared = _rounding_fits(self._high, window)
+
+        # For inverted U-shape, a should be negative (opening downward)
+        start = np.flatnonzero((curvature < 0) & (r_squared >= self.min_confidence))
+
+        return {
+            'name': 'Rounding Top',
+            'type': 'bearish_reversal',
+            'confidence': np.round(r_squared[start] * 100, 1),
+            'start_time': self._index[start],
+            'end_time': self._index[start + window - 1],
+            'curvature': np.round(curvature[start], 6),
+            'r_squared': np.round(r_squared[start], 3)
+        }
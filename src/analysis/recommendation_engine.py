@@ -3,14 +3,19 @@ Recommendation Engine
 Generates daily stock recommendations based on pattern detection
 """
 
+import os
 import sqlite3
-from typing import List, Dict
+import functools
+import multiprocessing
+from typing import List, Dict, Optional, Tuple
 import logging
 from datetime import datetime, date
 
+import pandas as pd
+
 from .candlestick_patterns import CandlestickPatternDetector
 from ..utils.ohlc_generator import OHLCGenerator
-from ..database.db_manager import get_db_connection
+from ..database.db_manager import get_thread_connection
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +33,93 @@ NIFTY_50 = [
     'APOLLOHOSP', 'TATACONSUM', 'BPCL', 'HDFCLIFE', 'ADANIENT'
 ]
 
+# Stop scanning once this many times the requested number of picks is buffered
+PICK_OVERSAMPLE_FACTOR = 4
+
+# Candlestick pattern types that qualify as buy recommendations
+BULLISH_PATTERN_TYPES = {'bullish_reversal'}
+
+# Candle columns handed to the pattern detectors
+_CANDLE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Set once a failed candle batch query (usually a missing candles table) has
+# been logged as a warning; repeats are logged at debug level
+_candle_query_warned = False
+
+
+@functools.lru_cache(maxsize=256)
+def _get_candles_df(symbol: str, timeframe: str, day_key: date) -> pd.DataFrame:
+    """
+    OHLCV candles for a symbol on a trading day, memoised across scans
+
+    Called in the parent process, which hands the frames to the scan
+    workers, so the cache survives the per-scan worker pool. The returned
+    frame is shared between callers and must not be modified.
+
+    Args:
+        symbol: Stock symbol
+        timeframe: Candle timeframe (5m, 15m, 1h, etc.)
+        day_key: Trading day the candles belong to
+
+    Returns:
+        pd.DataFrame: Columns open, high, low, close, volume
+    """
+    # Using generator for MVP, will use real API later
+    candles = OHLCGenerator().generate_candles(count=100, timeframe=timeframe)
+
+    # Wrap the generator's column arrays without copying them
+    return pd.DataFrame({column: candles[column] for column in _CANDLE_COLUMNS}, copy=False)
+
+
+def _scan_symbol(symbol: str, df: Optional[pd.DataFrame] = None) -> List[Dict]:
+    """
+    Scan a single symbol for high-confidence bullish patterns
+
+    Kept at module level so it can be pickled into worker processes.
+
+    Args:
+        symbol: Stock symbol to scan
+        df: Candles for the symbol (default: generated candles for today)
+
+    Returns:
+        List[Dict]: Recommendations for this symbol (may be empty)
+    """
+    recommendations = []
+
+    try:
+        if df is None:
+            df = _get_candles_df(symbol, '5m', date.today())
+
+        # Detect patterns
+        pattern_detector = CandlestickPatternDetector(df)
+
+        # High-confidence (> 75, scores are integers) bullish patterns only
+        patterns = pattern_detector.get_active_patterns(
+            min_confidence=76,
+            pattern_types=BULLISH_PATTERN_TYPES
+        )
+
+        entry_price = round(df['close'].iloc[-1], 2)
+        for pattern in patterns:
+            recommendations.append({
+                'symbol': symbol,
+                'pattern_name': pattern['name'],
+                'confidence': pattern['confidence'],
+                'entry_price': entry_price,
+                'pattern_type': pattern['type'],
+                'description': pattern.get('description', '')
+            })
+
+    except Exception as e:
+        logger.error(f"Error processing {symbol}: {e}")
+
+    return recommendations
+
+
+def _scan_job(job: Tuple[str, Optional[pd.DataFrame]]) -> List[Dict]:
+    """Unpack a (symbol, candles) pair for Pool.imap"""
+    return _scan_symbol(*job)
+
 
 class RecommendationEngine:
     """Generate stock recommendations based on pattern detection"""
@@ -35,12 +127,29 @@ class RecommendationEngine:
     def __init__(self):
         self.ohlc_generator = OHLCGenerator()
 
-    def generate_daily_recommendations(self, stock_list: List[str] = None) -> List[Dict]:
+        # (day, limit, picks) from the last get_top_picks call on this engine
+        self._last_recs: Optional[Tuple[date, int, List[Dict]]] = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Database connection reused by every call on the current thread"""
+        return get_thread_connection()
+
+    def generate_daily_recommendations(self, stock_list: List[str] = None,
+                                       cores: Optional[int] = None,
+                                       limit: Optional[int] = None) -> List[Dict]:
         """
         Generate daily stock recommendations
 
+        Symbols are scanned in parallel worker processes since each one is
+        independent.
+
         Args:
             stock_list: List of stocks to scan (default: NIFTY 50)
+            cores: Worker processes to use (default: all cores, 0 or 1 = scan
+                in the current process)
+            limit: Number of picks the caller needs; scanning stops early once
+                PICK_OVERSAMPLE_FACTOR times as many are buffered (default: scan all)
 
         Returns:
             List[Dict]: Top recommendations sorted by confidence
@@ -48,39 +157,38 @@ class RecommendationEngine:
         if stock_list is None:
             stock_list = NIFTY_50
 
+        if cores is None:
+            cores = os.cpu_count() or 1
+
+        enough = limit * PICK_OVERSAMPLE_FACTOR if limit else None
+
+        # One query for every symbol's candles; the scan itself is pure CPU work.
+        # Fallback candles are resolved here rather than in the workers so
+        # _get_candles_df's cache outlives each scan's pool.
+        candles = self._fetch_ohlc_batch(stock_list)
+        today = date.today()
+        jobs = [
+            (symbol, candles[symbol] if symbol in candles else _get_candles_df(symbol, '5m', today))
+            for symbol in stock_list
+        ]
+
         logger.info(f"Scanning {len(stock_list)} stocks for patterns...")
         recommendations = []
 
-        for symbol in stock_list:
-            try:
-                # Get OHLC data (using generator for MVP, will use real API later)
-                ohlc_data = self.ohlc_generator.generate_candles(
-                    count=100,
-                    timeframe='5m'
-                )
-
-                # Detect patterns
-                # Convert ohlc list to pandas DataFrame
-                import pandas as pd
-                df = pd.DataFrame(ohlc_data)
-                pattern_detector = CandlestickPatternDetector(df)
-                patterns = pattern_detector.get_active_patterns()
-
-                # Filter high-confidence bullish patterns only
-                for pattern in patterns:
-                    if pattern['confidence'] > 75 and pattern['type'] == 'bullish':
-                        recommendations.append({
-                            'symbol': symbol,
-                            'pattern_name': pattern['name'],
-                            'confidence': pattern['confidence'],
-                            'entry_price': round(ohlc_data[-1]['close'], 2),
-                            'pattern_type': pattern['type'],
-                            'description': pattern.get('description', '')
-                        })
-
-            except Exception as e:
-                logger.error(f"Error processing {symbol}: {e}")
-                continue
+        if cores > 1 and len(jobs) > 1:
+            # Results arrive in stock_list order, so the early cut-off keeps the
+            # same symbols as the serial scan whichever worker finishes first.
+            # Leaving the pool context terminates workers still scanning.
+            with multiprocessing.Pool(processes=min(cores, len(jobs))) as pool:
+                for symbol_recs in pool.imap(_scan_job, jobs, chunksize=4):
+                    recommendations.extend(symbol_recs)
+                    if enough and len(recommendations) >= enough:
+                        break
+        else:
+            for job in jobs:
+                recommendations.extend(_scan_job(job))
+                if enough and len(recommendations) >= enough:
+                    break
 
         # Sort by confidence (highest first)
         recommendations.sort(key=lambda x: x['confidence'], reverse=True)
@@ -88,6 +196,49 @@ class RecommendationEngine:
         logger.info(f"Generated {len(recommendations)} recommendations")
         return recommendations
 
+    def _fetch_ohlc_batch(self, symbols: List[str], bars: int = 100) -> Dict[str, pd.DataFrame]:
+        """
+        Load the latest candles for many symbols with a single query
+
+        Symbols without stored candles are left out; the scan falls back to
+        generated candles for them.
+
+        Args:
+            symbols: Stock symbols to load
+            bars: Most recent candles to keep per symbol
+
+        Returns:
+            Dict[str, pd.DataFrame]: Symbol -> candles in time order
+        """
+        if not symbols:
+            return {}
+
+        placeholders = ', '.join('?' * len(symbols))
+        query = f'''
+            SELECT symbol, ts AS time, open, high, low, close, volume
+            FROM (
+                SELECT *, ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY ts DESC) AS rn
+                FROM candles
+                WHERE symbol IN ({placeholders})
+            )
+            WHERE rn <= ?
+            ORDER BY symbol, ts
+        '''
+
+        global _candle_query_warned
+        try:
+            rows = pd.read_sql_query(query, self._conn, params=[*symbols, bars])
+        except (sqlite3.Error, pd.errors.DatabaseError) as e:
+            log = logger.debug if _candle_query_warned else logger.warning
+            log(f"Candle batch query failed, using generated candles: {e}")
+            _candle_query_warned = True
+            return {}
+
+        return {
+            symbol: group.drop(columns='symbol').reset_index(drop=True)
+            for symbol, group in rows.groupby('symbol', sort=False)
+        }
+
     def get_top_picks(self, limit: int = 5) -> List[Dict]:
         """
         Get top N recommendations
@@ -98,8 +249,17 @@ class RecommendationEngine:
         Returns:
             List[Dict]: Top N recommendations
         """
-        all_recommendations = self.generate_daily_recommendations()
-        return all_recommendations[:limit]
+        # Cached per trading day for the whole process; copies keep callers
+        # from mutating the shared result
+        today = date.today()
+        picks = [dict(pick) for pick in _cached_top_picks(today, limit)]
+        self._last_recs = (today, limit, picks)
+        return picks
+
+    def invalidate(self):
+        """Drop cached picks so the next request runs a full scan"""
+        self._last_recs = None
+        _cached_top_picks.cache_clear()
 
     def save_daily_picks_to_db(self, picks: List[Dict]) -> int:
         """
@@ -115,36 +275,28 @@ class RecommendationEngine:
             logger.warning("No picks to save")
             return 0
 
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        today = date.today()
+        rows = [
+            (pick['symbol'], pick['pattern_name'], pick['confidence'], pick['entry_price'], today)
+            for pick in picks
+        ]
 
-        try:
-            today = date.today()
-            saved_count = 0
+        conn = self._conn
 
-            for pick in picks:
-                cursor.execute('''
+        try:
+            # Single prepared statement, committed (or rolled back) as one transaction
+            with conn:
+                conn.executemany('''
                     INSERT INTO daily_picks (symbol, pattern_name, confidence, entry_price, date)
                     VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    pick['symbol'],
-                    pick['pattern_name'],
-                    pick['confidence'],
-                    pick['entry_price'],
-                    today
-                ))
-                saved_count += 1
-
-            conn.commit()
-            logger.info(f"Saved {saved_count} daily picks to database")
-            return saved_count
+                ''', rows)
+
+            logger.info(f"Saved {len(rows)} daily picks to database")
+            return len(rows)
 
         except sqlite3.Error as e:
             logger.error(f"Error saving daily picks: {e}")
-            conn.rollback()
             return 0
-        finally:
-            conn.close()
 
     def get_todays_picks_from_db(self, limit: int = 5) -> List[Dict]:
         """
@@ -156,8 +308,7 @@ class RecommendationEngine:
         Returns:
             List[Dict]: Today's picks
         """
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
 
         try:
             cursor.execute('''
@@ -182,29 +333,34 @@ class RecommendationEngine:
         except sqlite3.Error as e:
             logger.error(f"Error getting today's picks: {e}")
             return []
-        finally:
-            conn.close()
 
     def refresh_daily_picks(self, limit: int = 5) -> List[Dict]:
         """
         Force refresh daily picks (clear cache and regenerate)
 
+        Picks this engine already generated today are rewritten to the
+        database without rescanning; call invalidate() first to force a scan.
+
         Args:
             limit: Number of picks to generate
 
         Returns:
             List[Dict]: Fresh picks
         """
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        conn = self._conn
 
         try:
             # Clear today's picks
-            cursor.execute("DELETE FROM daily_picks WHERE date = DATE('now')")
-            conn.commit()
-
-            # Generate fresh picks
-            fresh_picks = self.get_top_picks(limit)
+            with conn:
+                conn.execute("DELETE FROM daily_picks WHERE date = DATE('now')")
+
+            last = self._last_recs
+            if last and last[0] == date.today() and limit <= last[1]:
+                fresh_picks = [dict(pick) for pick in last[2][:limit]]
+            else:
+                # Generate fresh picks
+                self.invalidate()
+                fresh_picks = self.get_top_picks(limit)
             self.save_daily_picks_to_db(fresh_picks)
 
             logger.info(f"Refreshed {len(fresh_picks)} daily picks")
@@ -212,10 +368,18 @@ class RecommendationEngine:
 
         except sqlite3.Error as e:
             logger.error(f"Error refreshing daily picks: {e}")
-            conn.rollback()
             return []
-        finally:
-            conn.close()
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_top_picks(day: date, limit: int) -> Tuple[Dict, ...]:
+    """
+    Top picks for a trading day, shared by every engine in the process
+
+    Keyed by date so the first call on a new day triggers a fresh scan.
+    """
+    recommendations = RecommendationEngine().generate_daily_recommendations(limit=limit)
+    return tuple(recommendations[:limit])
 
 
 def generate_and_cache_picks():
@@ -8,6 +8,9 @@ import numpy as np
 from typing import Dict, Any, Optional
 import random
 
+from ..utils.jit import NUMBA_AVAILABLE
+from . import _fast_ta
+
 
 class TechnicalIndicators:
     """
@@ -17,6 +20,19 @@ class TechnicalIndicators:
     For production, install ta library: pip install ta
     """
 
+    # Realistic mock signals per indicator (neutral repeated to weight it)
+    _MOCK_SIGNALS = (
+        ('rsi', ('oversold_buy', 'overbought_sell', 'neutral', 'neutral', 'neutral')),
+        ('macd', ('bullish_cross_buy', 'bearish_cross_sell', 'neutral', 'neutral')),
+        ('bollinger', ('oversold_buy', 'overbought_sell', 'neutral', 'neutral')),
+        ('adx', ('strong_trend', 'weak_trend', 'neutral')),
+        ('stochastic', ('oversold_buy', 'overbought_sell', 'neutral', 'neutral')),
+        ('ema_cross', ('golden_cross_buy', 'death_cross_sell', 'neutral')),
+        ('volume', ('high_volume', 'low_volume', 'neutral')),
+        ('atr', ('high_volatility', 'low_volatility', 'neutral')),
+    )
+    _MOCK_SIGNAL_COUNTS = np.array([len(options) for _, options in _MOCK_SIGNALS])
+
     def __init__(self, ohlc_data: Optional[pd.DataFrame] = None):
         """
         Initialize with OHLC data
@@ -24,6 +40,8 @@ class TechnicalIndicators:
         Args:
             ohlc_data: DataFrame with columns: open, high, low, close, volume
         """
+        self._series_cache: Dict[str, pd.Series] = {}
+        self._rng = np.random.default_rng()
         self.df = ohlc_data
         self.use_ta = False
 
@@ -37,6 +55,99 @@ class TechnicalIndicators:
             print("⚠ TA library not available, using mock indicators")
             self.ta = None
 
+    @property
+    def df(self) -> Optional[pd.DataFrame]:
+        """OHLC data the indicators are computed from"""
+        return self._df
+
+    @df.setter
+    def df(self, ohlc_data: Optional[pd.DataFrame]):
+        """Replace the OHLC data and drop indicator series cached for the old one"""
+        self._df = ohlc_data
+        self._series_cache = {}
+
+    def _indicator_series(self, name: str) -> pd.Series:
+        """
+        Get an indicator series, computing it at most once per DataFrame
+
+        Indicators that come out of the same TA object (e.g. MACD line, signal
+        and histogram) are cached together on first use.
+        """
+        if name not in self._series_cache:
+            self._series_cache.update(self._compute_indicator(name))
+        return self._series_cache[name]
+
+    def _compute_indicator(self, name: str) -> Dict[str, pd.Series]:
+        """Compute the TA library series that provides the named indicator"""
+        df = self._df
+
+        # Compiled single-pass kernels give the same values as the ta classes
+        if NUMBA_AVAILABLE and name in ('rsi', 'macd', 'macd_signal', 'macd_diff', 'adx'):
+            fast = self._compute_fast_indicator(name)
+            if fast is not None:
+                return fast
+
+        if name == 'rsi':
+            from ta.momentum import RSIIndicator
+            return {'rsi': RSIIndicator(df['close'], window=14).rsi()}
+
+        if name in ('macd', 'macd_signal', 'macd_diff'):
+            from ta.trend import MACD
+            macd = MACD(df['close'])
+            return {
+                'macd': macd.macd(),
+                'macd_signal': macd.macd_signal(),
+                'macd_diff': macd.macd_diff()
+            }
+
+        if name in ('bb_upper', 'bb_lower'):
+            from ta.volatility import BollingerBands
+            bb = BollingerBands(df['close'])
+            return {'bb_upper': bb.bollinger_hband(), 'bb_lower': bb.bollinger_lband()}
+
+        if name == 'adx':
+            from ta.trend import ADXIndicator
+            return {'adx': ADXIndicator(df['high'], df['low'], df['close']).adx()}
+
+        if name == 'stoch_k':
+            from ta.momentum import StochasticOscillator
+            return {'stoch_k': StochasticOscillator(df['high'], df['low'], df['close']).stoch()}
+
+        if name == 'atr':
+            from ta.volatility import AverageTrueRange
+            return {'atr': AverageTrueRange(df['high'], df['low'], df['close']).average_true_range()}
+
+        raise KeyError(f"Unknown indicator: {name}")
+
+    def _compute_fast_indicator(self, name: str) -> Optional[Dict[str, pd.Series]]:
+        """
+        Compute an indicator with the _fast_ta kernels
+
+        Returns None when the frame is too short for the kernel, leaving the
+        ta library to handle it.
+        """
+        df = self._df
+        index = df.index
+        close = df['close'].to_numpy(dtype=np.float64)
+
+        if name == 'rsi':
+            return {'rsi': pd.Series(_fast_ta.rsi(close, 14), index=index)}
+
+        if name in ('macd', 'macd_signal', 'macd_diff'):
+            macd, macd_signal, macd_diff = _fast_ta.macd(close)
+            return {
+                'macd': pd.Series(macd, index=index),
+                'macd_signal': pd.Series(macd_signal, index=index),
+                'macd_diff': pd.Series(macd_diff, index=index)
+            }
+
+        if name == 'adx' and len(close) >= 2 * 14:
+            high = df['high'].to_numpy(dtype=np.float64)
+            low = df['low'].to_numpy(dtype=np.float64)
+            return {'adx': pd.Series(_fast_ta.adx(high, low, close, 14), index=index)}
+
+        return None
+
     def get_indicator_signals(self, index: int = -1) -> Dict[str, str]:
         """
         Get buy/sell signals from all indicators
@@ -56,15 +167,10 @@ class TechnicalIndicators:
         """Get real signals from TA library"""
         signals = {}
 
-        # Add indicators to dataframe
-        df = self.df.copy()
+        # Read indicator series directly; self.df is never copied or mutated
 
         # RSI
-        from ta.momentum import RSIIndicator
-        rsi_indicator = RSIIndicator(df['close'], window=14)
-        df['rsi'] = rsi_indicator.rsi()
-
-        rsi_value = df['rsi'].iloc[index]
+        rsi_value = self._indicator_series('rsi').iloc[index]
         if rsi_value < 30:
             signals['rsi'] = 'oversold_buy'
         elif rsi_value > 70:
@@ -73,14 +179,10 @@ class TechnicalIndicators:
             signals['rsi'] = 'neutral'
 
         # MACD
-        from ta.trend import MACD
-        macd = MACD(df['close'])
-        df['macd'] = macd.macd()
-        df['macd_signal'] = macd.macd_signal()
-        df['macd_diff'] = macd.macd_diff()
+        macd_diff = self._indicator_series('macd_diff')
 
-        macd_current = df['macd_diff'].iloc[index]
-        macd_previous = df['macd_diff'].iloc[index - 1]
+        macd_current = macd_diff.iloc[index]
+        macd_previous = macd_diff.iloc[index - 1]
 
         if macd_previous < 0 and macd_current > 0:
             signals['macd'] = 'bullish_cross_buy'
@@ -90,14 +192,9 @@ class TechnicalIndicators:
             signals['macd'] = 'neutral'
 
         # Bollinger Bands
-        from ta.volatility import BollingerBands
-        bb = BollingerBands(df['close'])
-        df['bb_upper'] = bb.bollinger_hband()
-        df['bb_lower'] = bb.bollinger_lband()
-
-        close = df['close'].iloc[index]
-        bb_upper = df['bb_upper'].iloc[index]
-        bb_lower = df['bb_lower'].iloc[index]
+        close = self.df['close'].iloc[index]
+        bb_upper = self._indicator_series('bb_upper').iloc[index]
+        bb_lower = self._indicator_series('bb_lower').iloc[index]
 
         if close < bb_lower:
             signals['bollinger'] = 'oversold_buy'
@@ -107,22 +204,14 @@ class TechnicalIndicators:
             signals['bollinger'] = 'neutral'
 
         # ADX (Trend Strength)
-        from ta.trend import ADXIndicator
-        adx = ADXIndicator(df['high'], df['low'], df['close'])
-        df['adx'] = adx.adx()
-
-        adx_value = df['adx'].iloc[index]
+        adx_value = self._indicator_series('adx').iloc[index]
         if adx_value > 25:
             signals['adx'] = 'strong_trend'
         else:
             signals['adx'] = 'weak_trend'
 
         # Stochastic
-        from ta.momentum import StochasticOscillator
-        stoch = StochasticOscillator(df['high'], df['low'], df['close'])
-        df['stoch_k'] = stoch.stoch()
-
-        stoch_value = df['stoch_k'].iloc[index]
+        stoch_value = self._indicator_series('stoch_k').iloc[index]
         if stoch_value < 20:
             signals['stochastic'] = 'oversold_buy'
         elif stoch_value > 80:
@@ -134,24 +223,13 @@ class TechnicalIndicators:
 
     def _get_mock_signals(self) -> Dict[str, str]:
         """Generate mock indicator signals for demonstration"""
-        signals = {}
+        # One batched draw picks a signal for every indicator
+        choices = self._rng.integers(0, self._MOCK_SIGNAL_COUNTS)
 
-        # Generate realistic mock signals
-        indicators = [
-            ('rsi', ['oversold_buy', 'overbought_sell', 'neutral', 'neutral', 'neutral']),
-            ('macd', ['bullish_cross_buy', 'bearish_cross_sell', 'neutral', 'neutral']),
-            ('bollinger', ['oversold_buy', 'overbought_sell', 'neutral', 'neutral']),
-            ('adx', ['strong_trend', 'weak_trend', 'neutral']),
-            ('stochastic', ['oversold_buy', 'overbought_sell', 'neutral', 'neutral']),
-            ('ema_cross', ['golden_cross_buy', 'death_cross_sell', 'neutral']),
-            ('volume', ['high_volume', 'low_volume', 'neutral']),
-            ('atr', ['high_volatility', 'low_volatility', 'neutral']),
-        ]
-
-        for indicator_name, possible_signals in indicators:
-            signals[indicator_name] = random.choice(possible_signals)
-
-        return signals
+        return {
+            indicator_name: possible_signals[choice]
+            for (indicator_name, possible_signals), choice in zip(self._MOCK_SIGNALS, choices)
+        }
 
     def get_indicator_values(self) -> Dict[str, float]:
         """
@@ -169,30 +247,19 @@ class TechnicalIndicators:
         """Get real indicator values"""
         values = {}
 
-        # Calculate indicators
-        from ta.momentum import RSIIndicator
-        from ta.trend import MACD, ADXIndicator
-        from ta.volatility import BollingerBands, AverageTrueRange
-
-        df = self.df.copy()
-
         # RSI
-        rsi_indicator = RSIIndicator(df['close'], window=14)
-        values['rsi'] = float(rsi_indicator.rsi().iloc[-1])
+        values['rsi'] = float(self._indicator_series('rsi').iloc[-1])
 
         # MACD
-        macd = MACD(df['close'])
-        values['macd'] = float(macd.macd().iloc[-1])
-        values['macd_signal'] = float(macd.macd_signal().iloc[-1])
-        values['macd_diff'] = float(macd.macd_diff().iloc[-1])
+        values['macd'] = float(self._indicator_series('macd').iloc[-1])
+        values['macd_signal'] = float(self._indicator_series('macd_signal').iloc[-1])
+        values['macd_diff'] = float(self._indicator_series('macd_diff').iloc[-1])
 
         # ADX
-        adx = ADXIndicator(df['high'], df['low'], df['close'])
-        values['adx'] = float(adx.adx().iloc[-1])
+        values['adx'] = float(self._indicator_series('adx').iloc[-1])
 
         # ATR
-        atr = AverageTrueRange(df['high'], df['low'], df['close'])
-        values['atr'] = float(atr.average_true_range().iloc[-1])
+        values['atr'] = float(self._indicator_series('atr').iloc[-1])
 
         return values
 
@@ -3,12 +3,68 @@ Zerodha Kite Connect Authentication
 Handles OAuth2 login flow and secure token management
 """
 
-import os
+import time
 import logging
-from typing import Optional, Dict, Any
+import threading
+from typing import TYPE_CHECKING, Optional, Dict, Any, Tuple
 from pathlib import Path
-from kiteconnect import KiteConnect
-from ..utils.encryption import SecureTokenStorage, EncryptionError
+from ..utils.encryption import SecureTokenStorage, EncryptionError, write_private_file
+
+if TYPE_CHECKING:
+    # Imported lazily in ZerodhaAuth so importing this module stays cheap
+    import requests
+    from kiteconnect import KiteConnect
+
+# How long a successful profile() check is trusted (tokens last a trading day)
+_VERIFY_TTL_SEC = 3600
+
+# Access tokens already read or written in this process, keyed by api_key and
+# stamped with the token file's (mtime_ns, size), so repeated ZerodhaAuth
+# instances skip reading (and decrypting) the file until it changes on disk
+_TOKEN_CACHE: Dict[str, Tuple[str, Tuple[int, int]]] = {}
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+# Keep-alive HTTP session per api_key shared by all ZerodhaAuth instances.
+# The dashboard builds a ZerodhaAuth per request; with a shared pool those
+# requests reuse open connections instead of each paying TCP and TLS setup.
+_SESSIONS: Dict[str, "requests.Session"] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def _token_file_stamp(token_file: Path) -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) of the token file, or None if it is missing"""
+    try:
+        stat = token_file.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _get_cached_token(api_key: str, stamp: Tuple[int, int]) -> Optional[str]:
+    """Return the in-memory token for api_key if the token file is unchanged"""
+    with _TOKEN_CACHE_LOCK:
+        entry = _TOKEN_CACHE.get(api_key)
+
+    if entry and entry[1] == stamp:
+        return entry[0]
+    return None
+
+
+def _cache_token(api_key: str, token: str, stamp: Tuple[int, int]):
+    """Remember token for api_key as the content of the token file at stamp"""
+    with _TOKEN_CACHE_LOCK:
+        _TOKEN_CACHE[api_key] = (token, stamp)
+
+
+def _shared_session(api_key: str) -> "requests.Session":
+    """Return the pooled keep-alive session for api_key, creating it once"""
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(api_key)
+        if session is None:
+            from ..utils.http_session import pooled_session
+
+            session = _SESSIONS[api_key] = pooled_session()
+        return session
 
 
 class ZerodhaAuth:
@@ -27,8 +83,12 @@ class ZerodhaAuth:
         self.api_secret = api_secret
         self.redirect_url = redirect_url or "http://localhost:8080/callback"
 
+        from kiteconnect import KiteConnect
+
         self.kite = KiteConnect(api_key=self.api_key)
+        self.kite.reqsession = _shared_session(self.api_key)
         self.access_token = None
+        self._verified_at: Optional[float] = None
         self.logger = logging.getLogger('auth')
 
         # Initialize secure token storage
@@ -67,6 +127,7 @@ class ZerodhaAuth:
             data = self.kite.generate_session(request_token, api_secret=self.api_secret)
             self.access_token = data["access_token"]
             self.kite.set_access_token(self.access_token)
+            self._verified_at = None
 
             # Save token to file for future use
             self._save_access_token(self.access_token)
@@ -87,26 +148,38 @@ class ZerodhaAuth:
         """
         self.access_token = access_token
         self.kite.set_access_token(access_token)
+        self._verified_at = None
         self.logger.info("Access token set successfully")
 
     def load_access_token(self) -> bool:
         """
         Load access token securely from file
 
+        A token loaded or saved earlier in this process is reused from memory
+        as long as the file's modification time and size are unchanged.
+
         Returns:
             True if token loaded successfully, False otherwise
         """
         token_file = Path("config/.access_token")
 
-        if not token_file.exists():
+        stamp = _token_file_stamp(token_file)
+        if stamp is None:
             self.logger.debug("Token file not found")
             return False
 
+        cached_token = _get_cached_token(self.api_key, stamp)
+        if cached_token:
+            self.set_access_token(cached_token)
+            self.logger.debug("Access token loaded from memory")
+            return True
+
         try:
             if self.use_encryption and self.token_storage:
                 # Load encrypted token
                 token = self.token_storage.load_token(token_file)
                 if token:
+                    _cache_token(self.api_key, token, stamp)
                     self.set_access_token(token)
                     self.logger.info("Access token loaded and decrypted successfully")
                     return True
@@ -115,10 +188,10 @@ class ZerodhaAuth:
                     return False
             else:
                 # Fallback: read plain text
-                with open(token_file, 'r') as f:
-                    token = f.read().strip()
+                token = token_file.read_bytes().decode().strip()
 
                 if token:
+                    _cache_token(self.api_key, token, stamp)
                     self.set_access_token(token)
                     self.logger.info("Access token loaded from file (plain text)")
                     return True
@@ -128,23 +201,32 @@ class ZerodhaAuth:
         return False
 
     def _save_access_token(self, token: str):
-        """Save access token securely to file"""
+        """
+        Save access token securely to file
+
+        The file is replaced atomically, and left untouched when it already
+        holds this token.
+        """
         token_file = Path("config/.access_token")
 
+        stamp = _token_file_stamp(token_file)
+        if stamp is not None and _get_cached_token(self.api_key, stamp) == token:
+            self.logger.debug("Access token unchanged, not rewriting token file")
+            return
+
         try:
             if self.use_encryption and self.token_storage:
                 # Save encrypted token
                 success = self.token_storage.save_token(token, token_file)
                 if success:
+                    _cache_token(self.api_key, token, _token_file_stamp(token_file))
                     self.logger.info("Access token saved securely (encrypted)")
                 else:
                     self.logger.error("Failed to save encrypted token")
             else:
                 # Fallback: plain text (INSECURE)
-                token_file.parent.mkdir(parents=True, exist_ok=True)
-                with open(token_file, 'w') as f:
-                    f.write(token)
-                os.chmod(token_file, 0o600)  # At least restrict permissions
+                write_private_file(token_file, token.encode())  # At least restrict permissions to the owner
+                _cache_token(self.api_key, token, _token_file_stamp(token_file))
                 self.logger.warning("Access token saved in PLAIN TEXT (insecure)")
                 self.logger.warning("Set ENCRYPTION_KEY in secrets.env for secure storage")
         except Exception as e:
@@ -154,18 +236,25 @@ class ZerodhaAuth:
         """
         Verify if access token is valid
 
+        A successful check is reused for _VERIFY_TTL_SEC seconds, until the
+        token is replaced, to avoid repeated profile() round-trips.
+
         Returns:
             True if token is valid, False otherwise
         """
+        if self._verified_at is not None and time.monotonic() - self._verified_at < _VERIFY_TTL_SEC:
+            return True
+
         try:
             profile = self.kite.profile()
+            self._verified_at = time.monotonic()
             self.logger.info(f"Token verified. User: {profile['user_name']}")
             return True
         except Exception as e:
             self.logger.error(f"Token verification failed: {e}")
             return False
 
-    def get_kite_instance(self) -> KiteConnect:
+    def get_kite_instance(self) -> "KiteConnect":
         """
         Get authenticated KiteConnect instance
 
@@ -177,7 +266,7 @@ class ZerodhaAuth:
 
         return self.kite
 
-    def interactive_login(self) -> KiteConnect:
+    def interactive_login(self) -> "KiteConnect":
         """
         Interactive login flow for development
 
@@ -215,7 +304,7 @@ class ZerodhaAuth:
         return self.kite
 
 
-def authenticate(api_key: str, api_secret: str, access_token: str = None) -> KiteConnect:
+def authenticate(api_key: str, api_secret: str, access_token: str = None) -> "KiteConnect":
     """
     Helper function for quick authentication
 
@@ -3,17 +3,293 @@ Core Backtesting Engine
 Simulates trading strategy execution on historical data
 """
 
+import sys
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Callable
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Callable
 from dataclasses import dataclass, field
 import logging
 
 from src.utils.logger import setup_logger
+from src.utils.jit import njit, prange
+
+
+# Result objects use __slots__ where dataclasses support it (Python 3.10+)
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Signal action codes consumed by the simulation kernel
+_NO_ACTION, _BUY, _SELL, _CLOSE = 0, 1, 2, 3
+_ACTION_CODES = {'BUY': _BUY, 'SELL': _SELL, 'CLOSE': _CLOSE}
+_SIDES = {_BUY: 'BUY', _SELL: 'SELL'}
+
+# Exit reason codes recorded by the simulation kernel; EXIT_REASONS maps a
+# ledger row's exit_reason code to its name
+_STOP_LOSS, _TARGET_HIT, _SIGNAL, _BACKTEST_END = 0, 1, 2, 3
+EXIT_REASONS = ('stop_loss', 'target_hit', 'signal', 'backtest_end')
+
+# Columns of an open position row (positions array); _SIGN is +1 long, -1 short
+_ENTRY_IDX, _SIGN, _SYMBOL, _ENTRY_PRICE, _QUANTITY, _STOP, _TARGET, _COMMISSION = range(8)
+_N_POSITION_FIELDS = 8
+
+# One closed trade per row; times are epoch nanoseconds (UTC for tz-aware
+# input, see BacktestResult.datetimes), side/exit_reason use the codes above
+# and symbol_id indexes BacktestResult.symbols. Rows are only
+# written when a position closes, so exit_time and exit_price are always set.
+TRADE_DTYPE = np.dtype([
+    ('entry_time', 'i8'),
+    ('exit_time', 'i8'),
+    ('symbol_id', 'i4'),
+    ('side', 'i1'),
+    ('entry_price', 'f8'),
+    ('exit_price', 'f8'),
+    ('qty', 'i8'),
+    ('stop_loss', 'f8'),
+    ('target', 'f8'),
+    ('pnl', 'f8'),
+    ('pnl_percent', 'f8'),
+    ('commission', 'f8'),
+    ('exit_reason', 'i1'),
+])
+
+# Columns of the per-bar equity frame
+_EQUITY_COLUMNS = ['time', 'capital', 'unrealized_pnl', 'total_equity', 'open_positions']
+
+# BacktestResult fields that to_dict reports rounded to 2 decimals, in output order
+_ROUND_FIELDS = (
+    'win_rate', 'total_pnl', 'total_pnl_percent', 'gross_profit', 'gross_loss',
+    'avg_win', 'avg_loss', 'largest_win', 'largest_loss', 'max_drawdown',
+    'max_drawdown_percent', 'profit_factor', 'sharpe_ratio', 'initial_capital',
+    'final_capital', 'peak_capital', 'total_commission',
+)
+
+# One row per parameter set of a batch backtest
+BATCH_SUMMARY_DTYPE = np.dtype([
+    ('total_trades', 'i8'),
+    ('winning_trades', 'i8'),
+    ('total_pnl', 'f8'),
+    ('final_capital', 'f8'),
+    ('max_drawdown', 'f8'),
+])
+
+
+@njit(cache=True)
+def _close_position(positions, k, ledger, n_closed, time_ns, exit_price, exit_idx, reason,
+                    slippage, commission_per_trade, commission_percent):
+    """
+    Close open position k into TRADE_DTYPE ledger row n_closed
+
+    Returns:
+        Capital released by the trade (entry value plus net P&L)
+    """
+    entry_price = positions[k, _ENTRY_PRICE]
+    quantity = positions[k, _QUANTITY]
+
+    # Apply slippage
+    exit_price = exit_price * (1 - slippage / 100)
+
+    pnl = positions[k, _SIGN] * (exit_price - entry_price) * quantity
+
+    exit_commission = commission_per_trade + (exit_price * quantity * commission_percent / 100)
+    net_pnl = pnl - exit_commission
+
+    trade = ledger[n_closed]
+    trade['entry_time'] = time_ns[int(positions[k, _ENTRY_IDX])]
+    trade['exit_time'] = time_ns[exit_idx]
+    trade['symbol_id'] = int(positions[k, _SYMBOL])
+    trade['side'] = _BUY if positions[k, _SIGN] > 0 else _SELL
+    trade['entry_price'] = entry_price
+    trade['exit_price'] = exit_price
+    trade['qty'] = int(quantity)
+    trade['stop_loss'] = positions[k, _STOP]
+    trade['target'] = positions[k, _TARGET]
+    trade['pnl'] = net_pnl
+    trade['pnl_percent'] = (net_pnl / (entry_price * quantity)) * 100
+    trade['commission'] = positions[k, _COMMISSION] + exit_commission
+    trade['exit_reason'] = reason
+
+    return (entry_price * quantity) + net_pnl
+
+
+@njit(cache=True)
+def _run_loop(time_ns, high, low, close, action, stop_loss, target, symbol_id, ledger,
+              initial_capital, commission_per_trade, commission_percent,
+              slippage, risk_per_trade, max_positions):
+    """
+    Simulate a strategy bar by bar over precomputed signal arrays
+
+    Open positions live in rows of a fixed (max_positions, fields) array that
+    never move: slots lists the occupied rows in entry order and free is a
+    stack of unused rows, so closing a position only compacts slots. Closed
+    trades are appended to ledger, a TRADE_DTYPE array with room for one trade
+    per bar. Each bar first checks stops and targets, then applies that bar's
+    signal, then records equity. Remaining positions are closed on the last
+    bar.
+
+    Returns:
+        Tuple of (n_closed, capital, unrealized_pnl, open_positions,
+        final_capital, peak_capital); the first n_closed ledger rows are filled
+    """
+    n = len(close)
+    positions = np.empty((max_positions, _N_POSITION_FIELDS))
+    slots = np.empty(max_positions, dtype=np.int64)
+    free = np.arange(max_positions)
+    n_free = max_positions
+    eq_capital = np.empty(n)
+    eq_unrealized = np.empty(n)
+    eq_open = np.empty(n, dtype=np.int64)
+
+    capital = initial_capital
+    peak = initial_capital
+    n_open = 0
+    n_closed = 0
+
+    for i in range(n):
+        # Stop-loss and target checks, in entry order
+        kept = 0
+        for j in range(n_open):
+            k = slots[j]
+            sign = positions[k, _SIGN]
+            stop = positions[k, _STOP]
+            tgt = positions[k, _TARGET]
+
+            # The stop is tested against the bar's adverse extreme and the
+            # target against its favourable one; a NaN target never hits
+            adverse = low[i] if sign > 0 else high[i]
+            favourable = high[i] if sign > 0 else low[i]
+            stop_hit = (stop != 0) & (sign * (stop - adverse) >= 0)
+            target_hit = sign * (favourable - tgt) >= 0
+
+            if stop_hit | target_hit:
+                # Stop-loss takes precedence when both are inside the bar
+                exit_price = stop if stop_hit else tgt
+                reason = _STOP_LOSS if stop_hit else _TARGET_HIT
+                capital += _close_position(positions, k, ledger, n_closed, time_ns, exit_price, i, reason,
+                                           slippage, commission_per_trade, commission_percent)
+                n_closed += 1
+                if capital > peak:
+                    peak = capital
+                free[n_free] = k
+                n_free += 1
+            else:
+                slots[kept] = k
+                kept += 1
+        n_open = kept
+
+        # Apply this bar's signal
+        act = action[i]
+        if act == _CLOSE:
+            kept = 0
+            for j in range(n_open):
+                k = slots[j]
+                if symbol_id[i] < 0 or positions[k, _SYMBOL] == symbol_id[i]:
+                    capital += _close_position(positions, k, ledger, n_closed, time_ns, close[i], i, _SIGNAL,
+                                               slippage, commission_per_trade, commission_percent)
+                    n_closed += 1
+                    if capital > peak:
+                        peak = capital
+                    free[n_free] = k
+                    n_free += 1
+                else:
+                    slots[kept] = k
+                    kept += 1
+            n_open = kept
+
+        elif act != _NO_ACTION and n_open < max_positions:
+            entry_price = close[i] * (1 + slippage / 100)
+            stop = stop_loss[i]
+            if np.isnan(stop):
+                # If no stop-loss provided, use default 2% risk
+                stop = entry_price * 0.98 if act == _BUY else entry_price * 1.02
+
+            # Position size from risk
+            risk_amount = capital * risk_per_trade
+            risk_per_share = abs(entry_price - stop)
+
+            if risk_per_share != 0:
+                quantity = float(int(risk_amount / risk_per_share))
+                trade_value = entry_price * quantity
+                commission = commission_per_trade + (trade_value * commission_percent / 100)
+
+                if quantity != 0 and trade_value + commission <= capital:
+                    capital -= commission
+                    n_free -= 1
+                    k = free[n_free]
+                    positions[k, _ENTRY_IDX] = i
+                    positions[k, _SIGN] = 1.0 if act == _BUY else -1.0
+                    positions[k, _SYMBOL] = symbol_id[i]
+                    positions[k, _ENTRY_PRICE] = entry_price
+                    positions[k, _QUANTITY] = quantity
+                    positions[k, _STOP] = stop
+                    positions[k, _TARGET] = target[i]
+                    positions[k, _COMMISSION] = commission
+                    slots[n_open] = k
+                    n_open += 1
+
+        # Record equity; a short's P&L is the long P&L with its sign flipped
+        unrealized = 0.0
+        for j in range(n_open):
+            k = slots[j]
+            unrealized += positions[k, _SIGN] * (close[i] - positions[k, _ENTRY_PRICE]) * positions[k, _QUANTITY]
+        eq_capital[i] = capital
+        eq_unrealized[i] = unrealized
+        eq_open[i] = n_open
+
+    # Close any remaining open positions at the end
+    for j in range(n_open):
+        capital += _close_position(positions, slots[j], ledger, n_closed, time_ns, close[n - 1], n - 1, _BACKTEST_END,
+                                   slippage, commission_per_trade, commission_percent)
+        n_closed += 1
+        if capital > peak:
+            peak = capital
+
+    return n_closed, eq_capital, eq_unrealized, eq_open, capital, peak
+
+
+@njit(parallel=True, cache=True)
+def _run_batch(time_ns, high, low, close, action, stop_loss, target, symbol_id, ledger_template,
+               summary, initial_capital, commission_per_trade, commission_percent,
+               slippage, risk_per_trade, max_positions):
+    """
+    Run _run_loop for every row of the 2D signal arrays in parallel
 
+    Market data is shared read-only between configurations; each one gets its
+    own ledger and only its BATCH_SUMMARY_DTYPE row in summary is written.
+    """
+    for c in prange(action.shape[0]):
+        ledger = np.empty_like(ledger_template)
+        n_closed, eq_capital, eq_unrealized, eq_open, final_capital, peak_capital = _run_loop(
+            time_ns, high, low, close, action[c], stop_loss[c], target[c], symbol_id[c], ledger,
+            initial_capital, commission_per_trade, commission_percent,
+            slippage, risk_per_trade, max_positions
+        )
 
-@dataclass
+        total_pnl = 0.0
+        winning = 0
+        for j in range(n_closed):
+            pnl = ledger[j]['pnl']
+            total_pnl += pnl
+            if pnl > 0:
+                winning += 1
+
+        peak = initial_capital
+        max_dd = 0.0
+        for i in range(len(close)):
+            equity = eq_capital[i] + eq_unrealized[i]
+            if equity > peak:
+                peak = equity
+            if peak - equity > max_dd:
+                max_dd = peak - equity
+
+        row = summary[c]
+        row['total_trades'] = n_closed
+        row['winning_trades'] = winning
+        row['total_pnl'] = total_pnl
+        row['final_capital'] = final_capital
+        row['max_drawdown'] = max_dd
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Trade:
     """Represents a single trade"""
     entry_time: datetime
@@ -32,7 +308,7 @@ class Trade:
     status: str = 'open'  # open, closed
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class BacktestResult:
     """Comprehensive backtest results"""
     # Basic metrics
@@ -66,43 +342,140 @@ class BacktestResult:
     total_commission: float = 0.0
 
     # Trade history
-    trades: List[Trade] = field(default_factory=list)
-    equity_curve: List[Dict] = field(default_factory=list)
+    ledger: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=TRADE_DTYPE), repr=False)
+    symbols: List[str] = field(default_factory=list)
+    equity: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=_EQUITY_COLUMNS), repr=False)
 
     # Execution details
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     duration_days: int = 0
+    tz: Any = None  # Timezone of the input candle times; None for naive times
+
+    _trades: Optional[List[Trade]] = field(default=None, repr=False, compare=False)
+    _equity_curve: Optional[List[Dict]] = field(default=None, repr=False, compare=False)
+    _trade_log: Optional[pd.DataFrame] = field(default=None, repr=False, compare=False)
+    _report: Optional[Dict] = field(default=None, repr=False, compare=False)
+
+    @property
+    def trades(self) -> List[Trade]:
+        """Closed trades as Trade objects, built from the ledger on first access"""
+        if self._trades is None:
+            ledger = self.ledger
+            entry_times = self.datetimes(ledger['entry_time']).tolist()
+            exit_times = self.datetimes(ledger['exit_time']).tolist()
+            self._trades = [
+                Trade(
+                    entry_time=entry_times[i],
+                    exit_time=exit_times[i],
+                    symbol=self.symbols[symbol_id],
+                    side=_SIDES[side],
+                    entry_price=entry_price,
+                    exit_price=exit_price,
+                    quantity=qty,
+                    stop_loss=stop_loss,
+                    target=None if np.isnan(target) else target,
+                    pnl=pnl,
+                    pnl_percent=pnl_percent,
+                    commission=commission,
+                    exit_reason=EXIT_REASONS[exit_reason],
+                    status='closed'
+                )
+                for i, (_, _, symbol_id, side, entry_price, exit_price, qty,
+                        stop_loss, target, pnl, pnl_percent, commission, exit_reason)
+                in enumerate(ledger.tolist())
+            ]
+        return self._trades
+
+    @property
+    def equity_curve(self) -> List[Dict]:
+        """Per-bar equity as a list of dicts, built from the equity frame on first access"""
+        if self._equity_curve is None:
+            self._equity_curve = self.equity.to_dict('records')
+        return self._equity_curve
+
+    @property
+    def trade_log(self) -> pd.DataFrame:
+        """
+        One row per closed trade with prices rounded to 2 decimals
+
+        Built column-wise from the ledger on first access and cached; each
+        access returns its own copy, so callers can modify it freely.
+        """
+        if self._trade_log is None:
+            self._trade_log = self._trade_log_frame(0, len(self.ledger)) if len(self.ledger) else pd.DataFrame()
+        return self._trade_log.copy()
+
+    def iter_trade_log(self, chunk_size: int = 100000) -> Iterator[pd.DataFrame]:
+        """
+        Yield the trade log in consecutive frames of at most chunk_size rows
+
+        Lets large logs be written out without holding them in memory at once.
+        """
+        for start in range(0, len(self.ledger), chunk_size):
+            yield self._trade_log_frame(start, min(start + chunk_size, len(self.ledger)))
+
+    def _trade_log_frame(self, start: int, stop: int) -> pd.DataFrame:
+        """Trade log rows for ledger[start:stop]"""
+        ledger = self.ledger[start:stop]
+
+        # Zero prices are unset levels and are left blank
+        stop_loss = np.round(ledger['stop_loss'], 2)
+        stop_loss[ledger['stop_loss'] == 0] = np.nan
+        target = np.round(ledger['target'], 2)
+        target[ledger['target'] == 0] = np.nan
+        exit_price = np.round(ledger['exit_price'], 2)
+        exit_price[ledger['exit_price'] == 0] = np.nan
+
+        return pd.DataFrame({
+            'trade_num': np.arange(start + 1, stop + 1),
+            'entry_time': self.datetimes(ledger['entry_time']),
+            'exit_time': self.datetimes(ledger['exit_time']),
+            'symbol': np.array(self.symbols, dtype=object)[ledger['symbol_id']],
+            'side': np.where(ledger['side'] == _BUY, 'BUY', 'SELL').astype(object),
+            'quantity': ledger['qty'],
+            'entry_price': np.round(ledger['entry_price'], 2),
+            'exit_price': exit_price,
+            'stop_loss': stop_loss,
+            'target': target,
+            'pnl': np.round(ledger['pnl'], 2),
+            'pnl_percent': np.round(ledger['pnl_percent'], 2),
+            'commission': np.round(ledger['commission'], 2),
+            'exit_reason': np.array(EXIT_REASONS, dtype=object)[ledger['exit_reason']],
+            'status': 'closed'
+        })
+
+    def datetimes(self, time_ns: np.ndarray) -> pd.DatetimeIndex:
+        """Epoch-nanosecond ledger times as timestamps in the input's timezone"""
+        return _to_datetimes(time_ns, self.tz)
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization"""
+        rounded = np.round(np.array([getattr(self, name) for name in _ROUND_FIELDS], dtype=np.float64), 2)
+
         return {
             'total_trades': self.total_trades,
             'winning_trades': self.winning_trades,
             'losing_trades': self.losing_trades,
-            'win_rate': round(self.win_rate, 2),
-            'total_pnl': round(self.total_pnl, 2),
-            'total_pnl_percent': round(self.total_pnl_percent, 2),
-            'gross_profit': round(self.gross_profit, 2),
-            'gross_loss': round(self.gross_loss, 2),
-            'avg_win': round(self.avg_win, 2),
-            'avg_loss': round(self.avg_loss, 2),
-            'largest_win': round(self.largest_win, 2),
-            'largest_loss': round(self.largest_loss, 2),
-            'max_drawdown': round(self.max_drawdown, 2),
-            'max_drawdown_percent': round(self.max_drawdown_percent, 2),
-            'profit_factor': round(self.profit_factor, 2),
-            'sharpe_ratio': round(self.sharpe_ratio, 2),
-            'initial_capital': round(self.initial_capital, 2),
-            'final_capital': round(self.final_capital, 2),
-            'peak_capital': round(self.peak_capital, 2),
-            'total_commission': round(self.total_commission, 2),
+            **dict(zip(_ROUND_FIELDS, rounded.tolist())),
             'start_date': self.start_date.isoformat() if self.start_date else None,
             'end_date': self.end_date.isoformat() if self.end_date else None,
             'duration_days': self.duration_days
         }
 
 
+def _to_datetimes(time_ns: np.ndarray, tz=None) -> pd.DatetimeIndex:
+    """
+    Rebuild timestamps from the kernels' epoch nanoseconds
+
+    Tz-aware input is simulated as UTC nanoseconds, so it is converted back
+    to tz here; naive input stays naive.
+    """
+    if tz is None:
+        return pd.to_datetime(time_ns)
+    return pd.to_datetime(time_ns, utc=True).tz_convert(tz)
+
+
 class BacktestEngine:
     """
     Core backtesting engine
@@ -145,9 +518,10 @@ class BacktestEngine:
         # State
         self.current_capital = initial_capital
         self.peak_capital = initial_capital
-        self.open_trades: List[Trade] = []
-        self.closed_trades: List[Trade] = []
-        self.equity_history: List[Dict] = []
+        self.closed_trades = np.empty(0, dtype=TRADE_DTYPE)
+        self.symbols: List[str] = []
+        self.equity = pd.DataFrame(columns=_EQUITY_COLUMNS)
+        self.tz = None
 
         self.logger = setup_logger('backtest_engine')
 
@@ -162,7 +536,11 @@ class BacktestEngine:
 
         Args:
             data: OHLCV DataFrame with columns [time, open, high, low, close, volume]
-            strategy_func: Strategy function that returns signals
+            strategy_func: Strategy function that returns signals. A function
+                with ``vectorized = True`` is called once with the full data and
+                returns signal arrays (see _collect_batch_signals); otherwise it
+                is called per bar with the data up to that bar, limited to the
+                last ``lookback`` bars if the function declares that attribute.
             strategy_params: Parameters for strategy function
 
         Returns:
@@ -178,33 +556,40 @@ class BacktestEngine:
         self._reset_state()
 
         # Ensure data is sorted by time
-        data = data.sort_values('time').reset_index(drop=True)
-
-        start_date = pd.to_datetime(data['time'].iloc[0])
-        end_date = pd.to_datetime(data['time'].iloc[-1])
-
-        # Process each candle
-        for idx in range(len(data)):
-            current_candle = data.iloc[idx]
-            current_time = pd.to_datetime(current_candle['time'])
-
-            # Update open positions (check stop-loss, targets, trailing stops)
-            self._update_open_positions(current_candle)
-
-            # Generate signal from strategy
-            # Strategy receives historical data up to current point
-            historical_data = data.iloc[:idx+1].copy()
-            signal = strategy_func(historical_data, strategy_params)
-
-            # Execute signal
-            if signal:
-                self._execute_signal(signal, current_candle, current_time)
+        data = self.prepare_data(data)
+
+        # Times travel through the simulation as epoch nanoseconds and are
+        # turned back into timestamps in the input's timezone
+        time_ns, high, low, close = self._market_arrays(data)
+        self.tz = self._time_zone(data)
+        times = _to_datetimes(time_ns, self.tz)
+        start_date = times[0]
+        end_date = times[-1]
+
+        # Strategies only see market data, so every bar's signal can be
+        # collected up front and the simulation run as one compiled loop
+        action, stop_loss, target, symbol_id, symbols = self._collect_signals(
+            data, strategy_func, strategy_params
+        )
 
-            # Record equity
-            self._record_equity(current_time, current_candle['close'])
+        ledger = np.empty(len(data), dtype=TRADE_DTYPE)
+        n_closed, eq_capital, eq_unrealized, eq_open, final_capital, peak_capital = _run_loop(
+            time_ns, high, low, close,
+            action, stop_loss, target, symbol_id, ledger,
+            *self._kernel_params()
+        )
 
-        # Close any remaining open positions at end
-        self._close_all_positions(data.iloc[-1], reason='backtest_end')
+        self.current_capital = final_capital
+        self.peak_capital = peak_capital
+        self.closed_trades = ledger[:n_closed]
+        self.symbols = symbols
+        self.equity = pd.DataFrame({
+            'time': times,
+            'capital': eq_capital,
+            'unrealized_pnl': eq_unrealized,
+            'total_equity': eq_capital + eq_unrealized,
+            'open_positions': eq_open
+        }, copy=False)
 
         # Calculate final metrics
         result = self._calculate_results(start_date, end_date)
@@ -215,164 +600,221 @@ class BacktestEngine:
 
         return result
 
-    def _execute_signal(self, signal: Dict, candle: pd.Series, current_time: datetime):
-        """Execute a trading signal"""
-        action = signal.get('action')  # BUY, SELL, CLOSE
+    def run_backtest_batch(
+        self,
+        data: pd.DataFrame,
+        strategy_func: Callable,
+        param_grid: List[Dict],
+        top_k: int = 0
+    ) -> Tuple[np.ndarray, List[Tuple[Dict, BacktestResult]]]:
+        """
+        Backtest one strategy over many parameter sets in parallel
 
-        if action == 'CLOSE':
-            # Close specific position or all positions
-            symbol = signal.get('symbol')
-            if symbol:
-                self._close_position_by_symbol(symbol, candle, reason='signal')
-            else:
-                self._close_all_positions(candle, reason='signal')
-            return
-
-        # Check if we can open new position
-        if len(self.open_trades) >= self.max_positions:
-            return
-
-        # Calculate position size based on risk
-        entry_price = candle['close'] * (1 + self.slippage / 100)
-        stop_loss = signal.get('stop_loss')
-        target = signal.get('target')
-
-        if not stop_loss:
-            # If no stop-loss provided, use default 2% risk
-            stop_loss = entry_price * 0.98 if action == 'BUY' else entry_price * 1.02
-
-        # Calculate quantity based on risk
-        risk_amount = self.current_capital * self.risk_per_trade
-        risk_per_share = abs(entry_price - stop_loss)
-
-        if risk_per_share == 0:
-            return
-
-        quantity = int(risk_amount / risk_per_share)
-
-        if quantity == 0:
-            return
-
-        # Calculate commission
-        trade_value = entry_price * quantity
-        commission = self.commission_per_trade + (trade_value * self.commission_percent / 100)
-
-        # Check if we have enough capital
-        required_capital = trade_value + commission
-        if required_capital > self.current_capital:
-            return
-
-        # Create trade
-        trade = Trade(
-            entry_time=current_time,
-            symbol=signal.get('symbol', 'UNKNOWN'),
-            side=action,
-            entry_price=entry_price,
-            quantity=quantity,
-            stop_loss=stop_loss,
-            target=target,
-            commission=commission
+        Signals are collected for every parameter set (cheap for vectorized
+        strategies), then all simulations run in one compiled loop spread over
+        the available cores. Only summary figures are kept per parameter set;
+        the best top_k by total P&L are re-run with run_backtest.
+
+        Args:
+            data: OHLCV DataFrame with columns [time, open, high, low, close, volume]
+            strategy_func: Strategy function, as for run_backtest
+            param_grid: Strategy parameters, one dict per configuration
+            top_k: Number of best configurations to return full results for
+
+        Returns:
+            Tuple of (summary, top_results). summary is a BATCH_SUMMARY_DTYPE
+            array aligned with param_grid; top_results is a list of
+            (params, BacktestResult) sorted by total P&L, best first.
+        """
+        self.logger.info(f"Starting batch backtest of {len(param_grid)} parameter sets "
+                        f"on {len(data)} candles")
+
+        summary = np.zeros(len(param_grid), dtype=BATCH_SUMMARY_DTYPE)
+        if not param_grid:
+            return summary, []
+
+        data = self.prepare_data(data)
+        n = len(data)
+
+        action = np.empty((len(param_grid), n), dtype=np.int8)
+        stop_loss = np.empty((len(param_grid), n))
+        target = np.empty((len(param_grid), n))
+        symbol_id = np.empty((len(param_grid), n), dtype=np.int64)
+        for c, params in enumerate(param_grid):
+            action[c], stop_loss[c], target[c], symbol_id[c], _ = self._collect_signals(
+                data, strategy_func, params
+            )
+
+        _run_batch(
+            *self._market_arrays(data),
+            action, stop_loss, target, symbol_id,
+            np.empty(n, dtype=TRADE_DTYPE), summary,
+            *self._kernel_params()
         )
 
-        # Deduct capital
-        self.current_capital -= commission
-
-        # Add to open trades
-        self.open_trades.append(trade)
-
-        self.logger.debug(f"{action} {quantity} @ ₹{entry_price:.2f}, SL: ₹{stop_loss:.2f}")
-
-    def _update_open_positions(self, candle: pd.Series):
-        """Update open positions - check stop-loss and targets"""
-        for trade in self.open_trades[:]:  # Copy list to avoid modification issues
-            high = candle['high']
-            low = candle['low']
-            close = candle['close']
-
-            if trade.side == 'BUY':
-                # Check stop-loss
-                if trade.stop_loss and low <= trade.stop_loss:
-                    self._close_trade(trade, trade.stop_loss, candle['time'], 'stop_loss')
-                # Check target
-                elif trade.target and high >= trade.target:
-                    self._close_trade(trade, trade.target, candle['time'], 'target_hit')
-
-            elif trade.side == 'SELL':
-                # Check stop-loss
-                if trade.stop_loss and high >= trade.stop_loss:
-                    self._close_trade(trade, trade.stop_loss, candle['time'], 'stop_loss')
-                # Check target
-                elif trade.target and low <= trade.target:
-                    self._close_trade(trade, trade.target, candle['time'], 'target_hit')
-
-    def _close_trade(self, trade: Trade, exit_price: float, exit_time: datetime, reason: str):
-        """Close a trade and calculate P&L"""
-        # Apply slippage
-        exit_price = exit_price * (1 - self.slippage / 100)
-
-        # Calculate P&L
-        if trade.side == 'BUY':
-            pnl = (exit_price - trade.entry_price) * trade.quantity
-        else:  # SELL
-            pnl = (trade.entry_price - exit_price) * trade.quantity
-
-        # Calculate commission for exit
-        exit_commission = self.commission_per_trade + (exit_price * trade.quantity * self.commission_percent / 100)
-        total_commission = trade.commission + exit_commission
-
-        # Net P&L
-        net_pnl = pnl - exit_commission
-        pnl_percent = (net_pnl / (trade.entry_price * trade.quantity)) * 100
-
-        # Update trade
-        trade.exit_time = exit_time
-        trade.exit_price = exit_price
-        trade.pnl = net_pnl
-        trade.pnl_percent = pnl_percent
-        trade.commission = total_commission
-        trade.exit_reason = reason
-        trade.status = 'closed'
-
-        # Update capital
-        self.current_capital += (trade.entry_price * trade.quantity) + net_pnl
-
-        # Update peak
-        if self.current_capital > self.peak_capital:
-            self.peak_capital = self.current_capital
-
-        # Move to closed trades
-        self.open_trades.remove(trade)
-        self.closed_trades.append(trade)
-
-    def _close_position_by_symbol(self, symbol: str, candle: pd.Series, reason: str):
-        """Close position for specific symbol"""
-        for trade in self.open_trades[:]:
-            if trade.symbol == symbol:
-                self._close_trade(trade, candle['close'], candle['time'], reason)
-
-    def _close_all_positions(self, candle: pd.Series, reason: str):
-        """Close all open positions"""
-        for trade in self.open_trades[:]:
-            self._close_trade(trade, candle['close'], candle['time'], reason)
-
-    def _record_equity(self, timestamp: datetime, price: float):
-        """Record equity curve point"""
-        # Calculate unrealized P&L from open positions
-        unrealized_pnl = sum(
-            (price - t.entry_price) * t.quantity if t.side == 'BUY'
-            else (t.entry_price - price) * t.quantity
-            for t in self.open_trades
+        top_results = []
+        if top_k > 0:
+            best = np.argsort(-summary['total_pnl'], kind='stable')[:top_k]
+            top_results = [
+                (param_grid[c], self.run_backtest(data, strategy_func, param_grid[c]))
+                for c in best
+            ]
+
+        return summary, top_results
+
+    def prepare_data(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Sort candles by time and make the price columns float64, once per run
+
+        Input that is already sorted, indexed 0..n-1 and float64 is used as-is
+        rather than copied. Prices stay float64: float32 would move fills and
+        stop/target comparisons by up to ~1e-4 at typical share prices.
+
+        Callers that precompute indicators over the whole series should run
+        their data through this first, so that bar i of their arrays is bar i
+        of the simulation (and the engine does not re-sort).
+        """
+        if not (data['time'].is_monotonic_increasing and data.index.equals(pd.RangeIndex(len(data)))):
+            data = data.sort_values('time').reset_index(drop=True)
+
+        price_dtypes = {
+            column: np.float64
+            for column in ('open', 'high', 'low', 'close')
+            if data[column].dtype != np.float64
+        }
+        if price_dtypes:
+            data = data.astype(price_dtypes)
+
+        return data
+
+    def _market_arrays(self, data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Epoch-nanosecond times and float64 high/low/close arrays for the kernels"""
+        return (
+            pd.to_datetime(data['time']).to_numpy(dtype='datetime64[ns]').view(np.int64),
+            data['high'].to_numpy(dtype=np.float64),
+            data['low'].to_numpy(dtype=np.float64),
+            data['close'].to_numpy(dtype=np.float64)
         )
 
-        total_equity = self.current_capital + unrealized_pnl
+    @staticmethod
+    def _time_zone(data: pd.DataFrame) -> Any:
+        """Timezone of the candle times, None when they are naive"""
+        return getattr(pd.to_datetime(data['time']).dtype, 'tz', None)
+
+    def _kernel_params(self) -> Tuple[float, float, float, float, float, int]:
+        """Engine settings in the order the simulation kernels take them"""
+        return (
+            float(self.initial_capital), float(self.commission_per_trade),
+            float(self.commission_percent), float(self.slippage),
+            float(self.risk_per_trade), int(self.max_positions)
+        )
 
-        self.equity_history.append({
-            'time': timestamp,
-            'capital': self.current_capital,
-            'unrealized_pnl': unrealized_pnl,
-            'total_equity': total_equity,
-            'open_positions': len(self.open_trades)
-        })
+    def _collect_signals(
+        self,
+        data: pd.DataFrame,
+        strategy_func: Callable,
+        strategy_params: Dict
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List]:
+        """
+        Run the strategy and encode its signals as arrays
+
+        Returns:
+            Tuple of (action, stop_loss, target, symbol_id, symbols). Missing
+            stop-loss/target values are NaN; symbol_id indexes symbols, and is
+            -1 for a CLOSE that applies to every position.
+        """
+        if getattr(strategy_func, 'vectorized', False):
+            return self._collect_batch_signals(len(data), strategy_func(data, strategy_params))
+
+        n = len(data)
+        lookback = getattr(strategy_func, 'lookback', None) or n
+        action = np.zeros(n, dtype=np.int8)
+        stop_loss = np.full(n, np.nan)
+        target = np.full(n, np.nan)
+        symbol_id = np.full(n, -1, dtype=np.int64)
+        symbols: Dict = {}
+
+        for idx in range(n):
+            # Strategy receives historical data up to current point (at most
+            # its lookback), as a read-only slice of the sorted frame
+            historical_data = data.iloc[max(0, idx + 1 - lookback):idx + 1]
+            signal = strategy_func(historical_data, strategy_params)
+
+            if not signal:
+                continue
+
+            code = _ACTION_CODES.get(signal.get('action'))
+            if code is None:
+                continue
+            action[idx] = code
+
+            if code == _CLOSE:
+                # Close a specific symbol, or all positions when none is given
+                symbol = signal.get('symbol')
+                if symbol:
+                    symbol_id[idx] = symbols.setdefault(symbol, len(symbols))
+            else:
+                symbol = signal.get('symbol', 'UNKNOWN')
+                symbol_id[idx] = symbols.setdefault(symbol, len(symbols))
+                stop_loss[idx] = signal.get('stop_loss') or np.nan
+                target[idx] = signal.get('target') or np.nan
+
+        return action, stop_loss, target, symbol_id, list(symbols)
+
+    def _collect_batch_signals(
+        self,
+        n: int,
+        signals: Dict
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List]:
+        """
+        Encode the output of a vectorized strategy
+
+        Args:
+            n: Number of bars
+            signals: Dict with an 'action' array of length n ('BUY', 'SELL',
+                'CLOSE' or None per bar) and optional 'stop_loss', 'target' and
+                'symbol' entries, each either a scalar or a length-n array
+
+        Returns:
+            Same tuple as _collect_signals
+        """
+        actions = np.asarray(signals['action'], dtype=object)
+        if actions.shape != (n,):
+            raise ValueError(f"Vectorized strategy returned {actions.shape[0]} actions for {n} bars")
+
+        action = np.zeros(n, dtype=np.int8)
+        for name, code in _ACTION_CODES.items():
+            action[actions == name] = code
+        is_close = action == _CLOSE
+
+        levels = []
+        for key in ('stop_loss', 'target'):
+            values = np.array(
+                np.broadcast_to(np.asarray(signals.get(key, np.nan), dtype=np.float64), n)
+            )
+            # Zero or missing levels fall back to the engine defaults
+            values[(values == 0) | is_close] = np.nan
+            levels.append(values)
+
+        symbol = signals.get('symbol')
+        if symbol is None or isinstance(symbol, str):
+            symbol = np.full(n, symbol or None, dtype=object)
+        else:
+            symbol = np.asarray(symbol, dtype=object)
+            symbol[symbol == ''] = None
+
+        symbol_id, uniques = pd.factorize(symbol)
+        symbols = list(uniques)
+
+        # Entries without a symbol are booked as UNKNOWN; a CLOSE without one
+        # closes every position
+        unnamed_entries = (symbol_id < 0) & (action != _NO_ACTION) & ~is_close
+        if unnamed_entries.any():
+            if 'UNKNOWN' not in symbols:
+                symbols.append('UNKNOWN')
+            symbol_id[unnamed_entries] = symbols.index('UNKNOWN')
+
+        return action, levels[0], levels[1], symbol_id.astype(np.int64), symbols
 
     def _calculate_results(self, start_date: datetime, end_date: datetime) -> BacktestResult:
         """Calculate comprehensive backtest results"""
@@ -384,73 +826,71 @@ class BacktestEngine:
         result.start_date = start_date
         result.end_date = end_date
         result.duration_days = (end_date - start_date).days
+        result.tz = self.tz
 
         # Trade statistics
-        result.total_trades = len(self.closed_trades)
-        result.trades = self.closed_trades
-        result.equity_curve = self.equity_history
+        trades = self.closed_trades
+        result.total_trades = len(trades)
+        result.ledger = trades
+        result.symbols = self.symbols
+        result.equity = self.equity
 
         if result.total_trades == 0:
             return result
 
-        # Win/Loss analysis
-        winning_trades = [t for t in self.closed_trades if t.pnl > 0]
-        losing_trades = [t for t in self.closed_trades if t.pnl < 0]
+        # Win/Loss analysis; each side's P&L is gathered once and reused
+        pnl = trades['pnl']
+        win_pnl = pnl[pnl > 0]
+        loss_pnl = pnl[pnl < 0]
 
-        result.winning_trades = len(winning_trades)
-        result.losing_trades = len(losing_trades)
+        result.winning_trades = win_pnl.size
+        result.losing_trades = loss_pnl.size
         result.win_rate = (result.winning_trades / result.total_trades) * 100
 
         # P&L metrics
-        result.total_pnl = sum(t.pnl for t in self.closed_trades)
+        result.total_pnl = float(pnl.sum())
         result.total_pnl_percent = ((result.final_capital - result.initial_capital) / result.initial_capital) * 100
-        result.gross_profit = sum(t.pnl for t in winning_trades)
-        result.gross_loss = abs(sum(t.pnl for t in losing_trades))
-        result.total_commission = sum(t.commission for t in self.closed_trades)
+        result.gross_profit = float(win_pnl.sum())
+        result.gross_loss = float(abs(loss_pnl.sum()))
+        result.total_commission = float(trades['commission'].sum())
 
-        if winning_trades:
-            result.avg_win = result.gross_profit / len(winning_trades)
-            result.largest_win = max(t.pnl for t in winning_trades)
+        if result.winning_trades:
+            result.avg_win = result.gross_profit / result.winning_trades
+            result.largest_win = float(win_pnl.max())
 
-        if losing_trades:
-            result.avg_loss = result.gross_loss / len(losing_trades)
-            result.largest_loss = min(t.pnl for t in losing_trades)
+        if result.losing_trades:
+            result.avg_loss = result.gross_loss / result.losing_trades
+            result.largest_loss = float(loss_pnl.min())
 
         # Profit factor
         if result.gross_loss > 0:
             result.profit_factor = result.gross_profit / result.gross_loss
 
-        # Drawdown calculation
-        if self.equity_history:
-            equity_values = [e['total_equity'] for e in self.equity_history]
-            peak = self.initial_capital
-            max_dd = 0
+        if self.equity.empty:
+            return result
+
+        equity = self.equity['total_equity'].to_numpy(dtype=np.float64)
 
-            for equity in equity_values:
-                if equity > peak:
-                    peak = equity
-                drawdown = peak - equity
-                if drawdown > max_dd:
-                    max_dd = drawdown
+        # Drawdown calculation, with the running peak starting from the initial capital
+        peaks = np.maximum.accumulate(equity)
+        np.maximum(peaks, self.initial_capital, out=peaks)
+        drawdowns = peaks - equity
 
-            result.max_drawdown = max_dd
-            if peak > 0:
-                result.max_drawdown_percent = (max_dd / peak) * 100
+        dd_idx = int(drawdowns.argmax())
+        result.max_drawdown = float(drawdowns[dd_idx])
+        peak_at_dd = peaks[dd_idx]
+        if peak_at_dd > 0:
+            result.max_drawdown_percent = float(result.max_drawdown / peak_at_dd * 100)
 
         # Sharpe ratio (simplified - assumes daily returns)
-        if self.equity_history and len(self.equity_history) > 1:
-            returns = []
-            for i in range(1, len(self.equity_history)):
-                prev_equity = self.equity_history[i-1]['total_equity']
-                curr_equity = self.equity_history[i]['total_equity']
-                if prev_equity > 0:
-                    returns.append((curr_equity - prev_equity) / prev_equity)
-
-            if returns:
-                mean_return = np.mean(returns)
-                std_return = np.std(returns)
-                if std_return > 0:
-                    result.sharpe_ratio = (mean_return / std_return) * np.sqrt(252)  # Annualized
+        prev_equity = equity[:-1]
+        valid = prev_equity > 0
+        if valid.any():
+            returns = (equity[1:][valid] - prev_equity[valid]) / prev_equity[valid]
+            mean_return = returns.mean()
+            std_return = returns.std()
+            if std_return > 0:
+                result.sharpe_ratio = float((mean_return / std_return) * np.sqrt(252))  # Annualized
 
         return result
 
@@ -458,6 +898,7 @@ class BacktestEngine:
         """Reset engine state for new backtest"""
         self.current_capital = self.initial_capital
         self.peak_capital = self.initial_capital
-        self.open_trades = []
-        self.closed_trades = []
-        self.equity_history = []
+        self.closed_trades = np.empty(0, dtype=TRADE_DTYPE)
+        self.symbols = []
+        self.equity = pd.DataFrame(columns=_EQUITY_COLUMNS)
+        self.tz = None
@@ -18,6 +18,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.backtest import StrategyBacktester, PerformanceAnalyzer
 from src.utils.ohlc_generator import OHLCGenerator
 
+try:
+    import pyarrow  # noqa: F401 - enables the multithreaded pyarrow CSV parser
+    _CSV_ENGINE = 'pyarrow'
+except ImportError:
+    _CSV_ENGINE = 'c'
+
 
 def load_data(source: str, symbol: str = 'NIFTY50', start_date: str = None, end_date: str = None) -> pd.DataFrame:
     """Load OHLC data from source"""
@@ -36,21 +42,87 @@ def load_data(source: str, symbol: str = 'NIFTY50', start_date: str = None, end_
             candles = 1000  # Default
 
         data = generator.generate_candles(count=candles, timeframe='5m')
-        return pd.DataFrame(data)
+        df = pd.DataFrame(data, copy=False)
+        # Parse the generator's fixed time format once instead of inferring it
+        df['time'] = pd.to_datetime(df['time'], format='%Y-%m-%d %H:%M')
+        return df
 
     elif source.endswith('.csv'):
         # Load from CSV file
-        df = pd.DataFrame(source)
+        df = pd.read_csv(source, engine=_CSV_ENGINE)
         # Ensure required columns
         required_cols = ['time', 'open', 'high', 'low', 'close', 'volume']
         if not all(col in df.columns for col in required_cols):
             raise ValueError(f"CSV must contain columns: {required_cols}")
+        df['time'] = pd.to_datetime(df['time'])
         return df
 
     else:
         raise ValueError(f"Unknown data source: {source}")
 
 
+# Per-run options a --batch file may set; the rest come from the command line
+_BATCH_OPTIONS = (
+    'strategy', 'fast_ema', 'slow_ema', 'rsi_period', 'oversold', 'overbought',
+    'lookback', 'threshold', 'stop_loss', 'target'
+)
+
+
+def run_strategy(backtester: StrategyBacktester, data: pd.DataFrame, options: argparse.Namespace):
+    """Run the backtest selected by options.strategy with its command-line parameters"""
+    if options.strategy == 'ema_crossover':
+        return backtester.backtest_ema_crossover(
+            data,
+            fast_period=options.fast_ema,
+            slow_period=options.slow_ema,
+            stop_loss_pct=options.stop_loss,
+            target_pct=options.target
+        )
+    elif options.strategy == 'rsi':
+        return backtester.backtest_rsi_strategy(
+            data,
+            rsi_period=options.rsi_period,
+            oversold_level=options.oversold,
+            overbought_level=options.overbought,
+            stop_loss_pct=options.stop_loss,
+            target_pct=options.target
+        )
+    elif options.strategy == 'breakout':
+        return backtester.backtest_breakout_strategy(
+            data,
+            lookback_period=options.lookback,
+            breakout_threshold=options.threshold,
+            stop_loss_pct=options.stop_loss,
+            target_pct=options.target
+        )
+    raise ValueError(f"Unknown strategy: {options.strategy}")
+
+
+def run_batch(backtester: StrategyBacktester, data: pd.DataFrame, args: argparse.Namespace, batch_file: str):
+    """
+    Run every spec in a JSON batch file, printing one JSON result line per run
+
+    The file holds a list of objects whose keys are option names from
+    _BATCH_OPTIONS (dashes or underscores); options a spec leaves out keep
+    their command-line values. Data and the backtester are set up once for
+    the whole batch.
+    """
+    with open(batch_file) as f:
+        specs = json.load(f)
+
+    backtester.precompute_indicators(data)
+
+    for i, spec in enumerate(specs):
+        overrides = {key.replace('-', '_'): value for key, value in spec.items()}
+        unknown = set(overrides) - set(_BATCH_OPTIONS)
+        if unknown:
+            raise ValueError(f"Run {i}: unsupported batch options {sorted(unknown)}")
+
+        options = argparse.Namespace(**{**vars(args), **overrides})
+        result = run_strategy(backtester, data, options)
+        print(json.dumps({'run': i, **spec, **result.to_dict()}), flush=True)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Backtest trading strategies')
 
@@ -65,9 +137,9 @@ def main():
                        help='End date (YYYY-MM-DD)')
 
     # Strategy options
-    parser.add_argument('--strategy', type=str, required=True,
+    parser.add_argument('--strategy', type=str,
                        choices=['ema_crossover', 'rsi', 'breakout'],
-                       help='Strategy to backtest')
+                       help='Strategy to backtest (required unless --batch sets it per run)')
 
     # EMA Crossover parameters
     parser.add_argument('--fast-ema', type=int, default=9,
@@ -108,13 +180,19 @@ def main():
                        help='Trade log CSV file path')
     parser.add_argument('--verbose', action='store_true',
                        help='Verbose output')
+    parser.add_argument('--batch', type=str,
+                       help='JSON file with a list of runs to backtest on the same data, '
+                            'printing one JSON line per run')
 
     args = parser.parse_args()
+    if not args.strategy and not args.batch:
+        parser.error('--strategy is required unless --batch is given')
 
-    # Load data
-    print(f"Loading data from {args.data}...")
+    # Load data (progress goes to stderr in batch mode, keeping stdout JSON only)
+    progress = sys.stderr if args.batch else sys.stdout
+    print(f"Loading data from {args.data}...", file=progress)
     data = load_data(args.data, args.symbol, args.start_date, args.end_date)
-    print(f"Loaded {len(data)} candles")
+    print(f"Loaded {len(data)} candles", file=progress)
 
     # Initialize backtester
     backtester = StrategyBacktester(
@@ -123,36 +201,16 @@ def main():
         risk_per_trade=args.risk_per_trade / 100
     )
 
+    if args.batch:
+        run_batch(backtester, data, args, args.batch)
+        return 0
+
     # Run backtest
     print(f"\nRunning {args.strategy} strategy backtest...")
     print(f"Initial capital: ₹{args.capital:,.2f}")
     print("-" * 70)
 
-    if args.strategy == 'ema_crossover':
-        result = backtester.backtest_ema_crossover(
-            data,
-            fast_period=args.fast_ema,
-            slow_period=args.slow_ema,
-            stop_loss_pct=args.stop_loss,
-            target_pct=args.target
-        )
-    elif args.strategy == 'rsi':
-        result = backtester.backtest_rsi_strategy(
-            data,
-            rsi_period=args.rsi_period,
-            oversold_level=args.oversold,
-            overbought_level=args.overbought,
-            stop_loss_pct=args.stop_loss,
-            target_pct=args.target
-        )
-    elif args.strategy == 'breakout':
-        result = backtester.backtest_breakout_strategy(
-            data,
-            lookback_period=args.lookback,
-            breakout_threshold=args.threshold,
-            stop_loss_pct=args.stop_loss,
-            target_pct=args.target
-        )
+    result = run_strategy(backtester, data, args)
 
     # Print results
     print("\n" + backtester.generate_report(result))
@@ -170,11 +228,10 @@ def main():
 
     # Save trade log to CSV
     if args.trade_log:
-        trade_df = PerformanceAnalyzer.generate_trade_log(result)
         trade_path = Path(args.trade_log)
         trade_path.parent.mkdir(parents=True, exist_ok=True)
 
-        trade_df.to_csv(trade_path, index=False)
+        PerformanceAnalyzer.stream_trade_log(result, trade_path)
         print(f"Trade log saved to: {trade_path}")
 
     # Print detailed analysis if verbose
@@ -3,12 +3,15 @@ Performance Metrics Analyzer
 Advanced performance analysis and visualization
 """
 
+import copy
+
 import pandas as pd
 import numpy as np
 from typing import Dict, List
 from datetime import datetime
+from pathlib import Path
 
-from .backtest_engine import BacktestResult, Trade
+from .backtest_engine import BacktestResult, Trade, EXIT_REASONS
 
 
 class PerformanceAnalyzer:
@@ -20,6 +23,9 @@ class PerformanceAnalyzer:
     - Trade distribution analysis
     - Time-based metrics
     - Risk-adjusted returns
+
+    Analyzers read the columns of result.ledger. Every ledger row is a closed
+    trade with an exit time, so no per-trade filtering is needed.
     """
 
     @staticmethod
@@ -33,21 +39,17 @@ class PerformanceAnalyzer:
         Returns:
             DataFrame with monthly breakdown
         """
-        if not result.trades:
+        ledger = result.ledger
+        if len(ledger) == 0:
             return pd.DataFrame()
 
-        trades_data = []
-        for trade in result.trades:
-            if trade.exit_time:
-                trades_data.append({
-                    'date': trade.exit_time,
-                    'pnl': trade.pnl,
-                    'pnl_percent': trade.pnl_percent
-                })
-
-        df = pd.DataFrame(trades_data)
-        df['date'] = pd.to_datetime(df['date'])
-        df['month'] = df['date'].dt.to_period('M')
+        # Columns come straight from the ledger's typed arrays
+        df = pd.DataFrame({
+            # Months follow the input's local calendar, not UTC
+            'month': result.datetimes(ledger['exit_time']).tz_localize(None).to_period('M'),
+            'pnl': ledger['pnl'],
+            'pnl_percent': ledger['pnl_percent']
+        })
 
         monthly = df.groupby('month').agg({
             'pnl': ['sum', 'mean', 'count'],
@@ -71,23 +73,26 @@ class PerformanceAnalyzer:
         Returns:
             Dictionary with distribution statistics
         """
-        if not result.trades:
+        ledger = result.ledger
+        if len(ledger) == 0:
             return {}
 
-        pnl_values = [t.pnl for t in result.trades]
-        pnl_percent_values = [t.pnl_percent for t in result.trades]
+        # Read the ledger columns directly instead of materializing Trade objects
+        pnl = ledger['pnl']
+        pnl_percent = ledger['pnl_percent']
+        pnl_25th, pnl_75th = np.percentile(pnl, [25, 75])
 
         return {
-            'pnl_mean': np.mean(pnl_values),
-            'pnl_median': np.median(pnl_values),
-            'pnl_std': np.std(pnl_values),
-            'pnl_min': min(pnl_values),
-            'pnl_max': max(pnl_values),
-            'pnl_25th_percentile': np.percentile(pnl_values, 25),
-            'pnl_75th_percentile': np.percentile(pnl_values, 75),
-            'return_mean_pct': np.mean(pnl_percent_values),
-            'return_median_pct': np.median(pnl_percent_values),
-            'return_std_pct': np.std(pnl_percent_values)
+            'pnl_mean': pnl.mean(),
+            'pnl_median': np.median(pnl),
+            'pnl_std': pnl.std(),
+            'pnl_min': pnl.min(),
+            'pnl_max': pnl.max(),
+            'pnl_25th_percentile': pnl_25th,
+            'pnl_75th_percentile': pnl_75th,
+            'return_mean_pct': pnl_percent.mean(),
+            'return_median_pct': np.median(pnl_percent),
+            'return_std_pct': pnl_percent.std()
         }
 
     @staticmethod
@@ -101,24 +106,20 @@ class PerformanceAnalyzer:
         Returns:
             Dictionary with exit reason breakdown
         """
-        if not result.trades:
+        ledger = result.ledger
+        if len(ledger) == 0:
             return {}
 
-        exit_counts = {}
-        exit_pnl = {}
-
-        for trade in result.trades:
-            reason = trade.exit_reason
-            exit_counts[reason] = exit_counts.get(reason, 0) + 1
-            exit_pnl[reason] = exit_pnl.get(reason, 0) + trade.pnl
+        # Exit reasons are stored as small integer codes indexing EXIT_REASONS
+        reason_ids = ledger['exit_reason']
+        counts = np.bincount(reason_ids, minlength=len(EXIT_REASONS))
+        totals = np.bincount(reason_ids, weights=ledger['pnl'], minlength=len(EXIT_REASONS))
+        present = np.flatnonzero(counts).tolist()
 
         return {
-            'counts': exit_counts,
-            'total_pnl': exit_pnl,
-            'avg_pnl': {
-                reason: exit_pnl[reason] / exit_counts[reason]
-                for reason in exit_counts
-            }
+            'counts': {EXIT_REASONS[i]: int(counts[i]) for i in present},
+            'total_pnl': {EXIT_REASONS[i]: float(totals[i]) for i in present},
+            'avg_pnl': {EXIT_REASONS[i]: float(totals[i] / counts[i]) for i in present}
         }
 
     @staticmethod
@@ -132,26 +133,18 @@ class PerformanceAnalyzer:
         Returns:
             Dictionary with holding period statistics
         """
-        if not result.trades:
+        ledger = result.ledger
+        if len(ledger) == 0:
             return {}
 
-        holding_periods = []
-        for trade in result.trades:
-            if trade.exit_time and trade.entry_time:
-                # Convert to datetime if needed
-                exit_time = pd.to_datetime(trade.exit_time)
-                entry_time = pd.to_datetime(trade.entry_time)
-                duration = (exit_time - entry_time).total_seconds() / 3600  # hours
-                holding_periods.append(duration)
-
-        if not holding_periods:
-            return {}
+        # Ledger times are epoch nanoseconds, so durations need no datetime conversion
+        holding_periods = (ledger['exit_time'] - ledger['entry_time']) / 1e9 / 3600  # hours
 
         return {
             'avg_hours': np.mean(holding_periods),
             'median_hours': np.median(holding_periods),
-            'min_hours': min(holding_periods),
-            'max_hours': max(holding_periods),
+            'min_hours': holding_periods.min(),
+            'max_hours': holding_periods.max(),
             'std_hours': np.std(holding_periods)
         }
 
@@ -166,23 +159,19 @@ class PerformanceAnalyzer:
         Returns:
             Dictionary with consecutive streak statistics
         """
-        if not result.trades:
+        ledger = result.ledger
+        if len(ledger) == 0:
             return {}
 
-        current_win_streak = 0
-        current_loss_streak = 0
-        max_win_streak = 0
-        max_loss_streak = 0
-
-        for trade in result.trades:
-            if trade.pnl > 0:
-                current_win_streak += 1
-                current_loss_streak = 0
-                max_win_streak = max(max_win_streak, current_win_streak)
-            else:
-                current_loss_streak += 1
-                current_win_streak = 0
-                max_loss_streak = max(max_loss_streak, current_loss_streak)
+        # Run-length encode the win/loss sequence: a run starts wherever the
+        # outcome differs from the previous trade
+        wins = ledger['pnl'] > 0
+        starts = np.flatnonzero(np.r_[True, wins[1:] != wins[:-1]])
+        lengths = np.diff(np.r_[starts, len(wins)])
+        winning_runs = wins[starts]
+
+        max_win_streak = int(lengths[winning_runs].max(initial=0))
+        max_loss_streak = int(lengths[~winning_runs].max(initial=0))
 
         return {
             'max_consecutive_wins': max_win_streak,
@@ -230,15 +219,22 @@ class PerformanceAnalyzer:
         """
         Generate comprehensive performance analysis
 
+        All analyzers read the same ledger columns, and the report is cached
+        on the result, so later calls skip recomputing it. Each call returns
+        its own deep copy, so callers can modify it freely.
+
         Args:
             result: BacktestResult object
 
         Returns:
             Dictionary with all performance metrics
         """
+        if result._report is not None:
+            return copy.deepcopy(result._report)
+
         analyzer = PerformanceAnalyzer()
 
-        return {
+        result._report = {
             'basic_metrics': result.to_dict(),
             'monthly_performance': analyzer.analyze_monthly_performance(result).to_dict('records'),
             'trade_distribution': analyzer.analyze_trade_distribution(result),
@@ -248,39 +244,40 @@ class PerformanceAnalyzer:
             'recovery_factor': analyzer.calculate_recovery_factor(result),
             'expectancy': analyzer.calculate_expectancy(result)
         }
+        return copy.deepcopy(result._report)
 
     @staticmethod
     def generate_trade_log(result: BacktestResult) -> pd.DataFrame:
         """
         Generate detailed trade log
 
+        The log is built once per result; each call returns a fresh copy.
+
         Args:
             result: BacktestResult object
 
         Returns:
             DataFrame with all trades
         """
-        if not result.trades:
-            return pd.DataFrame()
+        return result.trade_log
+
+    @staticmethod
+    def stream_trade_log(result: BacktestResult, file_path: Path, chunk_size: int = 100000):
+        """
+        Write the trade log to CSV chunk by chunk
+
+        Produces the same file as generate_trade_log(result).to_csv(file_path,
+        index=False) while only holding chunk_size rows in memory at a time.
+
+        Args:
+            result: BacktestResult object
+            file_path: Destination CSV file
+            chunk_size: Trades formatted per chunk
+        """
+        if len(result.ledger) == 0:
+            pd.DataFrame().to_csv(file_path, index=False)
+            return
 
-        trades_data = []
-        for idx, trade in enumerate(result.trades, 1):
-            trades_data.append({
-                'trade_num': idx,
-                'entry_time': trade.entry_time,
-                'exit_time': trade.exit_time,
-                'symbol': trade.symbol,
-                'side': trade.side,
-                'quantity': trade.quantity,
-                'entry_price': round(trade.entry_price, 2),
-                'exit_price': round(trade.exit_price, 2) if trade.exit_price else None,
-                'stop_loss': round(trade.stop_loss, 2) if trade.stop_loss else None,
-                'target': round(trade.target, 2) if trade.target else None,
-                'pnl': round(trade.pnl, 2),
-                'pnl_percent': round(trade.pnl_percent, 2),
-                'commission': round(trade.commission, 2),
-                'exit_reason': trade.exit_reason,
-                'status': trade.status
-            })
-
-        return pd.DataFrame(trades_data)
+        with open(file_path, 'w', newline='') as f:
+            for i, chunk in enumerate(result.iter_trade_log(chunk_size)):
+                chunk.to_csv(f, header=(i == 0), index=False)
@@ -3,13 +3,270 @@ Strategy Backtester
 Provides convenient interface to backtest trading strategies
 """
 
+import os
 import pandas as pd
 import numpy as np
-from typing import Dict, Optional, Callable
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Callable, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 
 from .backtest_engine import BacktestEngine, BacktestResult
 from src.utils.logger import setup_logger
+from src.utils.jit import njit
+
+
+@njit(cache=True)
+def _rolling_max_min(high: np.ndarray, low: np.ndarray, window: int):
+    """
+    Rolling max of high and min of low over the last window bars, inclusive
+
+    Keeps monotonic deques of candidate indices so the whole pass is O(n).
+    The first window - 1 values are NaN.
+
+    Returns:
+        Tuple of (rolling_high, rolling_low) arrays
+    """
+    n = len(high)
+    rolling_high = np.full(n, np.nan)
+    rolling_low = np.full(n, np.nan)
+    max_q = np.empty(n, dtype=np.int64)
+    min_q = np.empty(n, dtype=np.int64)
+    max_head = max_tail = 0
+    min_head = min_tail = 0
+
+    for i in range(n):
+        while max_tail > max_head and high[max_q[max_tail - 1]] <= high[i]:
+            max_tail -= 1
+        max_q[max_tail] = i
+        max_tail += 1
+        if max_q[max_head] <= i - window:
+            max_head += 1
+
+        while min_tail > min_head and low[min_q[min_tail - 1]] >= low[i]:
+            min_tail -= 1
+        min_q[min_tail] = i
+        min_tail += 1
+        if min_q[min_head] <= i - window:
+            min_head += 1
+
+        if i >= window - 1:
+            rolling_high[i] = high[max_q[max_head]]
+            rolling_low[i] = low[min_q[min_head]]
+
+    return rolling_high, rolling_low
+
+
+@njit(cache=True)
+def _wilder_rsi(close: np.ndarray, period: int) -> np.ndarray:
+    """
+    RSI with Wilder smoothing in a single pass
+
+    The average gain and loss are seeded with the simple mean of the first
+    period changes, then updated as avg = (avg * (period - 1) + x) / period.
+    The first period values are NaN.
+    """
+    n = len(close)
+    rsi = np.full(n, np.nan)
+    if n <= period:
+        return rsi
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n):
+        change = close[i] - close[i - 1]
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+
+        if i <= period:
+            avg_gain += gain / period
+            avg_loss += loss / period
+            if i < period:
+                continue
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+
+        if avg_loss == 0:
+            rsi[i] = 100.0
+        else:
+            rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    return rsi
+
+
+def _shift(values: np.ndarray) -> np.ndarray:
+    """Previous bar's value at every bar, NaN for the first"""
+    shifted = np.empty_like(values)
+    shifted[0] = np.nan
+    shifted[1:] = values[:-1]
+    return shifted
+
+
+@njit(cache=True)
+def _ema(close: np.ndarray, span: int) -> np.ndarray:
+    """EMA as pandas ewm(span, adjust=False).mean(), seeded with the first close"""
+    n = len(close)
+    ema = np.empty(n)
+    if n == 0:
+        return ema
+
+    alpha = 2.0 / (span + 1)
+    ema[0] = close[0]
+    for i in range(1, n):
+        ema[i] = (1.0 - alpha) * ema[i - 1] + alpha * close[i]
+
+    return ema
+
+
+def _compute_indicator(data: pd.DataFrame, key: Tuple[str, int]) -> np.ndarray:
+    """
+    Indicator values for every bar of data
+
+    Keys are ('ema', span), ('rsi', period) or ('rolling_max_min', window);
+    the last returns a (2, n) array of rolling high and rolling low.
+
+    Values stay float64: the rolling low is used as the breakout stop-loss
+    price, and float32 (~7 significant digits) moves it, and with it fills
+    and position sizes, on typical share prices.
+    """
+    name, period = key
+    close = data['close'].to_numpy()
+    if name == 'ema':
+        return _ema(close, period)
+    if name == 'rsi':
+        return _wilder_rsi(close, period)
+    if name == 'rolling_max_min':
+        return np.vstack(_rolling_max_min(data['high'].to_numpy(), data['low'].to_numpy(), period))
+    raise ValueError(f"Unknown indicator: {name}")
+
+
+def _signals(close: np.ndarray, buy: np.ndarray, close_position: np.ndarray,
+             stop_loss: np.ndarray, target_pct: float) -> Dict:
+    """Assemble a vectorized signal dict for single-symbol BUY/CLOSE strategies"""
+    action = np.full(len(close), None, dtype=object)
+    action[close_position] = 'CLOSE'
+    action[buy] = 'BUY'
+
+    return {
+        'action': action,
+        'symbol': 'SIGNAL',
+        'stop_loss': stop_loss,
+        'target': close * (1 + target_pct / 100)
+    }
+
+
+def _ema_crossover_signals(data: pd.DataFrame, params: Dict) -> Dict:
+    """EMA Crossover signals for every bar"""
+    slow_period = params['slow_period']
+    stop_loss_pct = params['stop_loss_pct']
+
+    close = data['close'].to_numpy()
+    ema_fast = params['indicators']['ema_fast']
+    ema_slow = params['indicators']['ema_slow']
+    prev_fast = _shift(ema_fast)
+    prev_slow = _shift(ema_slow)
+    ready = np.arange(len(close)) >= slow_period
+
+    # Bullish crossover (fast crosses above slow)
+    buy = ready & (prev_fast <= prev_slow) & (ema_fast > ema_slow)
+
+    # Bearish crossover (fast crosses below slow) - close position
+    close_position = ready & (prev_fast >= prev_slow) & (ema_fast < ema_slow)
+
+    return _signals(close, buy, close_position, close * (1 - stop_loss_pct / 100), params['target_pct'])
+
+
+def _rsi_signals(data: pd.DataFrame, params: Dict) -> Dict:
+    """RSI signals for every bar"""
+    oversold_level = params['oversold_level']
+    overbought_level = params['overbought_level']
+    stop_loss_pct = params['stop_loss_pct']
+
+    close = data['close'].to_numpy()
+    rsi = params['indicators']['rsi']
+    prev_rsi = _shift(rsi)
+
+    # NaN RSI (warm-up) fails every comparison, so no signal is raised
+    # Buy signal: RSI crosses above oversold level
+    buy = (prev_rsi <= oversold_level) & (rsi > oversold_level)
+
+    # Sell signal: RSI crosses below overbought level
+    close_position = (prev_rsi >= overbought_level) & (rsi < overbought_level) & ~buy
+
+    return _signals(close, buy, close_position, close * (1 - stop_loss_pct / 100), params['target_pct'])
+
+
+def _breakout_signals(data: pd.DataFrame, params: Dict) -> Dict:
+    """Breakout signals for every bar"""
+    close = data['close'].to_numpy()
+    rolling_high, rolling_low = params['indicators']['rolling_max_min']
+
+    # Lookback high/low (excluding current candle) is the window ending at the
+    # previous bar; it is NaN until lookback_period candles precede the bar
+    lookback_high = _shift(rolling_high)
+    lookback_low = _shift(rolling_low)
+    breakout_level = lookback_high * (1 + params['breakout_threshold'] / 100)
+
+    # Buy signal: Price breaks above lookback high, with lookback low as stop
+    buy = close > breakout_level
+
+    return _signals(close, buy, np.zeros(len(close), dtype=bool), lookback_low, params['target_pct'])
+
+
+# The signal functions read their indicator arrays from params['indicators'],
+# which StrategyBacktester fills (possibly from its walk-forward cache)
+_ema_crossover_signals.vectorized = True
+_rsi_signals.vectorized = True
+_breakout_signals.vectorized = True
+
+
+# Built-in strategies by CLI name, as accepted by StrategyBacktester.run_grid
+_BUILTIN_STRATEGIES = {
+    'ema_crossover': 'backtest_ema_crossover',
+    'rsi': 'backtest_rsi_strategy',
+    'breakout': 'backtest_breakout_strategy'
+}
+
+# Workers must not be forked from a process that may be running Numba's
+# parallel thread pool (run_backtest_batch), so fork from a clean server
+_GRID_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# Per-process state of run_grid workers, set up once by _init_grid_worker
+_grid_backtester: Optional['StrategyBacktester'] = None
+_grid_data: Optional[pd.DataFrame] = None
+
+
+def _init_grid_worker(shm_name: str, dtype: np.dtype, length: int, settings: Dict, tz=None):
+    """
+    Copy the shared candles into this worker and build its backtester
+
+    Times are shared as naive UTC datetime64 values; tz is the timezone of
+    the caller's candle times (None if they were naive) and is restored here.
+    """
+    global _grid_backtester, _grid_data
+
+    shm = SharedMemory(name=shm_name)
+    try:
+        records = np.ndarray(length, dtype=dtype, buffer=shm.buf)
+        _grid_data = pd.DataFrame({name: records[name].copy() for name in dtype.names})
+        del records  # Release the buffer so the block can be closed
+    finally:
+        shm.close()
+
+    if tz is not None:
+        _grid_data['time'] = _grid_data['time'].dt.tz_localize('UTC').dt.tz_convert(tz)
+
+    _grid_backtester = StrategyBacktester(**settings)
+    _grid_backtester.precompute_indicators(_grid_data)
+
+
+def _run_grid_task(strategy: Union[str, Callable], params: Dict) -> BacktestResult:
+    """Run one parameter set in a run_grid worker"""
+    if isinstance(strategy, str):
+        return getattr(_grid_backtester, _BUILTIN_STRATEGIES[strategy])(_grid_data, **params)
+    return _grid_backtester.backtest_custom_strategy(_grid_data, strategy, params)
 
 
 class StrategyBacktester:
@@ -44,6 +301,65 @@ class StrategyBacktester:
         )
         self.logger = setup_logger('strategy_backtester')
 
+        # Walk-forward indicator cache, see precompute_indicators()
+        self._indicator_data: Optional[pd.DataFrame] = None
+        self._indicator_cache: Dict[Tuple[str, int], np.ndarray] = {}
+
+    def precompute_indicators(self, data: pd.DataFrame):
+        """
+        Compute indicators once over data and reuse them for windows of it
+
+        Later backtests whose data is a contiguous window of data (e.g.
+        data.iloc[start:stop] in a walk-forward loop) slice each indicator
+        from its full-series values, computed on first use, instead of
+        recomputing it per window. Indicators then carry their history from
+        before the window, so they are warmed up from the window's first bar.
+        Backtests on other data are unaffected. Calling this again replaces
+        the cached series.
+
+        Args:
+            data: OHLCV DataFrame covering all windows
+        """
+        self._indicator_data = self.engine.prepare_data(data)
+        self._indicator_cache = {}
+
+    def _window_bounds(self, data: pd.DataFrame) -> Optional[Tuple[int, int]]:
+        """Position of prepared data within the precomputed series, or None"""
+        source = self._indicator_data
+        if source is None or len(data) == 0:
+            return None
+
+        source_time = source['time'].to_numpy()
+        start = int(source_time.searchsorted(data['time'].to_numpy()[0]))
+        stop = start + len(data)
+        if stop > len(source):
+            return None
+
+        if not (np.array_equal(source_time[start:stop], data['time'].to_numpy())
+                and np.array_equal(source['close'].to_numpy()[start:stop], data['close'].to_numpy())):
+            return None
+
+        return start, stop
+
+    def _indicators(self, data: pd.DataFrame, keys: Dict[str, Tuple[str, int]]) -> Dict[str, np.ndarray]:
+        """
+        Indicator arrays for prepared data, by name
+
+        Sliced from the walk-forward cache when data is a window of the
+        precomputed series, computed on data otherwise.
+        """
+        bounds = self._window_bounds(data)
+        if bounds is None:
+            return {name: _compute_indicator(data, key) for name, key in keys.items()}
+
+        start, stop = bounds
+        indicators = {}
+        for name, key in keys.items():
+            if key not in self._indicator_cache:
+                self._indicator_cache[key] = _compute_indicator(self._indicator_data, key)
+            indicators[name] = self._indicator_cache[key][..., start:stop]
+        return indicators
+
     def backtest_ema_crossover(
         self,
         data: pd.DataFrame,
@@ -67,53 +383,19 @@ class StrategyBacktester:
         """
         self.logger.info(f"Backtesting EMA Crossover (Fast: {fast_period}, Slow: {slow_period})")
 
-        def strategy_func(historical_data: pd.DataFrame, params: Dict) -> Optional[Dict]:
-            """EMA Crossover signal generation"""
-            if len(historical_data) < slow_period + 1:
-                return None
-
-            # Calculate EMAs
-            df = historical_data.copy()
-            df['ema_fast'] = df['close'].ewm(span=fast_period, adjust=False).mean()
-            df['ema_slow'] = df['close'].ewm(span=slow_period, adjust=False).mean()
-
-            # Get current and previous values
-            current = df.iloc[-1]
-            previous = df.iloc[-2]
-
-            current_price = current['close']
-
-            # Bullish crossover (fast crosses above slow)
-            if (previous['ema_fast'] <= previous['ema_slow'] and
-                current['ema_fast'] > current['ema_slow']):
-
-                return {
-                    'action': 'BUY',
-                    'symbol': 'SIGNAL',
-                    'price': current_price,
-                    'stop_loss': current_price * (1 - stop_loss_pct / 100),
-                    'target': current_price * (1 + target_pct / 100)
-                }
-
-            # Bearish crossover (fast crosses below slow) - close position
-            elif (previous['ema_fast'] >= previous['ema_slow'] and
-                  current['ema_fast'] < current['ema_slow']):
-
-                return {
-                    'action': 'CLOSE',
-                    'symbol': 'SIGNAL'
-                }
-
-            return None
-
+        data = self.engine.prepare_data(data)
         params = {
             'fast_period': fast_period,
             'slow_period': slow_period,
             'stop_loss_pct': stop_loss_pct,
-            'target_pct': target_pct
+            'target_pct': target_pct,
+            'indicators': self._indicators(data, {
+                'ema_fast': ('ema', fast_period),
+                'ema_slow': ('ema', slow_period)
+            })
         }
 
-        return self.engine.run_backtest(data, strategy_func, params)
+        return self.engine.run_backtest(data, _ema_crossover_signals, params)
 
     def backtest_rsi_strategy(
         self,
@@ -141,64 +423,17 @@ class StrategyBacktester:
         self.logger.info(f"Backtesting RSI Strategy (Period: {rsi_period}, "
                         f"Oversold: {oversold_level}, Overbought: {overbought_level})")
 
-        def calculate_rsi(prices: pd.Series, period: int) -> pd.Series:
-            """Calculate RSI"""
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi
-
-        def strategy_func(historical_data: pd.DataFrame, params: Dict) -> Optional[Dict]:
-            """RSI signal generation"""
-            if len(historical_data) < rsi_period + 1:
-                return None
-
-            # Calculate RSI
-            df = historical_data.copy()
-            df['rsi'] = calculate_rsi(df['close'], rsi_period)
-
-            # Get current and previous values
-            current = df.iloc[-1]
-            previous = df.iloc[-2]
-
-            current_price = current['close']
-            current_rsi = current['rsi']
-            previous_rsi = previous['rsi']
-
-            if pd.isna(current_rsi) or pd.isna(previous_rsi):
-                return None
-
-            # Buy signal: RSI crosses above oversold level
-            if previous_rsi <= oversold_level and current_rsi > oversold_level:
-                return {
-                    'action': 'BUY',
-                    'symbol': 'SIGNAL',
-                    'price': current_price,
-                    'stop_loss': current_price * (1 - stop_loss_pct / 100),
-                    'target': current_price * (1 + target_pct / 100)
-                }
-
-            # Sell signal: RSI crosses below overbought level
-            elif previous_rsi >= overbought_level and current_rsi < overbought_level:
-                return {
-                    'action': 'CLOSE',
-                    'symbol': 'SIGNAL'
-                }
-
-            return None
-
+        data = self.engine.prepare_data(data)
         params = {
             'rsi_period': rsi_period,
             'oversold_level': oversold_level,
             'overbought_level': overbought_level,
             'stop_loss_pct': stop_loss_pct,
-            'target_pct': target_pct
+            'target_pct': target_pct,
+            'indicators': self._indicators(data, {'rsi': ('rsi', rsi_period)})
         }
 
-        return self.engine.run_backtest(data, strategy_func, params)
+        return self.engine.run_backtest(data, _rsi_signals, params)
 
     def backtest_breakout_strategy(
         self,
@@ -223,45 +458,16 @@ class StrategyBacktester:
         """
         self.logger.info(f"Backtesting Breakout Strategy (Lookback: {lookback_period})")
 
-        def strategy_func(historical_data: pd.DataFrame, params: Dict) -> Optional[Dict]:
-            """Breakout signal generation"""
-            if len(historical_data) < lookback_period + 1:
-                return None
-
-            df = historical_data.copy()
-
-            # Get current candle
-            current = df.iloc[-1]
-            current_price = current['close']
-
-            # Calculate lookback high/low (excluding current candle)
-            lookback_data = df.iloc[-(lookback_period+1):-1]
-            lookback_high = lookback_data['high'].max()
-            lookback_low = lookback_data['low'].min()
-
-            # Calculate breakout level
-            breakout_level = lookback_high * (1 + breakout_threshold / 100)
-
-            # Buy signal: Price breaks above lookback high
-            if current_price > breakout_level:
-                return {
-                    'action': 'BUY',
-                    'symbol': 'SIGNAL',
-                    'price': current_price,
-                    'stop_loss': lookback_low,  # Use lookback low as stop
-                    'target': current_price * (1 + target_pct / 100)
-                }
-
-            return None
-
+        data = self.engine.prepare_data(data)
         params = {
             'lookback_period': lookback_period,
             'breakout_threshold': breakout_threshold,
             'stop_loss_pct': stop_loss_pct,
-            'target_pct': target_pct
+            'target_pct': target_pct,
+            'indicators': self._indicators(data, {'rolling_max_min': ('rolling_max_min', lookback_period)})
         }
 
-        return self.engine.run_backtest(data, strategy_func, params)
+        return self.engine.run_backtest(data, _breakout_signals, params)
 
     def backtest_custom_strategy(
         self,
@@ -284,6 +490,80 @@ class StrategyBacktester:
 
         return self.engine.run_backtest(data, strategy_func, strategy_params)
 
+    def run_grid(
+        self,
+        data: pd.DataFrame,
+        strategy: Union[str, Callable],
+        param_grid: List[Dict],
+        n_workers: Optional[int] = None
+    ) -> List[BacktestResult]:
+        """
+        Run one backtest per parameter set across worker processes
+
+        The candles are placed in shared memory once and copied by each worker
+        on start-up instead of being pickled with every task. Unlike
+        BacktestEngine.run_backtest_batch, which only parallelizes the
+        simulation, each worker runs the whole backtest, so this also suits
+        per-bar strategies and full results are returned for every set.
+        Process start-up costs a second or so, which only pays off when each
+        backtest is slow (per-bar strategies, long data).
+
+        Args:
+            data: OHLCV DataFrame; all columns must be numeric except time
+            strategy: Built-in strategy name ('ema_crossover', 'rsi',
+                'breakout') taking param_grid entries as keyword arguments,
+                or a module-level strategy function taking them as params
+            param_grid: Strategy parameters, one dict per backtest
+            n_workers: Worker processes (default: CPU count)
+
+        Returns:
+            BacktestResult per parameter set, in param_grid order
+        """
+        if isinstance(strategy, str) and strategy not in _BUILTIN_STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}")
+        if not param_grid:
+            return []
+
+        data = self.engine.prepare_data(data)
+        times = pd.to_datetime(data['time'])
+        tz = getattr(times.dtype, 'tz', None)  # Re-applied by the workers
+        columns = {
+            column: times.to_numpy(dtype='datetime64[ns]') if column == 'time'
+            else data[column].to_numpy()
+            for column in data.columns
+        }
+        non_numeric = [column for column, values in columns.items() if values.dtype == object]
+        if non_numeric:
+            raise ValueError(f"run_grid needs numeric columns, got: {non_numeric}")
+
+        dtype = np.dtype([(column, values.dtype) for column, values in columns.items()])
+        n_workers = min(n_workers or os.cpu_count() or 1, len(param_grid))
+        settings = {
+            'initial_capital': self.engine.initial_capital,
+            'commission_per_trade': self.engine.commission_per_trade,
+            'risk_per_trade': self.engine.risk_per_trade
+        }
+
+        self.logger.info(f"Running {len(param_grid)} backtests on {n_workers} workers")
+
+        shm = SharedMemory(create=True, size=max(dtype.itemsize * len(data), 1))
+        try:
+            records = np.ndarray(len(data), dtype=dtype, buffer=shm.buf)
+            for column, values in columns.items():
+                records[column] = values
+            del records
+
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context(_GRID_START_METHOD),
+                initializer=_init_grid_worker,
+                initargs=(shm.name, dtype, len(data), settings, tz)
+            ) as executor:
+                return list(executor.map(_run_grid_task, [strategy] * len(param_grid), param_grid))
+        finally:
+            shm.close()
+            shm.unlink()
+
     def generate_report(self, result: BacktestResult) -> str:
         """
         Generate human-readable backtest report
@@ -4,11 +4,22 @@ Supports multiple brokers: Zerodha, Kotak Securities, Angel One, Upstox, ICICI D
 """
 
 from .base_broker import BaseBroker
-from .zerodha_broker import ZerodhaBroker
-from .kotak_broker import KotakBroker
-from .angel_broker import AngelBroker
 from .broker_factory import BrokerFactory, create_broker
 
+# Broker classes are imported on first access so that importing this
+# package does not load every broker SDK
+_LAZY_BROKERS = {
+    'ZerodhaBroker': 'zerodha',
+    'KotakBroker': 'kotak',
+    'AngelBroker': 'angel',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_BROKERS:
+        return BrokerFactory.get_broker_class(_LAZY_BROKERS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 __all__ = [
     'BaseBroker',
     'ZerodhaBroker',
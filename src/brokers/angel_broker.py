@@ -4,15 +4,119 @@ Complete implementation of BaseBroker for Angel One (formerly Angel Broking)
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+import struct
+from typing import Dict, List, Any, Tuple
 from datetime import datetime
 
-from .base_broker import BaseBroker
-
-
+import pandas as pd
+
+from .base_broker import BaseBroker, OrderRequest, unimplemented_methods
+from .historical_cache import cached_historical
+
+logger = logging.getLogger('angel')
+
+
+# SmartStream binary tick layout (little-endian). Every packet starts with
+# the LTP block, whose first byte is the mode; Quote and SnapQuote packets
+# append further blocks at fixed offsets. Each block is decoded with one
+# precompiled Struct straight from a memoryview of the frame, without
+# slicing it into intermediate bytes.
+_LTP = struct.Struct('<BB25sqqq')      # mode, exchange, token, sequence, exchange time, LTP
+_QUOTE = struct.Struct('<qqqddqqqq')   # LTQ, ATP, volume, buy/sell qty, OHLC
+_SNAP_QUOTE = struct.Struct('<qqd')    # last trade time, OI, OI change %
+_DEPTH_LEVEL = struct.Struct('<HqqH')  # side flag (0 = buy), quantity, price, orders
+_CIRCUIT = struct.Struct('<qqqq')      # upper/lower circuit, 52-week high/low
+
+_QUOTE_OFFSET = _LTP.size
+_SNAP_QUOTE_OFFSET = _QUOTE_OFFSET + _QUOTE.size
+_DEPTH_OFFSET = _SNAP_QUOTE_OFFSET + _SNAP_QUOTE.size
+_CIRCUIT_OFFSET = _DEPTH_OFFSET + 10 * _DEPTH_LEVEL.size
+
+# Subscription modes sent in the first byte of every packet
+_MODE_LTP, _MODE_QUOTE, _MODE_SNAP_QUOTE = 1, 2, 3
+
+# Minimum packet size per mode
+_PACKET_SIZES = {
+    _MODE_LTP: _QUOTE_OFFSET,
+    _MODE_QUOTE: _SNAP_QUOTE_OFFSET,
+    _MODE_SNAP_QUOTE: _CIRCUIT_OFFSET + _CIRCUIT.size,
+}
+
+_LTP_FIELDS = (
+    'mode', 'exchange_type', 'instrument_token', 'sequence_number',
+    'exchange_timestamp', 'last_price'
+)
+_QUOTE_FIELDS = (
+    'last_traded_quantity', 'average_price', 'volume', 'total_buy_quantity',
+    'total_sell_quantity', 'open', 'high', 'low', 'close'
+)
+_SNAP_QUOTE_FIELDS = ('last_trade_time', 'oi', 'oi_change_percent')
+_CIRCUIT_FIELDS = ('upper_circuit', 'lower_circuit', 'week_52_high', 'week_52_low')
+
+# Price fields sent in paise (or 1e-7 rupee for currency derivatives)
+_QUOTE_PRICES = ('average_price', 'open', 'high', 'low', 'close')
+_CURRENCY_EXCHANGE = 13  # cde_fo
+
+
+def _decode_tick(payload: bytes) -> Dict[str, Any]:
+    """
+    Decode one SmartStream binary tick
+
+    Args:
+        payload: Binary frame (LTP, Quote or SnapQuote packet)
+
+    Returns:
+        Tick dictionary; prices in rupees, instrument_token as sent (str)
+
+    Raises:
+        ValueError: If the mode byte is unknown or the packet is shorter
+            than that mode's layout
+    """
+    view = memoryview(payload)
+    mode = view[0] if len(view) else None
+    size = _PACKET_SIZES.get(mode)
+    if size is None:
+        raise ValueError(f"Unknown SmartStream tick mode: {mode}")
+    if len(view) < size:
+        raise ValueError(f"Truncated SmartStream tick: mode {mode} needs {size} bytes, got {len(view)}")
+
+    values = _LTP.unpack_from(view, 0)
+    tick = dict(zip(_LTP_FIELDS, values))
+
+    tick['instrument_token'] = tick['instrument_token'].split(b'\0', 1)[0].decode()
+    divisor = 10000000.0 if tick['exchange_type'] == _CURRENCY_EXCHANGE else 100.0
+    tick['last_price'] /= divisor
+
+    if mode >= _MODE_QUOTE:
+        tick.update(zip(_QUOTE_FIELDS, _QUOTE.unpack_from(view, _QUOTE_OFFSET)))
+        for field in _QUOTE_PRICES:
+            tick[field] /= divisor
+
+    if mode == _MODE_SNAP_QUOTE:
+        tick.update(zip(_SNAP_QUOTE_FIELDS, _SNAP_QUOTE.unpack_from(view, _SNAP_QUOTE_OFFSET)))
+
+        buy, sell = [], []
+        for flag, quantity, price, orders in _DEPTH_LEVEL.iter_unpack(view[_DEPTH_OFFSET:_CIRCUIT_OFFSET]):
+            level = {'quantity': quantity, 'price': price / divisor, 'orders': orders}
+            (buy if flag == 0 else sell).append(level)
+        tick['depth'] = {'buy': buy, 'sell': sell}
+
+        circuit = _CIRCUIT.unpack_from(view, _CIRCUIT_OFFSET)
+        tick.update(zip(_CIRCUIT_FIELDS, (value / divisor for value in circuit)))
+
+    return tick
+
+
+@unimplemented_methods(
+    'modify_order', 'get_positions', 'get_holdings', 'get_margins', 'get_profile',
+    'get_orders', 'get_order_history', 'get_trades', 'connect_websocket',
+    'unsubscribe_symbols'
+)
 class AngelBroker(BaseBroker):
     """Angel One SmartAPI implementation of BaseBroker"""
 
+    __slots__ = ('client_code', 'password', 'totp_token', 'smart_api')
+
     def __init__(self, api_key: str, api_secret: str, **kwargs):
         """
         Initialize Angel One broker
@@ -27,7 +131,6 @@ class AngelBroker(BaseBroker):
         self.client_code = kwargs.get('client_code') or api_secret
         self.password = kwargs.get('password')
         self.totp_token = kwargs.get('totp_token')
-        self.logger = logging.getLogger('angel')
 
         # TODO: Initialize Angel SmartAPI client
         # from SmartApi import SmartConnect
@@ -39,7 +142,7 @@ class AngelBroker(BaseBroker):
         """
         Angel One uses TOTP-based login, not OAuth URL
         """
-        self.logger.warning("Angel One uses TOTP-based login, not URL-based OAuth")
+        logger.warning("Angel One uses TOTP-based login, not URL-based OAuth")
         return "https://smartapi.angelbroking.com"
 
     def generate_session(self, request_token: str = None) -> Dict[str, Any]:
@@ -59,116 +162,59 @@ class AngelBroker(BaseBroker):
             # )
             # self.access_token = data['data']['jwtToken']
 
-            self.logger.warning("Angel One authentication not yet implemented")
+            logger.warning("Angel One authentication not yet implemented")
             raise NotImplementedError("Angel One authentication coming soon")
 
         except Exception as e:
-            self.logger.error(f"Failed to generate Angel session: {e}")
+            logger.error(f"Failed to generate Angel session: {e}")
             raise
 
     def verify_token(self) -> bool:
         """Verify if session is valid"""
         try:
             # TODO: Implement token verification
-            self.logger.warning("Angel One token verification not yet implemented")
+            logger.warning("Angel One token verification not yet implemented")
             return False
         except Exception as e:
-            self.logger.error(f"Token verification failed: {e}")
+            logger.error(f"Token verification failed: {e}")
             return False
 
     # ==================== Market Data Methods ====================
 
-    def get_quote(self, symbol: str, exchange: str = "NSE") -> Dict[str, Any]:
-        """Get real-time quote"""
+    def fetch_quotes(self, symbols: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """Fetch real-time quotes for several symbols"""
         raise NotImplementedError("Angel One integration coming soon")
 
-    def get_historical_data(
+    @cached_historical
+    def get_historical_df(
         self,
         symbol: str,
         from_date: datetime,
         to_date: datetime,
         interval: str = "FIVE_MINUTE",
         exchange: str = "NSE"
-    ) -> List[Dict[str, Any]]:
-        """Get historical data"""
+    ) -> pd.DataFrame:
+        """Get historical data as columns"""
         raise NotImplementedError("Angel One integration coming soon")
 
     # ==================== Order Management Methods ====================
 
-    def place_order(
-        self,
-        symbol: str,
-        exchange: str,
-        transaction_type: str,
-        quantity: int,
-        order_type: str = "MARKET",
-        product: str = "INTRADAY",
-        price: Optional[float] = None,
-        trigger_price: Optional[float] = None,
-        validity: str = "DAY"
-    ) -> Dict[str, Any]:
+    def place_order_request(self, order: OrderRequest) -> Dict[str, Any]:
         """Place order"""
         raise NotImplementedError("Angel One integration coming soon")
 
-    def modify_order(
-        self,
-        order_id: str,
-        quantity: Optional[int] = None,
-        price: Optional[float] = None,
-        trigger_price: Optional[float] = None,
-        order_type: Optional[str] = None
-    ) -> Dict[str, Any]:
-        """Modify order"""
-        raise NotImplementedError("Angel One integration coming soon")
-
     def cancel_order(self, order_id: str, variety: str = "NORMAL") -> Dict[str, Any]:
         """Cancel order"""
         raise NotImplementedError("Angel One integration coming soon")
 
-    # ==================== Position & Holdings Methods ====================
-
-    def get_positions(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Get positions"""
-        raise NotImplementedError("Angel One integration coming soon")
-
-    def get_holdings(self) -> List[Dict[str, Any]]:
-        """Get holdings"""
-        raise NotImplementedError("Angel One integration coming soon")
-
-    # ==================== Account & Funds Methods ====================
-
-    def get_margins(self) -> Dict[str, Any]:
-        """Get margins"""
-        raise NotImplementedError("Angel One integration coming soon")
-
-    def get_profile(self) -> Dict[str, Any]:
-        """Get profile"""
-        raise NotImplementedError("Angel One integration coming soon")
-
-    # ==================== Order Book Methods ====================
-
-    def get_orders(self) -> List[Dict[str, Any]]:
-        """Get orders"""
-        raise NotImplementedError("Angel One integration coming soon")
-
-    def get_order_history(self, order_id: str) -> List[Dict[str, Any]]:
-        """Get order history"""
-        raise NotImplementedError("Angel One integration coming soon")
-
-    def get_trades(self) -> List[Dict[str, Any]]:
-        """Get trades"""
-        raise NotImplementedError("Angel One integration coming soon")
-
     # ==================== WebSocket Methods ====================
 
-    def connect_websocket(self, on_tick_callback, on_connect_callback=None, on_close_callback=None):
-        """Connect WebSocket"""
-        raise NotImplementedError("Angel One WebSocket coming soon")
+    def _decode_ws_message(self, message) -> List[Dict[str, Any]]:
+        """Decode SmartStream binary ticks; text frames are heartbeats"""
+        if isinstance(message, str):
+            return []
+        return [_decode_tick(message)]
 
     def subscribe_symbols(self, symbols: List[str], mode: str = "LTP"):
         """Subscribe to symbols"""
         raise NotImplementedError("Angel One WebSocket coming soon")
-
-    def unsubscribe_symbols(self, symbols: List[str]):
-        """Unsubscribe symbols"""
-        raise NotImplementedError("Angel One WebSocket coming soon")
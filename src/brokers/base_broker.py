@@ -3,9 +3,144 @@ Base Broker Class
 Abstract base class for all broker integrations
 """
 
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from functools import wraps
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+from ..utils.http_session import pooled_session
+
+logger = logging.getLogger(__name__)
+
+
+# Clients shared by broker instances with the same credentials; an entry
+# lives as long as some broker still holds the client
+_shared_clients: "weakref.WeakValueDictionary[Tuple, Any]" = weakref.WeakValueDictionary()
+_shared_clients_lock = threading.Lock()
+
+
+# Value objects use __slots__ where dataclasses support it (Python 3.10+)
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class OrderRequest:
+    """Order to place, passed to BaseBroker.place_order_request"""
+    symbol: str
+    exchange: str
+    transaction_type: str  # BUY or SELL
+    quantity: int
+    order_type: str = "MARKET"  # MARKET or LIMIT
+    product: str = "MIS"  # MIS (intraday) or CNC (delivery)
+    price: Optional[float] = None
+    trigger_price: Optional[float] = None
+    validity: str = "DAY"
+    tag: Optional[str] = None
+
+
+# While a quote fetch is in flight, requests arriving within this many
+# milliseconds of each other are sent upstream as one batch; 0 disables the
+# window
+BROKER_BATCH_WINDOW_MS = float(os.getenv('BROKER_BATCH_WINDOW_MS', '5'))
+
+
+class _BatchWindow:
+    """
+    Coalesce quote requests from concurrent callers into one upstream call
+
+    A caller with no fetch in flight is sent straight upstream, so a lone
+    request pays no delay. While a fetch is running, the first caller of a
+    window waits window seconds and then sends every symbol requested in the
+    meantime in a single fetch; the window closes early once max_symbols are
+    pending. Each caller gets back the quotes for its own symbols. Fewer,
+    larger requests stay clear of the broker's per-second rate limits during
+    bursts such as the market open.
+    """
+
+    def __init__(self, fetch, window: float, max_symbols: int = 50):
+        """
+        Args:
+            fetch: Function(list of (symbol, exchange)) -> {"EXCHANGE:SYMBOL": quote}
+            window: Seconds to collect requests before fetching
+            max_symbols: Pending symbols that close the window early
+        """
+        self._fetch = fetch
+        self._window = window
+        self._max_symbols = max_symbols
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[List[Tuple[str, str]], Future]] = []
+        self._pending_symbols = 0
+        self._in_flight = 0  # Upstream fetches currently running
+
+    def fetch(self, symbols: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """Fetch quotes for symbols together with other callers in the window"""
+        future = Future()
+
+        with self._lock:
+            self._pending.append((symbols, future))
+            self._pending_symbols += len(symbols)
+            leader = len(self._pending) == 1
+            # Only wait for company while another fetch is already running
+            full = self._pending_symbols >= self._max_symbols
+            batch = self._take() if full or (leader and not self._in_flight) else None
+
+        if batch is None and leader:
+            time.sleep(self._window)
+            with self._lock:
+                batch = self._take()
+
+        if batch:
+            self._run(batch)
+
+        return future.result()
+
+    def _take(self) -> List[Tuple[List[Tuple[str, str]], Future]]:
+        """Remove and return the pending requests, counting their fetch as in flight (lock held)"""
+        batch, self._pending, self._pending_symbols = self._pending, [], 0
+        if batch:
+            self._in_flight += 1
+        return batch
+
+    def _run(self, batch: List[Tuple[List[Tuple[str, str]], Future]]):
+        """Fetch a batch in one call and hand each caller its quotes"""
+        symbols = list(dict.fromkeys(pair for request, _ in batch for pair in request))
+
+        try:
+            quotes = self._fetch(symbols)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        for request, future in batch:
+            keys = (f"{exchange}:{symbol}" for symbol, exchange in request)
+            future.set_result({key: quotes[key] for key in keys if key in quotes})
 
 
 class BaseBroker(ABC):
@@ -14,6 +149,18 @@ class BaseBroker(ABC):
     All broker implementations must inherit from this class.
     """
 
+    # Fixed attribute set; subclasses declare only the attributes they add,
+    # so broker instances carry no per-instance __dict__
+    __slots__ = (
+        'api_key', 'api_secret', 'access_token', 'user_id', 'authenticated',
+        'broker_name', 'http', '_tick_cache', '_tick_keys', '_ws_connected',
+        '_subscribed', '_session_future', '_quote_window'
+    )
+
+    # Directory for the historical candle cache used by get_historical_data
+    # implementations decorated with @cached_historical; None disables it
+    _hist_cache_dir: Optional[Path] = Path("~/.coolalgobot/hist_cache").expanduser()
+
     def __init__(self, api_key: str, api_secret: str, **kwargs):
         """
         Initialize broker connection
@@ -30,6 +177,42 @@ class BaseBroker(ABC):
         self.authenticated = False
         self.broker_name = "Unknown"
 
+        # One pooled session per broker and credentials, shared between
+        # instances so they reuse the same kept-alive connections
+        self.http = self._shared_client(('http', api_key, api_secret), pooled_session)
+
+        # Latest streamed tick per "EXCHANGE:SYMBOL", used by get_quotes
+        # while the WebSocket is connected
+        self._tick_cache: Dict[str, Dict[str, Any]] = {}
+        self._tick_keys: Dict[Any, str] = {}  # instrument token -> "EXCHANGE:SYMBOL"
+        self._ws_connected = False
+        self._subscribed: set = set()  # instrument tokens subscribed on the WebSocket
+        self._session_future: Optional[Future] = None  # Pending background login
+
+        # Coalesces concurrent REST quote requests; None when disabled
+        self._quote_window = (
+            _BatchWindow(self.fetch_quotes, BROKER_BATCH_WINDOW_MS / 1000)
+            if BROKER_BATCH_WINDOW_MS > 0 else None
+        )
+
+    def _shared_client(self, key: Tuple, factory):
+        """
+        Get the client for key shared by all instances of this broker class
+
+        Args:
+            key: Credentials identifying the client, e.g. (api_key, client_code)
+            factory: Function creating the client when none is alive
+
+        Returns:
+            Client instance
+        """
+        key = (type(self).__name__,) + key
+        with _shared_clients_lock:
+            client = _shared_clients.get(key)
+            if client is None:
+                client = _shared_clients[key] = factory()
+            return client
+
     # ==================== Authentication Methods ====================
 
     @abstractmethod
@@ -65,6 +248,25 @@ class BaseBroker(ABC):
         """
         pass
 
+    def generate_session_background(self, *args, **kwargs) -> Future:
+        """
+        Run generate_session on a background thread
+
+        Lets the caller load instruments, historical data and config while
+        the login round-trips are in flight. is_authenticated() waits for
+        the pending login before answering.
+
+        Args:
+            *args, **kwargs: Passed to generate_session
+
+        Returns:
+            Future resolving to the session data (or raising its error)
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.broker_name}-login")
+        self._session_future = executor.submit(self.generate_session, *args, **kwargs)
+        executor.shutdown(wait=False)
+        return self._session_future
+
     def load_access_token(self) -> bool:
         """
         Load saved access token from file
@@ -89,6 +291,57 @@ class BaseBroker(ABC):
     # ==================== Market Data Methods ====================
 
     @abstractmethod
+    def fetch_quotes(self, symbols: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch real-time quotes over REST in as few requests as possible
+
+        Implementations should use the broker's bulk quote endpoint rather
+        than one request per symbol.
+
+        Args:
+            symbols: List of (symbol, exchange) pairs, e.g. [("RELIANCE", "NSE")]
+
+        Returns:
+            Dictionary mapping "EXCHANGE:SYMBOL" to quote data
+        """
+        pass
+
+    def get_quotes(self, symbols: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get real-time quotes for several symbols
+
+        While the WebSocket is connected, symbols with a streamed tick are
+        served from the tick cache. The rest are fetched with fetch_quotes,
+        batched with concurrent callers (see BROKER_BATCH_WINDOW_MS), and
+        subscribed, so later calls are served from the stream.
+
+        Args:
+            symbols: List of (symbol, exchange) pairs, e.g. [("RELIANCE", "NSE")]
+
+        Returns:
+            Dictionary mapping "EXCHANGE:SYMBOL" to quote data
+        """
+        quotes = {}
+        missing = []
+
+        for symbol, exchange in symbols:
+            key = f"{exchange}:{symbol}"
+            if self._ws_connected and key in self._tick_cache:
+                quotes[key] = self._tick_cache[key]
+            else:
+                missing.append((symbol, exchange))
+
+        if missing:
+            if self._quote_window is not None:
+                fetched = self._quote_window.fetch(missing)
+            else:
+                fetched = self.fetch_quotes(missing)
+            quotes.update(fetched)
+            if self._ws_connected:
+                self._subscribe_quoted(fetched)
+
+        return quotes
+
     def get_quote(self, symbol: str, exchange: str = "NSE") -> Dict[str, Any]:
         """
         Get real-time quote for a symbol
@@ -100,9 +353,36 @@ class BaseBroker(ABC):
         Returns:
             Quote data with last_price, volume, ohlc, etc.
         """
-        pass
+        return self.get_quotes([(symbol, exchange)]).get(f"{exchange}:{symbol}", {})
 
     @abstractmethod
+    def get_historical_df(
+        self,
+        symbol: str,
+        from_date: datetime,
+        to_date: datetime,
+        interval: str = "5minute",
+        exchange: str = "NSE"
+    ) -> pd.DataFrame:
+        """
+        Get historical OHLCV data as columns
+
+        Implementations parse the broker's candle arrays with
+        candles_frame() and are decorated with @cached_historical, so
+        repeated ranges are served from the disk cache in _hist_cache_dir.
+
+        Args:
+            symbol: Trading symbol
+            from_date: Start date
+            to_date: End date
+            interval: Time interval (minute, 5minute, day, etc.)
+            exchange: Exchange name
+
+        Returns:
+            DataFrame with date, open, high, low, close, volume columns
+        """
+        pass
+
     def get_historical_data(
         self,
         symbol: str,
@@ -112,7 +392,9 @@ class BaseBroker(ABC):
         exchange: str = "NSE"
     ) -> List[Dict[str, Any]]:
         """
-        Get historical OHLCV data
+        Get historical OHLCV data as one dict per candle
+
+        Kept for existing callers; prefer get_historical_df.
 
         Args:
             symbol: Trading symbol
@@ -124,11 +406,23 @@ class BaseBroker(ABC):
         Returns:
             List of OHLCV candles
         """
-        pass
+        return self.get_historical_df(symbol, from_date, to_date, interval, exchange).to_dict('records')
 
     # ==================== Order Management Methods ====================
 
     @abstractmethod
+    def place_order_request(self, order: OrderRequest) -> Dict[str, Any]:
+        """
+        Place a new order
+
+        Args:
+            order: Order to place
+
+        Returns:
+            Order response with order_id
+        """
+        pass
+
     def place_order(
         self,
         symbol: str,
@@ -139,11 +433,14 @@ class BaseBroker(ABC):
         product: str = "MIS",  # MIS (intraday) or CNC (delivery)
         price: Optional[float] = None,
         trigger_price: Optional[float] = None,
-        validity: str = "DAY"
+        validity: str = "DAY",
+        tag: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Place a new order
 
+        Builds an OrderRequest and passes it to place_order_request.
+
         Args:
             symbol: Trading symbol
             exchange: Exchange name
@@ -154,11 +451,15 @@ class BaseBroker(ABC):
             price: Limit price (required for LIMIT orders)
             trigger_price: Stop-loss trigger price
             validity: Order validity (DAY, IOC)
+            tag: Optional order tag
 
         Returns:
             Order response with order_id
         """
-        pass
+        return self.place_order_request(OrderRequest(
+            symbol, exchange, transaction_type, quantity, order_type,
+            product, price, trigger_price, validity, tag
+        ))
 
     @abstractmethod
     def modify_order(
@@ -242,6 +543,29 @@ class BaseBroker(ABC):
         """
         pass
 
+    async def get_account_snapshot(self, *sections: str) -> Dict[str, Any]:
+        """
+        Fetch several account endpoints concurrently
+
+        The endpoints are independent, so they are requested in parallel
+        threads over the pooled session instead of one after another; the
+        snapshot costs roughly one round-trip.
+
+        Args:
+            *sections: Endpoints to fetch, each naming a get_<section>
+                method (positions, holdings, margins, profile, orders,
+                trades); defaults to positions, holdings, margins and profile
+
+        Returns:
+            Dictionary mapping each section to its endpoint's result
+        """
+        sections = sections or ('positions', 'holdings', 'margins', 'profile')
+        loop = asyncio.get_running_loop()  # run_in_executor rather than to_thread (3.9+)
+        results = await asyncio.gather(
+            *(loop.run_in_executor(None, getattr(self, f"get_{section}")) for section in sections)
+        )
+        return dict(zip(sections, results))
+
     # ==================== Order Book Methods ====================
 
     @abstractmethod
@@ -291,11 +615,131 @@ class BaseBroker(ABC):
         """
         pass
 
+    async def connect_websocket_async(self, on_tick_callback, on_connect_callback=None, on_close_callback=None):
+        """
+        Stream live data over an asyncio WebSocket until the connection closes
+
+        Frames are received on the running event loop (uvloop when it is
+        installed) instead of in a blocking socket thread. Permessage-deflate
+        is disabled: tick frames are small and compressing them only costs
+        CPU.
+
+        Args:
+            on_tick_callback: Callback function(ws, ticks) for tick data
+            on_connect_callback: Callback function(ws) on connection
+            on_close_callback: Callback function(ws, code, reason) on disconnection
+        """
+        if websockets is None:
+            raise ImportError("connect_websocket_async requires the websockets package")
+
+        url, headers = self._ws_endpoint()
+        on_ticks = self._wrap_tick_callback(on_tick_callback)
+
+        async with websockets.connect(url, extra_headers=headers, compression=None, max_size=None) as ws:
+            self._set_ws_connected(True)
+            try:
+                if on_connect_callback:
+                    on_connect_callback(ws)
+
+                async for message in ws:
+                    ticks = self._decode_ws_message(message)
+                    if ticks:
+                        on_ticks(ws, ticks)
+            finally:
+                self._set_ws_connected(False)
+                if on_close_callback:
+                    on_close_callback(ws, ws.close_code, ws.close_reason)
+
+    def _ws_endpoint(self) -> Tuple[str, Dict[str, str]]:
+        """
+        WebSocket URL and handshake headers for connect_websocket_async
+
+        Returns:
+            Tuple of (url, headers)
+        """
+        raise NotImplementedError(f"{self.broker_name} async WebSocket coming soon")
+
+    def _decode_ws_message(self, message) -> List[Dict[str, Any]]:
+        """
+        Decode one WebSocket frame into ticks
+
+        Args:
+            message: Frame payload (bytes for binary frames, str for text)
+
+        Returns:
+            List of tick dictionaries, empty for non-tick frames
+        """
+        data = self._parse_json(message)
+        return data if isinstance(data, list) else [data]
+
+    def _wrap_tick_callback(self, on_tick_callback):
+        """
+        Wrap a tick callback so ticks for quoted symbols update the tick cache
+
+        Args:
+            on_tick_callback: Callback function(ws, ticks) for tick data
+
+        Returns:
+            Callback to register with the broker's WebSocket client
+        """
+        # Ticks are matched by their integer instrument token, never by
+        # symbol string. The dicts are only ever cleared, never rebound, so
+        # they can be bound once here instead of looked up on self per tick.
+        tick_keys = self._tick_keys
+        tick_cache = self._tick_cache
+
+        def on_ticks(ws, ticks):
+            for tick in ticks:
+                key = tick_keys.get(tick.get('instrument_token'))
+                if key:
+                    tick_cache[key] = tick
+            on_tick_callback(ws, ticks)
+
+        return on_ticks
+
+    def _set_ws_connected(self, connected: bool):
+        """Record the WebSocket state; cached ticks are dropped on disconnect"""
+        self._ws_connected = connected
+        if not connected:
+            self._tick_cache.clear()
+            self._tick_keys.clear()
+
+    def _subscribe_quoted(self, quotes: Dict[str, Dict[str, Any]]):
+        """
+        Subscribe to the instruments behind REST quotes so that ticks
+        refresh them in the tick cache
+
+        Args:
+            quotes: Dictionary mapping "EXCHANGE:SYMBOL" to quote data
+        """
+        tokens = []
+        for key, quote in quotes.items():
+            token = quote.get('instrument_token')
+            if token is not None and token not in self._tick_keys:
+                # Interned so every cache entry for a symbol shares one key object
+                self._tick_keys[token] = sys.intern(key)
+                tokens.append(token)
+
+        if not tokens:
+            return
+
+        try:
+            self.subscribe_symbols(tokens)
+        except Exception as e:
+            # The REST quotes are still valid; retry the subscription next time
+            for token in tokens:
+                self._tick_keys.pop(token, None)
+            logger.warning(f"Failed to subscribe quoted symbols: {e}")
+
     @abstractmethod
     def subscribe_symbols(self, symbols: List[str], mode: str = "quote"):
         """
         Subscribe to symbols for live data
 
+        Implementations must send the whole list in one subscription message
+        (split only where the broker caps tokens per message), never one
+        message per symbol, and skip symbols already in self._subscribed.
+
         Args:
             symbols: List of instrument tokens or symbols
             mode: Data mode (ltp, quote, full)
@@ -307,19 +751,59 @@ class BaseBroker(ABC):
         """
         Unsubscribe from symbols
 
+        Like subscribe_symbols, the list goes out in one message and symbols
+        that are not subscribed are skipped.
+
         Args:
             symbols: List of instrument tokens or symbols
         """
         pass
 
+    def _new_subscriptions(self, symbols: List[Any]) -> List[Any]:
+        """
+        Symbols from a subscribe request that are not subscribed yet
+
+        Args:
+            symbols: List of instrument tokens or symbols
+
+        Returns:
+            De-duplicated list, in request order
+        """
+        return [s for s in dict.fromkeys(symbols) if s not in self._subscribed]
+
+    def _active_subscriptions(self, symbols: List[Any]) -> List[Any]:
+        """
+        Symbols from an unsubscribe request that are currently subscribed
+
+        Args:
+            symbols: List of instrument tokens or symbols
+
+        Returns:
+            De-duplicated list, in request order
+        """
+        return [s for s in dict.fromkeys(symbols) if s in self._subscribed]
+
     # ==================== Utility Methods ====================
 
+    @staticmethod
+    def _parse_json(payload: bytes) -> Any:
+        """
+        Parse a JSON payload from the broker (REST body or WebSocket text frame)
+
+        Uses orjson when it is installed, the standard library otherwise.
+        """
+        if orjson is not None:
+            return orjson.loads(payload)
+        return json.loads(payload)
+
     def get_broker_name(self) -> str:
         """Get broker name"""
         return self.broker_name
 
     def is_authenticated(self) -> bool:
-        """Check if broker is authenticated"""
+        """Check if broker is authenticated, waiting for a background login"""
+        if self._session_future is not None:
+            wait([self._session_future])
         return self.authenticated
 
     def logout(self):
@@ -330,3 +814,35 @@ class BaseBroker(ABC):
 
     def __repr__(self):
         return f"<{self.broker_name}Broker(authenticated={self.authenticated}, user_id={self.user_id})>"
+
+
+def unimplemented_methods(*names: str):
+    """
+    Class decorator for brokers that do not support some methods yet
+
+    Each named BaseBroker method that the class does not define itself is
+    filled in with a stub raising NotImplementedError, instead of every
+    broker spelling out the same placeholder.
+
+    Args:
+        *names: BaseBroker method names
+    """
+    def decorate(cls):
+        for name in names:
+            if name not in cls.__dict__:
+                setattr(cls, name, _unimplemented(name))
+        # ABCMeta computed the abstract set before the stubs existed; drop
+        # the names by hand (abc.update_abstractmethods needs Python 3.10)
+        cls.__abstractmethods__ = frozenset(cls.__abstractmethods__.difference(names))
+        return cls
+
+    return decorate
+
+
+def _unimplemented(name: str):
+    """Stub for an unsupported method, keeping the BaseBroker signature and docstring"""
+    @wraps(getattr(BaseBroker, name), updated=())
+    def method(self, *args, **kwargs):
+        raise NotImplementedError(f"{self.broker_name} integration coming soon ({name})")
+
+    return method
@@ -3,24 +3,44 @@ Broker Factory
 Creates broker instances based on broker name
 """
 
-from typing import Dict, Any
+import importlib
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
 from .base_broker import BaseBroker
-from .zerodha_broker import ZerodhaBroker
-from .kotak_broker import KotakBroker
-from .angel_broker import AngelBroker
 
 
 class BrokerFactory:
     """Factory class for creating broker instances"""
 
-    # Supported brokers
-    BROKERS = {
-        'zerodha': ZerodhaBroker,
-        'kotak': KotakBroker,
-        'angel': AngelBroker,
-        'angel_one': AngelBroker,  # Alias
-        'kotak_securities': KotakBroker,  # Alias
-    }
+    # Supported brokers, keyed by canonical (lower-case) name. Each entry
+    # names the module and class to import, so only the SDK of the broker
+    # actually created is loaded.
+    BROKERS: Mapping[str, Tuple[str, str]] = MappingProxyType({
+        'zerodha': ('.zerodha_broker', 'ZerodhaBroker'),
+        'kotak': ('.kotak_broker', 'KotakBroker'),
+        'angel': ('.angel_broker', 'AngelBroker'),
+        'angel_one': ('.angel_broker', 'AngelBroker'),  # Alias
+        'kotak_securities': ('.kotak_broker', 'KotakBroker'),  # Alias
+    })
+
+    # Broker classes imported so far, by canonical name
+    _resolved: Dict[str, type] = {}
+
+    _DISPLAY_NAMES: Mapping[str, str] = MappingProxyType({
+        'zerodha': 'Zerodha Kite Connect',
+        'kotak': 'Kotak Securities Neo API',
+        'angel': 'Angel One SmartAPI',
+        'upstox': 'Upstox API (Coming Soon)',
+        'icici': 'ICICI Direct (Coming Soon)',
+        'fyers': 'Fyers API (Coming Soon)',
+    })
+
+    @classmethod
+    @lru_cache(maxsize=32)
+    def _canonical_name(cls, broker_name: str) -> str:
+        """Normalize a user-supplied broker name (cached per spelling)"""
+        return broker_name.lower().strip()
 
     @classmethod
     def create_broker(cls, broker_name: str, api_key: str, api_secret: str, **kwargs) -> BaseBroker:
@@ -39,7 +59,7 @@ class BrokerFactory:
         Raises:
             ValueError: If broker not supported
         """
-        broker_name = broker_name.lower().strip()
+        broker_name = cls._canonical_name(broker_name)
 
         if broker_name not in cls.BROKERS:
             supported = ', '.join(cls.BROKERS.keys())
@@ -48,25 +68,36 @@ class BrokerFactory:
                 f"Supported brokers: {supported}"
             )
 
-        broker_class = cls.BROKERS[broker_name]
+        broker_class = cls.get_broker_class(broker_name)
         return broker_class(api_key, api_secret, **kwargs)
 
     @classmethod
-    def get_supported_brokers(cls) -> Dict[str, str]:
+    def get_broker_class(cls, broker_name: str) -> type:
+        """
+        Import and return the class for a supported broker
+
+        Args:
+            broker_name: Canonical name of the broker
+
+        Returns:
+            BaseBroker subclass
+        """
+        broker_class = cls._resolved.get(broker_name)
+        if broker_class is None:
+            module_name, class_name = cls.BROKERS[broker_name]
+            module = importlib.import_module(module_name, __package__)
+            broker_class = cls._resolved[broker_name] = getattr(module, class_name)
+        return broker_class
+
+    @classmethod
+    def get_supported_brokers(cls) -> Mapping[str, str]:
         """
         Get list of supported brokers
 
         Returns:
-            Dictionary of broker names and their display names
+            Read-only mapping of broker names to their display names
         """
-        return {
-            'zerodha': 'Zerodha Kite Connect',
-            'kotak': 'Kotak Securities Neo API',
-            'angel': 'Angel One SmartAPI',
-            'upstox': 'Upstox API (Coming Soon)',
-            'icici': 'ICICI Direct (Coming Soon)',
-            'fyers': 'Fyers API (Coming Soon)',
-        }
+        return cls._DISPLAY_NAMES
 
     @classmethod
     def is_broker_supported(cls, broker_name: str) -> bool:
@@ -79,7 +110,7 @@ class BrokerFactory:
         Returns:
             True if supported, False otherwise
         """
-        return broker_name.lower().strip() in cls.BROKERS
+        return cls._canonical_name(broker_name) in cls.BROKERS
 
 
 # Convenience function
@@ -0,0 +1,248 @@
+"""
+Historical Data Cache
+Columnar parsing of broker OHLCV candles and a disk cache with one
+Feather file per series
+"""
+
+import inspect
+import os
+import re
+import tempfile
+from datetime import timedelta, timezone
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+except ImportError:
+    pa = feather = None
+
+
+# Candle length per interval name (Kite and SmartAPI spellings)
+INTERVALS = {
+    'minute': timedelta(minutes=1),
+    '3minute': timedelta(minutes=3),
+    '5minute': timedelta(minutes=5),
+    '10minute': timedelta(minutes=10),
+    '15minute': timedelta(minutes=15),
+    '30minute': timedelta(minutes=30),
+    '60minute': timedelta(hours=1),
+    'day': timedelta(days=1),
+    'ONE_MINUTE': timedelta(minutes=1),
+    'THREE_MINUTE': timedelta(minutes=3),
+    'FIVE_MINUTE': timedelta(minutes=5),
+    'TEN_MINUTE': timedelta(minutes=10),
+    'FIFTEEN_MINUTE': timedelta(minutes=15),
+    'THIRTY_MINUTE': timedelta(minutes=30),
+    'ONE_HOUR': timedelta(hours=1),
+    'ONE_DAY': timedelta(days=1),
+}
+
+
+# Column layout of a candle frame; brokers send each candle as a list in
+# this order
+CANDLE_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+
+def candles_frame(rows: Sequence) -> pd.DataFrame:
+    """
+    Build a candle frame from the candles of a broker response
+
+    The rows are converted column by column: timestamps go through one
+    vectorized ISO 8601 parse instead of one datetime parse per candle.
+
+    Args:
+        rows: [timestamp, open, high, low, close, volume] lists, or dicts
+            keyed by CANDLE_COLUMNS as returned by kite.historical_data()
+
+    Returns:
+        DataFrame with CANDLE_COLUMNS; prices float64, volume int64
+    """
+    frame = pd.DataFrame(list(rows), columns=CANDLE_COLUMNS)
+    frame['date'] = pd.to_datetime(frame['date'], format='ISO8601')
+    frame[['open', 'high', 'low', 'close']] = frame[['open', 'high', 'low', 'close']].astype(np.float64)
+    frame['volume'] = frame['volume'].astype(np.int64)
+    return frame
+
+
+class HistoricalDataCache:
+    """
+    Disk cache for historical candles
+
+    Each (exchange, symbol, interval) series is stored as one Feather file
+    covering a contiguous date range. Requests inside that range are served
+    from disk; requests that extend it fetch only the missing head or tail
+    and merge it in. A request that lies wholly before or after the cached
+    range also fetches the gap, so the range stays contiguous and no cached
+    candles are dropped.
+
+    The last cached candle marks the end of history: the tail is fetched
+    again only once to_date reaches the candle after it, and the fetch
+    starts at that last candle so one that was still forming is replaced.
+    """
+
+    def __init__(self, cache_dir: Path):
+        """
+        Args:
+            cache_dir: Directory holding the cache files
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def get(
+        self,
+        fetch: Callable[..., pd.DataFrame],
+        symbol: str,
+        from_date,
+        to_date,
+        interval: str,
+        exchange: str
+    ) -> pd.DataFrame:
+        """
+        Get candles for a date range, fetching only what is not cached
+
+        Args:
+            fetch: Function(symbol, from_date, to_date, interval, exchange)
+                returning a candle frame
+            symbol: Trading symbol
+            from_date: Start date
+            to_date: End date
+            interval: Time interval
+            exchange: Exchange name
+
+        Returns:
+            Candle frame for the range
+        """
+        step = INTERVALS.get(interval)
+        if feather is None or step is None:
+            return fetch(symbol, from_date, to_date, interval, exchange)
+
+        def fetch_frame(start, end) -> pd.DataFrame:
+            return fetch(symbol, start.to_pydatetime(), end.to_pydatetime(), interval, exchange)
+
+        path = self._path(symbol, exchange, interval)
+        cached, covered_from = self._load(path)
+        start, end = pd.Timestamp(from_date), pd.Timestamp(to_date)
+
+        if cached is None:
+            parts = [fetch_frame(start, end)]
+            covered_from = start
+        else:
+            tz = cached['date'].dt.tz
+            start, end = _align(start, tz), _align(end, tz)
+            last = cached['date'].iloc[-1]
+
+            parts = [cached]
+            if start < covered_from:
+                parts.insert(0, fetch_frame(start, covered_from))
+                covered_from = start
+            if end >= last + step:
+                parts.append(fetch_frame(last, end))
+
+        if len(parts) == 1 and parts[0] is cached:
+            candles = cached
+        else:
+            frames = [p for p in parts if not p.empty]
+            if not frames:
+                return parts[0]
+            # Brokers return tz-aware datetimes whose tzinfo objects differ
+            # between calls; bring them to one dtype before merging
+            tz = pd.to_datetime(frames[0]['date']).dt.tz
+            for frame in frames:
+                frame['date'] = pd.to_datetime(frame['date'])
+                if tz is not None:
+                    frame['date'] = frame['date'].dt.tz_convert(tz)
+            candles = pd.concat(frames, ignore_index=True)
+            candles = candles.drop_duplicates('date', keep='last').sort_values('date', ignore_index=True)
+            self._save(path, candles, _align(covered_from, candles['date'].dt.tz))
+
+        tz = candles['date'].dt.tz
+        in_range = (candles['date'] >= _align(start, tz)) & (candles['date'] <= _align(end, tz))
+        return candles[in_range].reset_index(drop=True)
+
+    def _path(self, symbol: str, exchange: str, interval: str) -> Path:
+        """Cache file for a series"""
+        name = re.sub(r'[^A-Za-z0-9_.-]', '_', f"{exchange}_{symbol}_{interval}")
+        return self.cache_dir / f"{name}.feather"
+
+    def _load(self, path: Path) -> Tuple[Optional[pd.DataFrame], Optional[pd.Timestamp]]:
+        """Read a cached series and the start of the range it covers"""
+        if not path.exists():
+            return None, None
+
+        table = feather.read_table(path)
+        covered_from = pd.Timestamp(table.schema.metadata[b'covered_from'].decode())
+        candles = table.to_pandas()
+
+        # Arrow restores fixed offsets as pytz zones; use the same
+        # datetime.timezone that candles_frame produces
+        offset = candles['date'].dt.tz.utcoffset(None) if candles['date'].dt.tz is not None else None
+        if offset is not None:
+            candles['date'] = candles['date'].dt.tz_convert(timezone(offset))
+
+        return candles, covered_from
+
+    def _save(self, path: Path, candles: pd.DataFrame, covered_from: pd.Timestamp):
+        """Write a series atomically, recording the start of its range"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        table = pa.Table.from_pandas(candles, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b'covered_from'] = covered_from.isoformat().encode()
+
+        # A unique temp file per writer, so concurrent saves of one series
+        # (dashboard threads, other processes) never share a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f"{path.stem}.", suffix='.tmp')
+        os.close(fd)
+        try:
+            feather.write_feather(table.replace_schema_metadata(metadata), tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def _align(ts: pd.Timestamp, tz) -> pd.Timestamp:
+    """Make a timestamp comparable with candle dates in the given timezone"""
+    if tz is not None and ts.tz is None:
+        return ts.tz_localize(tz)
+    if tz is None and ts.tz is not None:
+        return ts.tz_localize(None)
+    return ts
+
+
+def cached_historical(func):
+    """
+    Serve a broker's get_historical_df through the disk cache
+
+    The broker's _hist_cache_dir selects the cache directory; None disables
+    caching.
+    """
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if self._hist_cache_dir is None:
+            return func(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        params = bound.arguments
+
+        def fetch(symbol, from_date, to_date, interval, exchange):
+            return func(self, symbol, from_date, to_date, interval=interval, exchange=exchange)
+
+        return HistoricalDataCache(self._hist_cache_dir).get(
+            fetch,
+            params['symbol'],
+            params['from_date'],
+            params['to_date'],
+            params['interval'],
+            params['exchange']
+        )
+
+    return wrapper
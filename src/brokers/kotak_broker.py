@@ -4,16 +4,28 @@ Complete implementation of BaseBroker for Kotak Securities
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Any, Tuple
 from datetime import datetime
+
+import pandas as pd
 from pathlib import Path
 
-from .base_broker import BaseBroker
+from .base_broker import BaseBroker, unimplemented_methods
+from .historical_cache import cached_historical
+
+logger = logging.getLogger('kotak')
 
 
+@unimplemented_methods(
+    'place_order_request', 'modify_order', 'cancel_order', 'get_positions', 'get_holdings',
+    'get_margins', 'get_profile', 'get_orders', 'get_order_history', 'get_trades',
+    'connect_websocket', 'unsubscribe_symbols'
+)
 class KotakBroker(BaseBroker):
     """Kotak Securities Neo API implementation of BaseBroker"""
 
+    __slots__ = ('mobile_number', 'password', 'mpin', 'neo')
+
     def __init__(self, api_key: str, api_secret: str, **kwargs):
         """
         Initialize Kotak broker
@@ -28,7 +40,6 @@ class KotakBroker(BaseBroker):
         self.mobile_number = kwargs.get('mobile_number')
         self.password = kwargs.get('password')
         self.mpin = kwargs.get('mpin')
-        self.logger = logging.getLogger('kotak')
 
         # TODO: Initialize Kotak Neo API client
         # from neo_api_client import NeoAPI
@@ -42,7 +53,7 @@ class KotakBroker(BaseBroker):
         Note: Kotak uses mobile OTP login, not OAuth2
         """
         # TODO: Implement Kotak-specific login
-        self.logger.warning("Kotak Neo uses OTP-based login, not URL-based OAuth")
+        logger.warning("Kotak Neo uses OTP-based login, not URL-based OAuth")
         return "https://napi.kotaksecurities.com"
 
     def generate_session(self, request_token: str = None) -> Dict[str, Any]:
@@ -62,116 +73,43 @@ class KotakBroker(BaseBroker):
             # otp = input("Enter OTP: ")
             # self.neo.session_2fa(OTP=otp)
 
-            self.logger.warning("Kotak authentication not yet implemented")
+            logger.warning("Kotak authentication not yet implemented")
             raise NotImplementedError("Kotak Securities authentication coming soon")
 
         except Exception as e:
-            self.logger.error(f"Failed to generate Kotak session: {e}")
+            logger.error(f"Failed to generate Kotak session: {e}")
             raise
 
     def verify_token(self) -> bool:
         """Verify if session is valid"""
         try:
             # TODO: Implement token verification
-            self.logger.warning("Kotak token verification not yet implemented")
+            logger.warning("Kotak token verification not yet implemented")
             return False
         except Exception as e:
-            self.logger.error(f"Token verification failed: {e}")
+            logger.error(f"Token verification failed: {e}")
             return False
 
     # ==================== Market Data Methods ====================
 
-    def get_quote(self, symbol: str, exchange: str = "NSE") -> Dict[str, Any]:
-        """Get real-time quote"""
+    def fetch_quotes(self, symbols: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """Fetch real-time quotes for several symbols"""
         raise NotImplementedError("Kotak Securities integration coming soon")
 
-    def get_historical_data(
+    @cached_historical
+    def get_historical_df(
         self,
         symbol: str,
         from_date: datetime,
         to_date: datetime,
         interval: str = "5minute",
         exchange: str = "NSE"
-    ) -> List[Dict[str, Any]]:
-        """Get historical data"""
-        raise NotImplementedError("Kotak Securities integration coming soon")
-
-    # ==================== Order Management Methods ====================
-
-    def place_order(
-        self,
-        symbol: str,
-        exchange: str,
-        transaction_type: str,
-        quantity: int,
-        order_type: str = "MARKET",
-        product: str = "MIS",
-        price: Optional[float] = None,
-        trigger_price: Optional[float] = None,
-        validity: str = "DAY"
-    ) -> Dict[str, Any]:
-        """Place order"""
-        raise NotImplementedError("Kotak Securities integration coming soon")
-
-    def modify_order(
-        self,
-        order_id: str,
-        quantity: Optional[int] = None,
-        price: Optional[float] = None,
-        trigger_price: Optional[float] = None,
-        order_type: Optional[str] = None
-    ) -> Dict[str, Any]:
-        """Modify order"""
-        raise NotImplementedError("Kotak Securities integration coming soon")
-
-    def cancel_order(self, order_id: str, variety: str = "regular") -> Dict[str, Any]:
-        """Cancel order"""
-        raise NotImplementedError("Kotak Securities integration coming soon")
-
-    # ==================== Position & Holdings Methods ====================
-
-    def get_positions(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Get positions"""
-        raise NotImplementedError("Kotak Securities integration coming soon")
-
-    def get_holdings(self) -> List[Dict[str, Any]]:
-        """Get holdings"""
-        raise NotImplementedError("Kotak Securities integration coming soon")
-
-    # ==================== Account & Funds Methods ====================
-
-    def get_margins(self) -> Dict[str, Any]:
-        """Get margins"""
-        raise NotImplementedError("Kotak Securities integration coming soon")
-
-    def get_profile(self) -> Dict[str, Any]:
-        """Get profile"""
-        raise NotImplementedError("Kotak Securities integration coming soon")
-
-    # ==================== Order Book Methods ====================
-
-    def get_orders(self) -> List[Dict[str, Any]]:
-        """Get orders"""
-        raise NotImplementedError("Kotak Securities integration coming soon")
-
-    def get_order_history(self, order_id: str) -> List[Dict[str, Any]]:
-        """Get order history"""
-        raise NotImplementedError("Kotak Securities integration coming soon")
-
-    def get_trades(self) -> List[Dict[str, Any]]:
-        """Get trades"""
+    ) -> pd.DataFrame:
+        """Get historical data as columns"""
         raise NotImplementedError("Kotak Securities integration coming soon")
 
     # ==================== WebSocket Methods ====================
 
-    def connect_websocket(self, on_tick_callback, on_connect_callback=None, on_close_callback=None):
-        """Connect WebSocket"""
-        raise NotImplementedError("Kotak Securities WebSocket coming soon")
-
     def subscribe_symbols(self, symbols: List[str], mode: str = "quote"):
         """Subscribe to symbols"""
         raise NotImplementedError("Kotak Securities WebSocket coming soon")
-
-    def unsubscribe_symbols(self, symbols: List[str]):
-        """Unsubscribe symbols"""
-        raise NotImplementedError("Kotak Securities WebSocket coming soon")
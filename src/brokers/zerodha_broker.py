@@ -3,15 +3,20 @@ Zerodha Kite Connect Broker Implementation
 Complete implementation of BaseBroker for Zerodha
 """
 
+import asyncio
+import json
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+import os
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import date, datetime
 from pathlib import Path
+import pandas as pd
 from kiteconnect import KiteConnect
 from kiteconnect.exceptions import KiteException
 
-from .base_broker import BaseBroker
-from ..utils.error_handler import handle_exceptions, retry_on_error
+from .base_broker import BaseBroker, OrderRequest
+from .historical_cache import cached_historical, candles_frame
+from ..utils.error_handler import handle_exceptions
 from ..utils.exceptions import (
     BrokerAuthenticationError,
     BrokerAPIError,
@@ -22,10 +27,68 @@ from ..utils.exceptions import (
 )
 from ..utils.validators import validate_order_params
 
+logger = logging.getLogger('zerodha')
+
+
+class _AsyncKiteSocket:
+    """
+    KiteTicker-compatible subscription interface over an asyncio WebSocket
+
+    Installed as ZerodhaBroker.websocket by connect_websocket_async so that
+    subscribe_symbols and unsubscribe_symbols work unchanged. Frames are
+    handed to the event loop, so the methods can be called from any thread.
+    """
+
+    def __init__(self, ws, loop: asyncio.AbstractEventLoop, ticker):
+        """
+        Args:
+            ws: Connected websockets client
+            loop: Event loop running the connection
+            ticker: KiteTicker used for its mode constants and binary parser
+        """
+        self.ws = ws
+        self.loop = loop
+        self.ticker = ticker
+        self.MODE_LTP = ticker.MODE_LTP
+        self.MODE_QUOTE = ticker.MODE_QUOTE
+        self.MODE_FULL = ticker.MODE_FULL
+
+    def subscribe(self, tokens: List[int]):
+        self._send({"a": "subscribe", "v": tokens})
+
+    def unsubscribe(self, tokens: List[int]):
+        self._send({"a": "unsubscribe", "v": tokens})
+
+    def set_mode(self, mode: str, tokens: List[int]):
+        self._send({"a": "mode", "v": [mode, tokens]})
+
+    def parse(self, payload: bytes) -> List[Dict[str, Any]]:
+        """Decode a binary tick frame (availability checked by connect_websocket_async)"""
+        return self.ticker._parse_binary(payload)
+
+    def _send(self, message: Dict[str, Any]):
+        asyncio.run_coroutine_threadsafe(self.ws.send(json.dumps(message)), self.loop)
+
 
 class ZerodhaBroker(BaseBroker):
     """Zerodha Kite Connect implementation of BaseBroker"""
 
+    __slots__ = (
+        'redirect_url', 'kite', 'websocket', '_orders_cache', '_trades_cache',
+        '_orders_version', '_fills_version'
+    )
+
+    # Maximum instruments per kite.quote() call
+    QUOTE_BATCH_SIZE = 500
+
+    # Directory for the daily tradingsymbol -> instrument_token index built
+    # from kite.instruments(); None keeps it in memory only
+    _instruments_cache_dir: Optional[Path] = Path("~/.coolalgobot/instruments").expanduser()
+
+    # Per exchange: (day, {tradingsymbol: instrument_token}), shared by all
+    # instances so the instrument dump is fetched at most once a day
+    _token_index: Dict[str, Tuple[date, Dict[str, int]]] = {}
+
     def __init__(self, api_key: str, api_secret: str, redirect_url: str = None):
         """
         Initialize Zerodha broker
@@ -39,15 +102,23 @@ class ZerodhaBroker(BaseBroker):
         self.broker_name = "Zerodha"
         self.redirect_url = redirect_url or "http://localhost:8080/callback"
         self.kite = KiteConnect(api_key=self.api_key)
-        self.logger = logging.getLogger('zerodha')
+        self.kite.reqsession = self.http  # Route Kite REST calls through the pooled session
         self.websocket = None
 
+        # Account state kept current by WebSocket order updates while the
+        # ticker is connected; None until first fetched over REST. Positions
+        # aren't cached since their MTM fields move with every tick.
+        self._orders_cache: Optional[Dict[str, Dict[str, Any]]] = None  # order_id -> order
+        self._trades_cache: Optional[List[Dict[str, Any]]] = None
+        self._orders_version = 0  # Bumped on every order update; guards caching stale REST results
+        self._fills_version = 0  # Bumped on every fill; guards caching stale REST results
+
     # ==================== Authentication Methods ====================
 
     def get_login_url(self) -> str:
         """Generate Zerodha login URL"""
         login_url = self.kite.login_url()
-        self.logger.info(f"Login URL generated: {login_url}")
+        logger.info(f"Login URL generated: {login_url}")
         return login_url
 
     @handle_exceptions(context="Generate Zerodha session", notify=True, raise_error=True)
@@ -74,7 +145,7 @@ class ZerodhaBroker(BaseBroker):
             # Save token to file
             self.save_access_token(self.access_token)
 
-            self.logger.info(f"Session generated successfully for user: {self.user_id}")
+            logger.info(f"Session generated successfully for user: {self.user_id}")
             return data
 
         except KiteException as e:
@@ -94,10 +165,10 @@ class ZerodhaBroker(BaseBroker):
             profile = self.kite.profile()
             self.user_id = profile.get('user_id')
             self.authenticated = True
-            self.logger.info(f"Token verified. User: {profile.get('user_name')}")
+            logger.info(f"Token verified. User: {profile.get('user_name')}")
             return True
         except Exception as e:
-            self.logger.error(f"Token verification failed: {e}")
+            logger.error(f"Token verification failed: {e}")
             self.authenticated = False
             return False
 
@@ -113,10 +184,10 @@ class ZerodhaBroker(BaseBroker):
                 if token:
                     self.access_token = token
                     self.kite.set_access_token(token)
-                    self.logger.info("Access token loaded from file")
+                    logger.info("Access token loaded from file")
                     return True
             except Exception as e:
-                self.logger.error(f"Failed to load access token: {e}")
+                logger.error(f"Failed to load access token: {e}")
 
         return False
 
@@ -128,55 +199,62 @@ class ZerodhaBroker(BaseBroker):
             token_file.parent.mkdir(parents=True, exist_ok=True)
             with open(token_file, 'w') as f:
                 f.write(token)
-            self.logger.info("Access token saved to file")
+            logger.info("Access token saved to file")
             return True
         except Exception as e:
-            self.logger.error(f"Failed to save access token: {e}")
+            logger.error(f"Failed to save access token: {e}")
             return False
 
     # ==================== Market Data Methods ====================
 
-    @retry_on_error(max_retries=3, delay=1, exceptions=(KiteException,), context="Get market quote")
+    # Retries come from the pooled session (502/503/504); a retry decorator
+    # here as well would multiply the attempts per call
     @handle_exceptions(context="Get market quote", raise_error=True)
-    def get_quote(self, symbol: str, exchange: str = "NSE") -> Dict[str, Any]:
+    def fetch_quotes(self, symbols: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
         """
-        Get real-time quote for a symbol
+        Fetch real-time quotes for several symbols over REST
+
+        Kite accepts up to 500 instruments per quote request, so larger lists
+        are split into that many per call.
 
         Args:
-            symbol: Trading symbol (e.g., "RELIANCE")
-            exchange: Exchange name (NSE, BSE, NFO, etc.)
+            symbols: List of (symbol, exchange) pairs
 
         Returns:
-            Quote data with last_price, volume, ohlc, etc.
+            Dictionary mapping "EXCHANGE:SYMBOL" to quote data
 
         Raises:
-            MarketDataError: If unable to fetch quote
+            MarketDataError: If unable to fetch quotes
         """
+        instruments = [f"{exchange}:{symbol}" for symbol, exchange in symbols]
+        quotes = {}
+
         try:
-            instrument = f"{exchange}:{symbol}"
-            quote = self.kite.quote(instrument)
-            return quote.get(instrument, {})
+            for start in range(0, len(instruments), self.QUOTE_BATCH_SIZE):
+                quotes.update(self.kite.quote(*instruments[start:start + self.QUOTE_BATCH_SIZE]))
+            return quotes
         except KiteException as e:
             raise MarketDataError(
-                f"Failed to fetch quote for {symbol}: {str(e)}",
-                symbol=symbol
+                f"Failed to fetch quotes for {', '.join(instruments)}: {str(e)}",
+                symbol=instruments[0] if len(instruments) == 1 else None
             )
         except Exception as e:
             raise MarketDataError(
-                f"Unexpected error fetching quote for {symbol}: {str(e)}",
-                symbol=symbol
+                f"Unexpected error fetching quotes for {', '.join(instruments)}: {str(e)}",
+                symbol=instruments[0] if len(instruments) == 1 else None
             )
 
-    def get_historical_data(
+    @cached_historical
+    def get_historical_df(
         self,
         symbol: str,
         from_date: datetime,
         to_date: datetime,
         interval: str = "5minute",
         exchange: str = "NSE"
-    ) -> List[Dict[str, Any]]:
+    ) -> pd.DataFrame:
         """
-        Get historical OHLCV data
+        Get historical OHLCV data as columns
 
         Args:
             symbol: Trading symbol
@@ -186,62 +264,87 @@ class ZerodhaBroker(BaseBroker):
             exchange: Exchange name
 
         Returns:
-            List of OHLCV candles
+            DataFrame with date, open, high, low, close, volume columns
         """
         try:
-            # Get instrument token
-            instruments = self.kite.instruments(exchange)
-            instrument_token = None
-
-            for inst in instruments:
-                if inst['tradingsymbol'] == symbol:
-                    instrument_token = inst['instrument_token']
-                    break
-
-            if not instrument_token:
-                raise ValueError(f"Instrument not found: {symbol}")
-
-            # Fetch historical data
-            data = self.kite.historical_data(
-                instrument_token,
-                from_date,
-                to_date,
-                interval
-            )
+            instrument_token = self._get_instrument_token(symbol, exchange)
 
-            return data
+            candles = self.kite.historical_data(instrument_token, from_date, to_date, interval)
+            return candles_frame(candles)
 
         except Exception as e:
-            self.logger.error(f"Failed to get historical data for {symbol}: {e}")
+            logger.error(f"Failed to get historical data for {symbol}: {e}")
             raise
 
+    def _get_instrument_token(self, symbol: str, exchange: str = "NSE") -> int:
+        """
+        Look up the instrument token of a trading symbol
+
+        Args:
+            symbol: Trading symbol
+            exchange: Exchange name
+
+        Returns:
+            Instrument token
+
+        Raises:
+            ValueError: If the exchange has no such symbol
+        """
+        token = self._instrument_tokens(exchange).get(symbol)
+        if token is None:
+            raise ValueError(f"Instrument not found: {symbol}")
+        return token
+
+    def _instrument_tokens(self, exchange: str) -> Dict[str, int]:
+        """
+        Today's tradingsymbol -> instrument_token index for an exchange
+
+        The instrument dump (tens of thousands of rows for NFO) changes once
+        a day, so it is downloaded at most once a day: the index is kept in
+        memory and written to _instruments_cache_dir for later processes.
+        """
+        today = date.today()
+        cached = self._token_index.get(exchange)
+        if cached and cached[0] == today:
+            return cached[1]
+
+        cache_dir = self._instruments_cache_dir
+        path = cache_dir / f"instruments_{exchange}_{today:%Y%m%d}.json" if cache_dir else None
+
+        if path is not None and path.exists():
+            tokens = self._parse_json(path.read_bytes())
+        else:
+            tokens = {inst['tradingsymbol']: inst['instrument_token'] for inst in self.kite.instruments(exchange)}
+            if path is not None:
+                self._save_instrument_tokens(path, exchange, tokens)
+
+        self._token_index[exchange] = (today, tokens)
+        return tokens
+
+    @staticmethod
+    def _save_instrument_tokens(path: Path, exchange: str, tokens: Dict[str, int]):
+        """Write an index atomically and remove earlier days' files"""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(tokens))
+            os.replace(tmp_path, path)
+
+            for old in path.parent.glob(f"instruments_{exchange}_*.json"):
+                if old != path:
+                    old.unlink(missing_ok=True)
+        except OSError as e:
+            # The in-memory index still serves this process
+            logger.warning(f"Failed to cache instruments for {exchange}: {e}")
+
     # ==================== Order Management Methods ====================
 
-    def place_order(
-        self,
-        symbol: str,
-        exchange: str,
-        transaction_type: str,
-        quantity: int,
-        order_type: str = "MARKET",
-        product: str = "MIS",
-        price: Optional[float] = None,
-        trigger_price: Optional[float] = None,
-        validity: str = "DAY"
-    ) -> Dict[str, Any]:
+    def place_order_request(self, order: OrderRequest) -> Dict[str, Any]:
         """
         Place a new order
 
         Args:
-            symbol: Trading symbol
-            exchange: Exchange name
-            transaction_type: BUY or SELL
-            quantity: Number of shares
-            order_type: MARKET or LIMIT
-            product: MIS (intraday) or CNC (delivery)
-            price: Limit price (required for LIMIT orders)
-            trigger_price: Stop-loss trigger price
-            validity: Order validity (DAY, IOC)
+            order: Order to place
 
         Returns:
             Order response with order_id
@@ -249,22 +352,23 @@ class ZerodhaBroker(BaseBroker):
         try:
             order_id = self.kite.place_order(
                 variety=self.kite.VARIETY_REGULAR,
-                exchange=exchange,
-                tradingsymbol=symbol,
-                transaction_type=transaction_type,
-                quantity=quantity,
-                order_type=order_type,
-                product=product,
-                price=price,
-                trigger_price=trigger_price,
-                validity=validity
+                exchange=order.exchange,
+                tradingsymbol=order.symbol,
+                transaction_type=order.transaction_type,
+                quantity=order.quantity,
+                order_type=order.order_type,
+                product=order.product,
+                price=order.price,
+                trigger_price=order.trigger_price,
+                validity=order.validity,
+                tag=order.tag
             )
 
-            self.logger.info(f"Order placed: {order_id} - {transaction_type} {quantity} {symbol}")
+            logger.info(f"Order placed: {order_id} - {order.transaction_type} {order.quantity} {order.symbol}")
             return {"order_id": order_id, "status": "success"}
 
         except Exception as e:
-            self.logger.error(f"Failed to place order: {e}")
+            logger.error(f"Failed to place order: {e}")
             raise
 
     def modify_order(
@@ -286,11 +390,11 @@ class ZerodhaBroker(BaseBroker):
                 order_type=order_type
             )
 
-            self.logger.info(f"Order modified: {order_id}")
+            logger.info(f"Order modified: {order_id}")
             return {"order_id": order_id, "status": "success", "result": result}
 
         except Exception as e:
-            self.logger.error(f"Failed to modify order: {e}")
+            logger.error(f"Failed to modify order: {e}")
             raise
 
     def cancel_order(self, order_id: str, variety: str = "regular") -> Dict[str, Any]:
@@ -301,11 +405,11 @@ class ZerodhaBroker(BaseBroker):
                 order_id=order_id
             )
 
-            self.logger.info(f"Order cancelled: {order_id}")
+            logger.info(f"Order cancelled: {order_id}")
             return {"order_id": order_id, "status": "cancelled", "result": result}
 
         except Exception as e:
-            self.logger.error(f"Failed to cancel order: {e}")
+            logger.error(f"Failed to cancel order: {e}")
             raise
 
     # ==================== Position & Holdings Methods ====================
@@ -316,7 +420,7 @@ class ZerodhaBroker(BaseBroker):
             positions = self.kite.positions()
             return positions
         except Exception as e:
-            self.logger.error(f"Failed to get positions: {e}")
+            logger.error(f"Failed to get positions: {e}")
             raise
 
     def get_holdings(self) -> List[Dict[str, Any]]:
@@ -325,7 +429,7 @@ class ZerodhaBroker(BaseBroker):
             holdings = self.kite.holdings()
             return holdings
         except Exception as e:
-            self.logger.error(f"Failed to get holdings: {e}")
+            logger.error(f"Failed to get holdings: {e}")
             raise
 
     # ==================== Account & Funds Methods ====================
@@ -336,7 +440,7 @@ class ZerodhaBroker(BaseBroker):
             margins = self.kite.margins()
             return margins
         except Exception as e:
-            self.logger.error(f"Failed to get margins: {e}")
+            logger.error(f"Failed to get margins: {e}")
             raise
 
     def get_profile(self) -> Dict[str, Any]:
@@ -345,18 +449,24 @@ class ZerodhaBroker(BaseBroker):
             profile = self.kite.profile()
             return profile
         except Exception as e:
-            self.logger.error(f"Failed to get profile: {e}")
+            logger.error(f"Failed to get profile: {e}")
             raise
 
     # ==================== Order Book Methods ====================
 
     def get_orders(self) -> List[Dict[str, Any]]:
-        """Get all orders for the day"""
+        """Get all orders for the day, kept current by WebSocket order updates"""
+        if self._ws_connected and self._orders_cache is not None:
+            return list(self._orders_cache.values())
+
         try:
+            version = self._orders_version
             orders = self.kite.orders()
+            if self._ws_connected and version == self._orders_version:
+                self._orders_cache = {order['order_id']: order for order in orders}
             return orders
         except Exception as e:
-            self.logger.error(f"Failed to get orders: {e}")
+            logger.error(f"Failed to get orders: {e}")
             raise
 
     def get_order_history(self, order_id: str) -> List[Dict[str, Any]]:
@@ -365,16 +475,22 @@ class ZerodhaBroker(BaseBroker):
             history = self.kite.order_history(order_id)
             return history
         except Exception as e:
-            self.logger.error(f"Failed to get order history: {e}")
+            logger.error(f"Failed to get order history: {e}")
             raise
 
     def get_trades(self) -> List[Dict[str, Any]]:
-        """Get all executed trades for the day"""
+        """Get all executed trades for the day, from memory until the next fill"""
+        if self._ws_connected and self._trades_cache is not None:
+            return self._trades_cache
+
         try:
+            version = self._fills_version
             trades = self.kite.trades()
+            if self._ws_connected and version == self._fills_version:
+                self._trades_cache = trades
             return trades
         except Exception as e:
-            self.logger.error(f"Failed to get trades: {e}")
+            logger.error(f"Failed to get trades: {e}")
             raise
 
     # ==================== WebSocket Methods ====================
@@ -392,24 +508,112 @@ class ZerodhaBroker(BaseBroker):
             from kiteconnect import KiteTicker
 
             self.websocket = KiteTicker(self.api_key, self.access_token)
+            self._subscribed.clear()
 
-            if on_connect_callback:
-                self.websocket.on_connect = on_connect_callback
+            def on_connect(ws, response):
+                self._set_ws_connected(True)
+                if on_connect_callback:
+                    on_connect_callback(ws, response)
+
+            def on_close(ws, code, reason):
+                self._set_ws_connected(False)
+                if on_close_callback:
+                    on_close_callback(ws, code, reason)
 
-            if on_close_callback:
-                self.websocket.on_close = on_close_callback
+            self.websocket.on_connect = on_connect
+            self.websocket.on_close = on_close
+            self.websocket.on_order_update = lambda ws, data: self._on_order_update(data)
 
-            self.websocket.on_ticks = on_tick_callback
+            # Ticks also feed the quote cache used by get_quotes
+            self.websocket.on_ticks = self._wrap_tick_callback(on_tick_callback)
 
             # Start WebSocket in background thread
             self.websocket.connect(threaded=True)
 
-            self.logger.info("WebSocket connected")
+            logger.info("WebSocket connected")
 
         except Exception as e:
-            self.logger.error(f"Failed to connect WebSocket: {e}")
+            logger.error(f"Failed to connect WebSocket: {e}")
             raise
 
+    async def connect_websocket_async(self, on_tick_callback, on_connect_callback=None, on_close_callback=None):
+        """
+        Stream live data over an asyncio WebSocket until the connection closes
+
+        Args:
+            on_tick_callback: Callback function(ws, ticks) for tick data
+            on_connect_callback: Callback function(ws) on connection
+            on_close_callback: Callback function(ws, code, reason) on disconnection
+        """
+        from kiteconnect import KiteTicker
+
+        loop = asyncio.get_running_loop()
+        ticker = KiteTicker(self.api_key, self.access_token)
+        if not callable(getattr(ticker, '_parse_binary', None)):
+            # Tick frames are decoded by KiteTicker's internal parser, which
+            # isn't part of kiteconnect's public API
+            from importlib.metadata import version
+            raise BrokerConnectionError(
+                f"kiteconnect {version('kiteconnect')} has no KiteTicker._parse_binary to decode "
+                f"ticks with; use connect_websocket instead",
+                broker_name=self.broker_name
+            )
+
+        def on_connect(ws):
+            self.websocket = _AsyncKiteSocket(ws, loop, ticker)
+            self._subscribed.clear()
+            if on_connect_callback:
+                on_connect_callback(ws)
+
+        await super().connect_websocket_async(on_tick_callback, on_connect, on_close_callback)
+
+    def _ws_endpoint(self) -> Tuple[str, Dict[str, str]]:
+        """Kite ticker URL and handshake headers"""
+        from kiteconnect import KiteTicker
+
+        url = f"{KiteTicker.ROOT_URI}?api_key={self.api_key}&access_token={self.access_token}"
+        return url, {"X-Kite-Version": "3"}
+
+    def _decode_ws_message(self, message) -> List[Dict[str, Any]]:
+        """Decode binary tick frames; text frames (order updates, errors) carry no ticks"""
+        if isinstance(message, bytes):
+            # Frames of up to 4 bytes are heartbeats
+            return self.websocket.parse(message) if len(message) > 4 else []
+
+        data = self._parse_json(message)
+        if data.get("type") == "order":
+            self._on_order_update(data["data"])
+        elif data.get("type") == "error":
+            logger.warning(f"WebSocket error: {data.get('data')}")
+        return []
+
+    def _set_ws_connected(self, connected: bool):
+        """Record the WebSocket state; cached ticks and account state are dropped on disconnect"""
+        super()._set_ws_connected(connected)
+        if not connected:
+            self._orders_cache = self._trades_cache = None
+
+    def _on_order_update(self, order: Dict[str, Any]):
+        """
+        Apply a WebSocket order update to the cached account state
+
+        The order book is updated in place. Kite pushes no trade updates, so
+        a change in filled quantity drops the trades cache and the next
+        get_trades fetches it once over REST.
+
+        Args:
+            order: Order update in the same format as kite.orders() entries
+        """
+        self._orders_version += 1
+        orders = self._orders_cache
+        previous = orders.get(order['order_id']) if orders is not None else None
+        if orders is not None:
+            orders[order['order_id']] = order
+
+        if order.get('filled_quantity', 0) != (previous or {}).get('filled_quantity', 0):
+            self._fills_version += 1
+            self._trades_cache = None
+
     def subscribe_symbols(self, symbols: List[str], mode: str = "quote"):
         """
         Subscribe to symbols for live data
@@ -428,13 +632,20 @@ class ZerodhaBroker(BaseBroker):
                 "full": self.websocket.MODE_FULL
             }
 
-            self.websocket.subscribe(symbols)
-            self.websocket.set_mode(mode_map.get(mode, self.websocket.MODE_QUOTE), symbols)
+            # KiteTicker sends each list as a single frame
+            new_symbols = self._new_subscriptions(symbols)
+            if new_symbols:
+                self.websocket.subscribe(new_symbols)
+                self._subscribed.update(new_symbols)
+
+            # The mode applies to every requested symbol, including ones
+            # already subscribed in another mode
+            self.websocket.set_mode(mode_map.get(mode, self.websocket.MODE_QUOTE), list(symbols))
 
-            self.logger.info(f"Subscribed to {len(symbols)} symbols in {mode} mode")
+            logger.info(f"Subscribed to {len(new_symbols)} new symbols in {mode} mode")
 
         except Exception as e:
-            self.logger.error(f"Failed to subscribe: {e}")
+            logger.error(f"Failed to subscribe: {e}")
             raise
 
     def unsubscribe_symbols(self, symbols: List[str]):
@@ -443,10 +654,13 @@ class ZerodhaBroker(BaseBroker):
             raise ValueError("WebSocket not connected")
 
         try:
-            self.websocket.unsubscribe(symbols)
-            self.logger.info(f"Unsubscribed from {len(symbols)} symbols")
+            active = self._active_subscriptions(symbols)
+            if active:
+                self.websocket.unsubscribe(active)
+                self._subscribed.difference_update(active)
+            logger.info(f"Unsubscribed from {len(active)} symbols")
         except Exception as e:
-            self.logger.error(f"Failed to unsubscribe: {e}")
+            logger.error(f"Failed to unsubscribe: {e}")
             raise
 
     # ==================== Helper Methods ====================
@@ -461,7 +675,7 @@ class ZerodhaBroker(BaseBroker):
         # Try to load existing token
         if self.load_access_token():
             if self.verify_token():
-                self.logger.info("Using existing access token")
+                logger.info("Using existing access token")
                 return self
 
         # Generate new token
@@ -565,6 +565,37 @@ def get_positions():
     return jsonify(bot_state['positions'])
 
 
+@app.route('/api/refresh')
+def refresh_account():
+    """Refresh positions, holdings, margins, orders and trades from the broker"""
+    if not strategy_executor:
+        return jsonify({'error': 'Bot is not running'}), 409
+
+    try:
+        import asyncio
+
+        # All five endpoints are requested concurrently; the refresh takes
+        # about one round-trip instead of five
+        snapshot = asyncio.run(strategy_executor.broker.get_account_snapshot(
+            'positions', 'holdings', 'margins', 'orders', 'trades'
+        ))
+
+        positions = snapshot['positions'].get('net', [])
+        bot_state['positions'] = positions
+        bot_state['trades'] = snapshot['trades']
+        bot_state['orders'] = snapshot['orders']
+        bot_state['holdings'] = snapshot['holdings']
+        bot_state['margins'] = snapshot['margins']
+        bot_state['pnl']['total'] = sum(p.get('pnl', 0.0) for p in positions)
+        bot_state['pnl']['unrealized'] = sum(p.get('unrealised', 0.0) for p in positions)
+        bot_state['last_updated'] = datetime.now().isoformat()
+
+        return jsonify(bot_state)
+    except Exception as e:
+        app.logger.error(f"Account refresh failed: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/trades')
 def get_trades():
     """Get recent trades"""
@@ -702,7 +733,7 @@ def get_supported_brokers():
     """Get list of supported brokers"""
     from src.brokers import BrokerFactory
 
-    brokers = BrokerFactory.get_supported_brokers()
+    brokers = dict(BrokerFactory.get_supported_brokers())
     return jsonify({'brokers': brokers})
 
 
@@ -1991,15 +2022,16 @@ def get_watchlist():
 
             # Generate OHLC data (will use real API later)
             ohlc_data = ohlc_gen.generate_candles(count=100, timeframe='5m')
-            current_price = ohlc_data[-1]['close']
-            prev_price = ohlc_data[-2]['close'] if len(ohlc_data) > 1 else current_price
+            closes = ohlc_data['close']
+            current_price = float(closes[-1])
+            prev_price = float(closes[-2]) if len(closes) > 1 else current_price
             price_change = current_price - prev_price
             price_change_pct = (price_change / prev_price * 100) if prev_price != 0 else 0
 
             # Detect patterns on this stock
-            # Convert ohlc list to pandas DataFrame
+            # Wrap ohlc column arrays in a pandas DataFrame
             import pandas as pd
-            df = pd.DataFrame(ohlc_data)
+            df = pd.DataFrame(ohlc_data, copy=False)
             pattern_detector = CandlestickPatternDetector(df)
             patterns = pattern_detector.get_active_patterns()
 
@@ -5,6 +5,7 @@ Handles SQLite database connection and schema initialization
 
 import sqlite3
 import os
+import threading
 from pathlib import Path
 from typing import Optional
 import logging
@@ -28,18 +29,50 @@ def get_db_connection() -> sqlite3.Connection:
 
     conn = sqlite3.connect(str(DB_PATH))
     conn.row_factory = sqlite3.Row  # Enable dict-like access
+
+    # WAL (set in init_database) keeps commits durable with NORMAL sync,
+    # avoiding an fsync per transaction
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+_thread_local = threading.local()
+
+
+def get_thread_connection() -> sqlite3.Connection:
+    """
+    Get this thread's shared connection to the SQLite database
+
+    The connection is opened and tuned once per thread and then reused, so
+    callers must not close it; wrap writes in `with conn:` to commit.
+
+    Returns:
+        sqlite3.Connection: Database connection owned by the current thread
+    """
+    conn = getattr(_thread_local, 'conn', None)
+
+    if conn is None:
+        conn = get_db_connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA cache_size=-65536')  # 64 MB page cache
+        conn.execute('PRAGMA temp_store=MEMORY')
+        _thread_local.conn = conn
+
     return conn
 
 
 def init_database() -> None:
     """
     Initialize the database with required tables
-    Creates watchlist and daily_picks tables if they don't exist
+    Creates watchlist, daily_picks and candles tables if they don't exist
     """
     conn = get_db_connection()
     cursor = conn.cursor()
 
     try:
+        # Write-ahead logging (persistent for the database file)
+        cursor.execute('PRAGMA journal_mode=WAL')
+
         # Create watchlist table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS watchlist (
@@ -68,6 +101,20 @@ def init_database() -> None:
             ON daily_picks(date)
         ''')
 
+        # Create candles table (OHLCV bars per symbol, newest read by scans)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS candles (
+                symbol VARCHAR(20) NOT NULL,
+                ts TIMESTAMP NOT NULL,
+                open REAL NOT NULL,
+                high REAL NOT NULL,
+                low REAL NOT NULL,
+                close REAL NOT NULL,
+                volume INTEGER,
+                PRIMARY KEY (symbol, ts)
+            )
+        ''')
+
         conn.commit()
         logger.info("Database initialized successfully")
 
@@ -74,7 +74,7 @@ class BreakoutStrategy:
             if has_position:
                 return None
 
-            df = historical_data.copy()
+            df = historical_data  # Only read from, no copy needed
 
             # Identify support and resistance levels
             resistance, support = self._find_support_resistance(df)
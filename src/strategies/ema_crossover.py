@@ -67,23 +67,23 @@ class EMACrossoverStrategy:
             if len(historical_data) < self.slow_period + 10:
                 return None
 
-            # Calculate EMAs
-            df = historical_data.copy()
-            df['ema_fast'] = df['close'].ewm(span=self.fast_period, adjust=False).mean()
-            df['ema_slow'] = df['close'].ewm(span=self.slow_period, adjust=False).mean()
+            # Calculate EMAs (as Series, the input frame is left untouched)
+            close = historical_data['close']
+            ema_fast = close.ewm(span=self.fast_period, adjust=False).mean()
+            ema_slow = close.ewm(span=self.slow_period, adjust=False).mean()
 
             # Get latest values
-            ema_fast_current = df['ema_fast'].iloc[-1]
-            ema_slow_current = df['ema_slow'].iloc[-1]
+            ema_fast_current = ema_fast.iat[-1]
+            ema_slow_current = ema_slow.iat[-1]
 
             # Get previous values (for crossover detection)
-            ema_fast_prev = df['ema_fast'].iloc[-2]
-            ema_slow_prev = df['ema_slow'].iloc[-2]
+            ema_fast_prev = ema_fast.iat[-2]
+            ema_slow_prev = ema_slow.iat[-2]
 
-            current_price = quote.get('last_price', df['close'].iloc[-1])
+            current_price = quote.get('last_price', close.iat[-1])
 
             # Calculate ATR for stop-loss
-            atr = self._calculate_atr(df, period=14)
+            atr = self._calculate_atr(historical_data, period=14)
             stop_loss_distance = atr * self.atr_multiplier
 
             # Detect crossover
@@ -70,14 +70,14 @@ class RSIStrategy:
             if len(historical_data) < self.rsi_period + 10:
                 return None
 
-            # Calculate RSI
-            df = historical_data.copy()
-            df['rsi'] = self._calculate_rsi(df['close'], self.rsi_period)
+            # Calculate RSI (as a Series, the input frame is left untouched)
+            close = historical_data['close']
+            rsi = self._calculate_rsi(close, self.rsi_period)
 
             # Get current values
-            rsi_current = df['rsi'].iloc[-1]
-            rsi_prev = df['rsi'].iloc[-2]
-            current_price = quote.get('last_price', df['close'].iloc[-1])
+            rsi_current = rsi.iat[-1]
+            rsi_prev = rsi.iat[-2]
+            current_price = quote.get('last_price', close.iat[-1])
 
             signal = None
 
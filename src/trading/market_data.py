@@ -96,16 +96,23 @@ class MarketDataHandler:
         symbols_to_fetch = symbols or self.symbols
         quotes = {}
 
+        # Parse exchange:symbol format
+        pairs = []
+        for symbol in symbols_to_fetch:
+            if ':' in symbol:
+                exchange, sym = symbol.split(':', 1)
+            else:
+                exchange, sym = 'NSE', symbol
+            pairs.append((sym, exchange))
+
         try:
-            for symbol in symbols_to_fetch:
-                # Parse exchange:symbol format
-                if ':' in symbol:
-                    exchange, sym = symbol.split(':', 1)
-                else:
-                    exchange, sym = 'NSE', symbol
-
-                quote = self.get_quote(sym, exchange)
+            # One batch request instead of a round-trip per symbol
+            fetched = self.broker.get_quotes(pairs)
+
+            for symbol, (sym, exchange) in zip(symbols_to_fetch, pairs):
+                quote = fetched.get(f"{exchange}:{sym}")
                 if quote:
+                    self.quotes[f"{exchange}:{sym}"] = quote
                     quotes[symbol] = quote
 
             return quotes
@@ -131,7 +138,8 @@ class MarketDataHandler:
             interval: Timeframe (minute, 5minute, 15minute, day, etc.)
             from_date: Start date
             to_date: End date
-            continuous: Whether to fetch continuous data for futures
+            continuous: Whether to fetch continuous data for futures (not yet
+                supported by the broker interface)
 
         Returns:
             DataFrame with OHLC data or None
@@ -148,14 +156,13 @@ class MarketDataHandler:
                 f"from {from_date} to {to_date}, interval: {interval}"
             )
 
-            # Fetch from broker
-            df = self.broker.get_historical_data(
+            # Fetch from broker as columns
+            df = self.broker.get_historical_df(
                 symbol=symbol,
                 exchange=exchange,
                 interval=interval,
                 from_date=from_date,
-                to_date=to_date,
-                continuous=continuous
+                to_date=to_date
             )
 
             if df is not None and not df.empty:
@@ -211,17 +211,20 @@ class StrategyExecutor:
     def _process_signals(self):
         """Process trading signals for all symbols"""
         try:
+            # Parse symbols
+            pairs = []
             for symbol_config in self.symbols:
-                # Parse symbol
                 if isinstance(symbol_config, dict):
-                    symbol = symbol_config.get('symbol')
-                    exchange = symbol_config.get('exchange', 'NSE')
+                    pairs.append((symbol_config.get('symbol'), symbol_config.get('exchange', 'NSE')))
                 else:
-                    symbol = symbol_config
-                    exchange = 'NSE'
+                    pairs.append((symbol_config, 'NSE'))
 
+            # Quotes for every symbol in one batch request per scan
+            quotes = self.market_data.get_quotes([f"{exchange}:{symbol}" for symbol, exchange in pairs])
+
+            for symbol, exchange in pairs:
                 # Generate signal
-                signal = self._generate_signal(symbol, exchange)
+                signal = self._generate_signal(symbol, exchange, quotes.get(f"{exchange}:{symbol}"))
 
                 if signal:
                     self._execute_signal(signal)
@@ -229,20 +232,19 @@ class StrategyExecutor:
         except Exception as e:
             self.logger.error(f"Error processing signals: {e}")
 
-    def _generate_signal(self, symbol: str, exchange: str) -> Optional[Dict]:
+    def _generate_signal(self, symbol: str, exchange: str, quote: Optional[Dict]) -> Optional[Dict]:
         """
         Generate trading signal for a symbol
 
         Args:
             symbol: Trading symbol
             exchange: Exchange
+            quote: Current quote, None if it could not be fetched
 
         Returns:
             Signal dict or None
         """
         try:
-            # Get current quote
-            quote = self.market_data.get_quote(symbol, exchange)
             if not quote:
                 return None
 
@@ -17,6 +17,31 @@ class EncryptionError(Exception):
     pass
 
 
+def write_private_file(file_path: Path, data: bytes):
+    """
+    Atomically replace file_path with data, readable by the owner only
+
+    The data is written to a sibling temp file created with 0600 permissions
+    and renamed over the target, so a crash never leaves a truncated file.
+
+    Args:
+        file_path: Destination file
+        data: File content
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = file_path.with_name(file_path.name + '.tmp')
+
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o600)  # In case a stale temp file had other permissions
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
 class SecureTokenStorage:
     """Securely store and retrieve access tokens with encryption"""
 
@@ -110,15 +135,8 @@ class SecureTokenStorage:
         try:
             encrypted = self.encrypt_token(token)
 
-            # Ensure parent directory exists
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Save encrypted token
-            with open(file_path, 'wb') as f:
-                f.write(encrypted)
-
-            # Secure file permissions (read/write for owner only)
-            os.chmod(file_path, 0o600)
+            # Save encrypted token, read/write for owner only
+            write_private_file(file_path, encrypted)
 
             logger.info(f"Token saved securely to {file_path}")
             return True
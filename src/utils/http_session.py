@@ -0,0 +1,40 @@
+"""
+Pooled HTTP Sessions
+Keep-alive requests sessions shared by broker clients and authentication
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _orjson_response_hook(response, *args, **kwargs):
+    """Make Response.json() parse with orjson for SDKs using the shared session"""
+    response.json = lambda **_: orjson.loads(response.content)
+    return response
+
+
+def pooled_session() -> requests.Session:
+    """
+    Pooled keep-alive session for REST calls, so only the first request to
+    a host pays the TCP and TLS handshake. Retry only covers idempotent
+    methods; order POSTs are never resent.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+    )
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    if orjson is not None:
+        # SDK clients such as KiteConnect call response.json() on this
+        # session's responses, so they parse with orjson too
+        session.hooks['response'].append(_orjson_response_hook)
+    return session
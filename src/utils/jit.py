@@ -0,0 +1,27 @@
+"""
+Optional Numba JIT Support
+Exposes njit/prange when numba is installed, no-op stand-ins otherwise
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """
+        No-op replacement for numba.njit
+
+        Supports both bare (@njit) and configured (@njit(cache=True)) usage.
+        Callers should check NUMBA_AVAILABLE and prefer a NumPy path when
+        the undecorated Python loop would be too slow.
+        """
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
@@ -7,6 +7,8 @@ import random
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 
+import numpy as np
+
 
 class OHLCGenerator:
     """Generate realistic OHLC (Open/High/Low/Close) candlestick data"""
@@ -30,6 +32,24 @@ class OHLCGenerator:
         Returns:
             dict: {time, open, high, low, close, volume}
         """
+        open_price, high_price, low_price, close_price, volume = self._next_candle()
+
+        return {
+            'time': timestamp.strftime('%Y-%m-%d %H:%M'),
+            'open': round(open_price, 2),
+            'high': round(high_price, 2),
+            'low': round(low_price, 2),
+            'close': round(close_price, 2),
+            'volume': volume
+        }
+
+    def _next_candle(self):
+        """
+        Draw the next candle's prices and volume and advance the current price
+
+        Returns:
+            tuple: (open, high, low, close, volume), prices unrounded
+        """
         # Open price
         open_price = self.current_price
 
@@ -48,39 +68,43 @@ class OHLCGenerator:
         # Update current price for next candle
         self.current_price = close_price
 
-        return {
-            'time': timestamp.strftime('%Y-%m-%d %H:%M'),
-            'open': round(open_price, 2),
-            'high': round(high_price, 2),
-            'low': round(low_price, 2),
-            'close': round(close_price, 2),
-            'volume': volume
-        }
+        return open_price, high_price, low_price, close_price, volume
 
-    def generate_candles(self, count: int = 100, timeframe: str = '5m') -> List[Dict[str, Any]]:
+    def generate_candles(self, count: int = 100, timeframe: str = '5m') -> Dict[str, np.ndarray]:
         """
-        Generate multiple OHLC candles
+        Generate multiple OHLC candles as column arrays
+
+        Columns can be wrapped directly with pd.DataFrame(candles, copy=False)
+        instead of building a frame from one dict per candle.
 
         Args:
             count: Number of candles to generate
             timeframe: Timeframe (5m, 15m, 1h, etc.)
 
         Returns:
-            list: Array of OHLC candles
+            dict: time, open, high, low, close, volume arrays of length count
         """
         # Parse timeframe
         interval_minutes = self._parse_timeframe(timeframe)
 
-        # Generate candles
-        candles = []
-        current_time = datetime.now() - timedelta(minutes=interval_minutes * count)
+        # Minute timestamps for all candles at once, formatted as 'YYYY-MM-DD HH:MM'
+        start = np.datetime64(datetime.now() - timedelta(minutes=interval_minutes * count), 'm')
+        times = start + np.arange(count) * np.timedelta64(interval_minutes, 'm')
 
+        prices = np.empty((count, 4))
+        volume = np.empty(count, dtype=np.int64)
         for i in range(count):
-            candle = self.generate_candle(current_time)
-            candles.append(candle)
-            current_time += timedelta(minutes=interval_minutes)
+            open_price, high_price, low_price, close_price, volume[i] = self._next_candle()
+            prices[i] = (round(open_price, 2), round(high_price, 2), round(low_price, 2), round(close_price, 2))
 
-        return candles
+        return {
+            'time': np.char.replace(np.datetime_as_string(times), 'T', ' ').astype(object),
+            'open': prices[:, 0],
+            'high': prices[:, 1],
+            'low': prices[:, 2],
+            'close': prices[:, 3],
+            'volume': volume
+        }
 
     def _parse_timeframe(self, timeframe: str) -> int:
         """Convert timeframe string to minutes"""
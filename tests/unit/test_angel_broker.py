@@ -0,0 +1,97 @@
+"""
+Unit Tests for Angel One Broker
+"""
+
+import struct
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.brokers.angel_broker import AngelBroker, _decode_tick
+
+
+def ltp_packet(mode=1, exchange=1, token=b'2885', ltp=250050):
+    return struct.pack('<BB25sqqq', mode, exchange, token, 7, 1700000000000, ltp)
+
+
+def quote_packet(mode=2):
+    return ltp_packet(mode=mode) + struct.pack(
+        '<qqqddqqqq', 10, 249900, 123456, 500.0, 700.0, 248000, 251000, 247500, 249000
+    )
+
+
+def snap_quote_packet():
+    depth = b''.join(
+        struct.pack('<HqqH', 0 if level < 5 else 1, 100 + level, 250000 + level, 3)
+        for level in range(10)
+    )
+    return (quote_packet(mode=3) + struct.pack('<qqd', 1700000000, 9000, 1.5) + depth
+            + struct.pack('<qqqq', 275000, 225000, 300000, 200000))
+
+
+@pytest.fixture
+def broker():
+    return AngelBroker('key', 'client')
+
+
+class TestTickDecoding:
+    """Test cases for SmartStream binary tick decoding"""
+
+    def test_ltp_packet(self, broker):
+        """LTP packets decode token and price in rupees"""
+        ticks = broker._decode_ws_message(ltp_packet())
+
+        assert ticks == [{
+            'mode': 1,
+            'exchange_type': 1,
+            'instrument_token': '2885',
+            'sequence_number': 7,
+            'exchange_timestamp': 1700000000000,
+            'last_price': 2500.5
+        }]
+
+    def test_quote_packet(self):
+        """Quote packets add volume and OHLC"""
+        tick = _decode_tick(quote_packet())
+
+        assert tick['volume'] == 123456
+        assert tick['total_sell_quantity'] == 700.0
+        assert (tick['open'], tick['high'], tick['low'], tick['close']) == (2480.0, 2510.0, 2475.0, 2490.0)
+        assert 'depth' not in tick
+
+    def test_snap_quote_packet(self):
+        """SnapQuote packets add open interest, market depth and circuit limits"""
+        tick = _decode_tick(snap_quote_packet())
+
+        assert tick['oi'] == 9000
+        assert tick['depth']['buy'][0] == {'quantity': 100, 'price': 2500.0, 'orders': 3}
+        assert len(tick['depth']['sell']) == 5
+        assert tick['upper_circuit'] == 2750.0
+        assert tick['week_52_low'] == 2000.0
+
+    def test_currency_prices(self):
+        """Currency derivative prices use the 1e7 divisor"""
+        tick = _decode_tick(ltp_packet(exchange=13, ltp=835000000))
+
+        assert tick['last_price'] == 83.5
+
+    def test_truncated_packet(self):
+        """A packet shorter than its mode's layout is rejected, not decoded as a lower mode"""
+        with pytest.raises(ValueError, match='Truncated'):
+            _decode_tick(quote_packet(mode=3))
+
+    def test_unknown_mode(self):
+        """Packets are dispatched on the mode byte"""
+        with pytest.raises(ValueError, match='mode'):
+            _decode_tick(ltp_packet(mode=9))
+
+    def test_text_frames_carry_no_ticks(self, broker):
+        """Heartbeat replies are not ticks"""
+        assert broker._decode_ws_message('pong') == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
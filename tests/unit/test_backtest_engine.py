@@ -0,0 +1,159 @@
+"""
+Unit Tests for Backtesting Engine
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.backtest.backtest_engine import BacktestEngine, TRADE_DTYPE
+
+
+@pytest.fixture
+def candles():
+    """Steadily rising 5-minute candles"""
+    close = np.linspace(100, 120, 50)
+    return pd.DataFrame({
+        'time': pd.date_range('2024-01-01 09:15', periods=50, freq='5min'),
+        'open': close,
+        'high': close + 0.5,
+        'low': close - 0.5,
+        'close': close,
+        'volume': 1000
+    })
+
+
+def buy_first_bar(data, params):
+    """Buy on the first bar with a target above the last price"""
+    if len(data) == 1:
+        return {'action': 'BUY', 'symbol': 'TEST', 'stop_loss': 95.0, 'target': params.get('target')}
+    return None
+
+
+def every_tenth_bar(data, params):
+    """Alternate BUY and CLOSE every tenth bar"""
+    idx = len(data) - 1
+    if idx % 20 == 0:
+        return {'action': 'BUY', 'symbol': 'TEST', 'target': data['close'].iloc[-1] * 1.01}
+    if idx % 20 == 10:
+        return {'action': 'CLOSE', 'symbol': 'TEST'}
+    return None
+
+
+def every_tenth_bar_vectorized(data, params):
+    """Batched equivalent of every_tenth_bar"""
+    idx = np.arange(len(data))
+    action = np.full(len(data), None, dtype=object)
+    action[idx % 20 == 0] = 'BUY'
+    action[idx % 20 == 10] = 'CLOSE'
+    return {'action': action, 'symbol': 'TEST', 'target': data['close'].to_numpy() * 1.01}
+
+
+every_tenth_bar_vectorized.vectorized = True
+
+
+class TestBacktestEngine:
+    """Test cases for BacktestEngine"""
+
+    def test_open_position_closed_at_end(self, candles):
+        """A position without exits is closed on the last bar"""
+        engine = BacktestEngine(initial_capital=100000, commission_per_trade=0)
+        result = engine.run_backtest(candles, buy_first_bar)
+
+        assert result.total_trades == 1
+        trade = result.trades[0]
+        assert trade.symbol == 'TEST'
+        assert trade.exit_reason == 'backtest_end'
+        assert trade.exit_price == pytest.approx(120.0)
+        assert trade.pnl == pytest.approx(20.0 * trade.quantity)
+        assert result.total_pnl == pytest.approx(trade.pnl)
+
+    def test_target_hit(self, candles):
+        """A long position exits at its target once the high reaches it"""
+        engine = BacktestEngine(initial_capital=100000, commission_per_trade=0)
+        result = engine.run_backtest(candles, buy_first_bar, {'target': 110.0})
+
+        trade = result.trades[0]
+        assert trade.exit_reason == 'target_hit'
+        assert trade.exit_price == pytest.approx(110.0)
+
+    def test_equity_curve_per_bar(self, candles):
+        """Equity is recorded once per candle and tracks open positions"""
+        engine = BacktestEngine(initial_capital=100000, commission_per_trade=0)
+        result = engine.run_backtest(candles, buy_first_bar)
+
+        assert len(result.equity_curve) == len(candles)
+        assert all(e['open_positions'] == 1 for e in result.equity_curve)
+        assert result.equity_curve[-1]['unrealized_pnl'] == pytest.approx(result.trades[0].pnl)
+
+    def test_trade_ledger(self, candles):
+        """Trades are stored as ledger rows and materialized once on access"""
+        engine = BacktestEngine(initial_capital=100000, commission_per_trade=0)
+        result = engine.run_backtest(candles, buy_first_bar, {'target': 110.0})
+
+        assert result.ledger.dtype == TRADE_DTYPE
+        assert result.ledger['pnl'].sum() == pytest.approx(result.total_pnl)
+        assert result.trades is result.trades
+        assert result.trades[0].entry_time == candles['time'].iloc[0]
+
+    def test_vectorized_strategy_matches_per_bar(self, candles):
+        """A vectorized strategy produces the same trades as its per-bar form"""
+        engine = BacktestEngine(initial_capital=100000)
+        expected = engine.run_backtest(candles, every_tenth_bar)
+        result = engine.run_backtest(candles, every_tenth_bar_vectorized)
+
+        assert result.total_trades == expected.total_trades > 0
+        assert result.trades == expected.trades
+        assert result.to_dict() == expected.to_dict()
+
+    def test_batch_matches_individual_runs(self, candles):
+        """Batch summaries agree with separate run_backtest calls"""
+        engine = BacktestEngine(initial_capital=100000)
+        grid = [{'target': t} for t in (None, 105.0, 110.0)]
+
+        summary, top = engine.run_backtest_batch(candles, buy_first_bar, grid, top_k=2)
+
+        for row, params in zip(summary, grid):
+            result = engine.run_backtest(candles, buy_first_bar, params)
+            assert row['total_trades'] == result.total_trades
+            assert row['total_pnl'] == pytest.approx(result.total_pnl)
+            assert row['final_capital'] == pytest.approx(result.final_capital)
+            assert row['max_drawdown'] == pytest.approx(result.max_drawdown)
+
+        assert [params for params, _ in top] == [grid[0], grid[2]]
+        assert top[0][1].total_pnl == pytest.approx(summary['total_pnl'].max())
+
+    def test_lookback_limits_history(self, candles):
+        """A per-bar strategy with a lookback only sees that many candles"""
+        seen = []
+
+        def strategy(data, params):
+            seen.append(len(data))
+            return None
+
+        strategy.lookback = 5
+        BacktestEngine().run_backtest(candles, strategy)
+
+        assert seen[:6] == [1, 2, 3, 4, 5, 5]
+        assert max(seen) == 5
+
+    def test_timezone_preserved(self, candles):
+        """Tz-aware candle times come back in their own timezone"""
+        candles['time'] = candles['time'].dt.tz_localize('Asia/Kolkata')
+        engine = BacktestEngine(initial_capital=100000, commission_per_trade=0)
+        result = engine.run_backtest(candles, buy_first_bar)
+
+        assert result.to_dict()['start_date'] == '2024-01-01T09:15:00+05:30'
+        assert result.equity['time'].equals(candles['time'])
+        assert result.trades[0].entry_time == candles['time'].iloc[0]
+        assert result.trades[0].exit_time.tzinfo is not None
+        assert result.trade_log['exit_time'].iloc[0] == candles['time'].iloc[-1]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,296 @@
+"""
+Unit Tests for Base Broker
+"""
+
+import asyncio
+import gc
+import threading
+import time
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.brokers.base_broker import BaseBroker, OrderRequest, _BatchWindow
+from src.brokers.kotak_broker import KotakBroker
+
+
+TOKENS = {'INFY': 408065, 'TCS': 2953217}
+
+
+class RecordingBroker(KotakBroker):
+    """Broker whose REST quotes and subscriptions are recorded in memory"""
+
+    def __init__(self):
+        super().__init__('key', 'secret')
+        self.fetched = []
+        self.subscribed = []
+
+    def fetch_quotes(self, symbols):
+        self.fetched.append(list(symbols))
+        return {
+            f"{exchange}:{symbol}": {'instrument_token': TOKENS[symbol], 'last_price': 100.0}
+            for symbol, exchange in symbols
+        }
+
+    def subscribe_symbols(self, symbols, mode="quote"):
+        self.subscribed.extend(symbols)
+
+    def place_order_request(self, order):
+        return {'order_id': '1', 'order': order}
+
+
+@pytest.fixture
+def broker():
+    return RecordingBroker()
+
+
+class TestQuotes:
+    """Test cases for batch quotes and the tick cache"""
+
+    def test_get_quote_uses_batch(self, broker):
+        """A single quote is one batch request keyed by EXCHANGE:SYMBOL"""
+        quote = broker.get_quote('INFY', 'NSE')
+
+        assert quote['last_price'] == 100.0
+        assert broker.fetched == [[('INFY', 'NSE')]]
+
+    def test_rest_without_websocket(self, broker):
+        """Without a WebSocket every call goes to REST and nothing is subscribed"""
+        broker.get_quotes([('INFY', 'NSE')])
+        broker.get_quotes([('INFY', 'NSE')])
+
+        assert len(broker.fetched) == 2
+        assert broker.subscribed == []
+
+    def test_streamed_ticks_replace_rest(self, broker):
+        """After the first REST quote, ticks for the subscribed token serve later calls"""
+        received = []
+        on_ticks = broker._wrap_tick_callback(lambda ws, ticks: received.extend(ticks))
+        broker._set_ws_connected(True)
+
+        first = broker.get_quotes([('INFY', 'NSE'), ('TCS', 'NSE')])
+        token = first['NSE:INFY']['instrument_token']
+        assert token in broker.subscribed
+
+        tick = {'instrument_token': token, 'last_price': 101.5}
+        on_ticks(None, [tick])
+        quotes = broker.get_quotes([('INFY', 'NSE'), ('TCS', 'NSE')])
+
+        assert received == [tick]
+        assert quotes['NSE:INFY'] is tick
+        assert broker.fetched[-1] == [('TCS', 'NSE')]
+
+    def test_disconnect_drops_ticks(self, broker):
+        """Cached ticks are not served once the WebSocket closes"""
+        on_ticks = broker._wrap_tick_callback(lambda ws, ticks: None)
+        broker._set_ws_connected(True)
+        token = broker.get_quote('INFY', 'NSE')['instrument_token']
+        on_ticks(None, [{'instrument_token': token, 'last_price': 101.5}])
+
+        broker._set_ws_connected(False)
+
+        assert broker.get_quote('INFY', 'NSE')['last_price'] == 100.0
+
+
+class TestOrders:
+    """Test cases for order requests"""
+
+    def test_place_order_builds_request(self, broker):
+        """Keyword calls reach place_order_request as one OrderRequest"""
+        response = broker.place_order('INFY', 'NSE', 'BUY', 5, order_type='LIMIT', price=1500.0, tag='scalp')
+
+        assert response['order'] == OrderRequest(
+            'INFY', 'NSE', 'BUY', 5, order_type='LIMIT', price=1500.0, tag='scalp'
+        )
+        assert response['order'].product == 'MIS'
+
+    def test_request_is_frozen(self):
+        """Order requests cannot be changed after they are built"""
+        order = OrderRequest('INFY', 'NSE', 'BUY', 5)
+
+        with pytest.raises(AttributeError):
+            order.quantity = 10
+
+
+class TestSharedClients:
+    """Test cases for clients shared per credentials"""
+
+    def test_same_credentials_share_session(self):
+        """Brokers for one account share a session; other accounts get their own"""
+        first, second = KotakBroker('key', 'secret'), KotakBroker('key', 'secret')
+        other = KotakBroker('key', 'other-secret')
+
+        assert first.http is second.http
+        assert other.http is not first.http
+
+    def test_client_released_with_last_broker(self):
+        """A shared client is rebuilt once no broker holds it"""
+        class Client:
+            pass
+
+        created = []
+
+        def factory():
+            created.append(Client())
+            return created[-1]
+
+        broker = KotakBroker('key', 'secret')
+        client = broker._shared_client(('sdk',), factory)
+        assert KotakBroker('key', 'secret')._shared_client(('sdk',), factory) is client
+
+        created.clear()
+        del client
+        gc.collect()
+        broker._shared_client(('sdk',), factory)
+
+        assert len(created) == 1
+
+
+class TestUnimplementedMethods:
+    """Test cases for generated placeholder methods"""
+
+    def test_stub_raises_with_broker_and_method(self, broker):
+        """Generated stubs name the broker and the missing method"""
+        with pytest.raises(NotImplementedError, match=r'Kotak Securities .*\(get_orders\)'):
+            broker.get_orders()
+
+    def test_stub_keeps_base_documentation(self):
+        """Generated stubs carry the BaseBroker docstring"""
+        assert KotakBroker.get_trades.__doc__ == BaseBroker.get_trades.__doc__
+
+
+class TestBatchWindow:
+    """Test cases for coalescing concurrent quote requests"""
+
+    def test_lone_request_skips_window(self, broker):
+        """With no fetch in flight a request goes upstream without waiting"""
+        broker._quote_window = _BatchWindow(broker.fetch_quotes, window=10)
+
+        quotes = broker.get_quotes([('INFY', 'NSE')])
+
+        assert set(quotes) == {'NSE:INFY'}
+
+    def test_concurrent_requests_share_one_fetch(self, broker):
+        """Callers arriving during an in-flight fetch are served by a single upstream call"""
+        release = threading.Event()
+        first_sent = threading.Event()
+
+        def fetch(symbols):
+            if not broker.fetched:
+                first_sent.set()
+                release.wait(5)
+            return broker.fetch_quotes(symbols)
+
+        window = broker._quote_window = _BatchWindow(fetch, window=0.2)
+        requests = [[('INFY', 'NSE')], [('TCS', 'NSE')], [('INFY', 'NSE'), ('TCS', 'NSE')]]
+        results = [None] * len(requests)
+
+        def request(i):
+            results[i] = broker.get_quotes(requests[i])
+
+        first = threading.Thread(target=broker.get_quotes, args=([('INFY', 'NSE')],))
+        first.start()
+        first_sent.wait(5)
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(len(requests))]
+        for thread in threads:
+            thread.start()
+        while len(window._pending) < len(requests):
+            time.sleep(0.001)
+        release.set()
+        for thread in [first] + threads:
+            thread.join()
+
+        assert len(broker.fetched) == 2
+        assert sorted(broker.fetched[1]) == [('INFY', 'NSE'), ('TCS', 'NSE')]
+        assert [sorted(r) for r in results] == [['NSE:INFY'], ['NSE:TCS'], ['NSE:INFY', 'NSE:TCS']]
+
+    def test_full_window_flushes_early(self, broker):
+        """Reaching max_symbols sends the batch without waiting out the window"""
+        broker._quote_window = _BatchWindow(broker.fetch_quotes, window=10, max_symbols=2)
+
+        quotes = broker.get_quotes([('INFY', 'NSE'), ('TCS', 'NSE')])
+
+        assert set(quotes) == {'NSE:INFY', 'NSE:TCS'}
+
+    def test_errors_reach_every_caller(self, broker):
+        """A failed batch raises in the caller"""
+        def fail(symbols):
+            raise ConnectionError('rate limited')
+
+        broker._quote_window = _BatchWindow(fail, window=0.01)
+
+        with pytest.raises(ConnectionError):
+            broker.get_quotes([('INFY', 'NSE')])
+
+
+class TestAccountSnapshot:
+    """Test cases for the concurrent account snapshot"""
+
+    def test_endpoints_run_concurrently(self, broker):
+        """All four endpoints are in flight at the same time"""
+        barrier = threading.Barrier(4, timeout=5)
+
+        def endpoint(value):
+            def call():
+                barrier.wait()
+                return value
+            return call
+
+        broker.get_positions = endpoint({'net': [], 'day': []})
+        broker.get_holdings = endpoint([])
+        broker.get_margins = endpoint({'equity': {}})
+        broker.get_profile = endpoint({'user_id': 'AB1234'})
+
+        snapshot = asyncio.run(broker.get_account_snapshot())
+
+        assert snapshot == {
+            'positions': {'net': [], 'day': []},
+            'holdings': [],
+            'margins': {'equity': {}},
+            'profile': {'user_id': 'AB1234'}
+        }
+
+    def test_selected_sections(self, broker):
+        """Only the requested endpoints are fetched"""
+        broker.get_orders = lambda: [{'order_id': '1'}]
+        broker.get_trades = lambda: []
+
+        snapshot = asyncio.run(broker.get_account_snapshot('orders', 'trades'))
+
+        assert snapshot == {'orders': [{'order_id': '1'}], 'trades': []}
+
+
+class TestBackgroundLogin:
+    """Test cases for background session generation"""
+
+    def test_is_authenticated_waits_for_login(self, broker):
+        """is_authenticated answers once the background login has finished"""
+        release = threading.Event()
+
+        def generate_session(request_token):
+            release.wait(5)
+            broker.authenticated = True
+            return {'access_token': request_token}
+
+        broker.generate_session = generate_session
+        future = broker.generate_session_background('token')
+        assert not future.done()
+
+        release.set()
+
+        assert broker.is_authenticated()
+        assert future.result() == {'access_token': 'token'}
+
+    def test_failed_login(self, broker):
+        """A failed login leaves the broker unauthenticated and keeps the error"""
+        future = broker.generate_session_background('token')
+
+        assert not broker.is_authenticated()
+        assert isinstance(future.exception(), NotImplementedError)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,48 @@
+"""
+Unit Tests for Broker Factory
+"""
+
+import subprocess
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.brokers import BrokerFactory
+
+
+class TestBrokerFactory:
+    """Test cases for BrokerFactory"""
+
+    def test_aliases_and_spelling(self):
+        """Aliases and any capitalization resolve to the same class"""
+        broker = BrokerFactory.create_broker(' Angel_One ', 'key', 'secret')
+
+        assert type(broker) is BrokerFactory.get_broker_class('angel')
+        assert BrokerFactory.is_broker_supported('KOTAK')
+
+    def test_unknown_broker(self):
+        """Unsupported names are rejected"""
+        assert not BrokerFactory.is_broker_supported('upstox')
+        with pytest.raises(ValueError):
+            BrokerFactory.create_broker('upstox', 'key', 'secret')
+
+    def test_sdks_load_on_demand(self):
+        """Importing the package loads no broker SDK until a broker is created"""
+        code = (
+            "import sys\n"
+            "import src.brokers as brokers\n"
+            "assert 'kiteconnect' not in sys.modules\n"
+            "brokers.create_broker('kotak', 'key', 'secret')\n"
+            "assert 'kiteconnect' not in sys.modules\n"
+            "brokers.ZerodhaBroker\n"
+            "assert 'kiteconnect' in sys.modules\n"
+        )
+        subprocess.run([sys.executable, '-c', code], check=True,
+                       cwd=Path(__file__).parent.parent.parent)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
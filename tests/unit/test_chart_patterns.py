@@ -0,0 +1,94 @@
+"""
+Unit Tests for Chart Pattern Detection
+Tests detector output shape and DataFrame handling
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.analysis.chart_patterns import ChartPatternDetector
+
+
+@pytest.fixture
+def sample_ohlc_data():
+    """Generate random-walk OHLCV data with a 'time' column"""
+    rng = np.random.default_rng(42)
+    num_candles = 400
+
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.02, num_candles)))
+    return pd.DataFrame({
+        'time': pd.date_range('2024-01-01 09:15', periods=num_candles, freq='5min'),
+        'open': close * (1 + rng.normal(0, 0.002, num_candles)),
+        'high': close * (1 + np.abs(rng.normal(0, 0.01, num_candles))),
+        'low': close * (1 - np.abs(rng.normal(0, 0.01, num_candles))),
+        'close': close,
+        'volume': rng.integers(1000, 5000, num_candles)
+    })
+
+
+class TestChartPatternDetector:
+    """Test cases for ChartPatternDetector"""
+
+    def test_input_frame_not_modified(self, sample_ohlc_data):
+        """Test that the caller's DataFrame is left untouched"""
+        original = sample_ohlc_data.copy()
+
+        ChartPatternDetector(sample_ohlc_data).detect_all_patterns()
+
+        pd.testing.assert_frame_equal(sample_ohlc_data, original)
+
+    def test_patterns_respect_min_confidence(self, sample_ohlc_data):
+        """Test that every returned pattern meets the confidence threshold"""
+        detector = ChartPatternDetector(sample_ohlc_data, min_confidence=0.8)
+        patterns = detector.detect_all_patterns()
+
+        assert patterns
+        assert all(p['confidence'] >= 80.0 for p in patterns)
+
+    def test_timestamps_from_time_column(self, sample_ohlc_data):
+        """Test that start/end times come from the 'time' column"""
+        patterns = ChartPatternDetector(sample_ohlc_data, min_confidence=0.5).detect_all_patterns()
+        times = set(sample_ohlc_data['time'])
+
+        for pattern in patterns:
+            assert pattern['start_time'] in times
+            assert pattern['end_time'] in times
+            assert pattern['start_time'] <= pattern['end_time']
+
+    def test_pivots_shared_across_detectors(self, sample_ohlc_data):
+        """Test that detectors on the same frame reuse pivot arrays"""
+        first = ChartPatternDetector(sample_ohlc_data, min_confidence=0.5)
+        second = ChartPatternDetector(sample_ohlc_data, min_confidence=0.9)
+
+        assert first._pivot_low_pos is second._pivot_low_pos
+        assert first._pivot_high_pos is second._pivot_high_pos
+
+    def test_dataframe_output_matches_list(self, sample_ohlc_data):
+        """Test that the DataFrame output has one row per detected pattern"""
+        detector = ChartPatternDetector(sample_ohlc_data, min_confidence=0.6)
+        patterns = detector.detect_all_patterns()
+        frame = detector.detect_all_patterns_df()
+
+        assert len(frame) == len(patterns)
+        assert list(frame['name']) == [p['name'] for p in patterns]
+
+    def test_dataframe_output_empty(self):
+        """Test empty DataFrame output when data is too short for any pattern"""
+        tiny_df = pd.DataFrame({
+            'open': [100.0, 101.0],
+            'high': [102.0, 103.0],
+            'low': [99.0, 100.0],
+            'close': [101.0, 102.0],
+            'volume': [1000, 1100]
+        })
+
+        frame = ChartPatternDetector(tiny_df).detect_all_patterns_df()
+
+        assert frame.empty
+        assert 'confidence' in frame.columns
@@ -133,6 +133,14 @@ class TestSecureTokenStorage:
             # Should be 600 (rw-------)
             assert permissions == '600', f"Expected 600, got {permissions}"
 
+    def test_save_token_replaces_file_atomically(self, storage, temp_token_file):
+        """Test that saving over an existing token leaves no temp file behind"""
+        storage.save_token("old_token", temp_token_file)
+        storage.save_token("new_token", temp_token_file)
+
+        assert storage.load_token(temp_token_file) == "new_token"
+        assert list(temp_token_file.parent.iterdir()) == [temp_token_file]
+
     def test_delete_token_success(self, storage, temp_token_file):
         """Test successful token deletion"""
         token = "test_token"
@@ -0,0 +1,84 @@
+"""
+Unit Tests for Fast Technical Indicator Kernels
+Checks the compiled kernels against the ta library they replace
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.analysis import _fast_ta
+
+ta = pytest.importorskip("ta")
+
+
+@pytest.fixture
+def ohlc():
+    """Random-walk OHLC arrays"""
+    rng = np.random.default_rng(7)
+    close = 2500 + rng.normal(0, 5, 300).cumsum()
+    high = close + np.abs(rng.normal(0, 3, 300))
+    low = close - np.abs(rng.normal(0, 3, 300))
+    return high, low, close
+
+
+class TestFastTA:
+    """Test cases for _fast_ta kernels"""
+
+    def test_rsi_matches_ta(self, ohlc):
+        """RSI equals ta's RSIIndicator, including the NaN warm-up"""
+        _, _, close = ohlc
+        expected = ta.momentum.RSIIndicator(pd.Series(close), window=14).rsi().to_numpy()
+
+        np.testing.assert_allclose(_fast_ta.rsi(close, 14), expected, rtol=1e-12)
+
+    def test_rsi_step_continues_series(self, ohlc):
+        """One incremental step reproduces the next full-series value"""
+        _, _, close = ohlc
+        alpha = 1 / 14
+        changes = np.diff(close)
+
+        avg_gain = avg_loss = 0.0
+        for change in changes[:-1]:
+            avg_gain = (1 - alpha) * avg_gain + alpha * max(change, 0.0)
+            avg_loss = (1 - alpha) * avg_loss + alpha * max(-change, 0.0)
+
+        _, _, value = _fast_ta.rsi_step(avg_gain, avg_loss, changes[-1])
+
+        assert value == pytest.approx(_fast_ta.rsi(close, 14)[-1])
+
+    def test_macd_matches_ta(self, ohlc):
+        """MACD line, signal and histogram equal ta's MACD"""
+        _, _, close = ohlc
+        expected = ta.trend.MACD(pd.Series(close))
+
+        macd, macd_signal, macd_diff = _fast_ta.macd(close)
+
+        np.testing.assert_allclose(macd, expected.macd().to_numpy(), rtol=1e-12)
+        np.testing.assert_allclose(macd_signal, expected.macd_signal().to_numpy(), rtol=1e-12)
+        np.testing.assert_allclose(macd_diff, expected.macd_diff().to_numpy(), rtol=1e-12)
+
+    def test_adx_matches_ta(self, ohlc):
+        """ADX equals ta's ADXIndicator"""
+        high, low, close = ohlc
+        expected = ta.trend.ADXIndicator(
+            pd.Series(high), pd.Series(low), pd.Series(close)
+        ).adx().to_numpy()
+
+        np.testing.assert_allclose(_fast_ta.adx(high, low, close, 14), expected, atol=1e-9)
+
+    def test_adx_rejects_short_input(self):
+        """ADX refuses series shorter than two windows"""
+        close = np.linspace(100, 110, 20)
+
+        with pytest.raises(ValueError):
+            _fast_ta.adx(close + 1, close - 1, close, 14)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,144 @@
+"""
+Unit Tests for Historical Data Cache
+"""
+
+import pytest
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.brokers.historical_cache import HistoricalDataCache, candles_frame
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+class FakeHistory:
+    """Serves 5-minute candles like Kite's historical API and records each request"""
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, symbol, from_date, to_date, interval, exchange):
+        self.requests.append((from_date.replace(tzinfo=None), to_date.replace(tzinfo=None)))
+        times = pd.date_range(from_date.replace(tzinfo=None).replace(second=0),
+                              to_date.replace(tzinfo=None), freq='5min')
+        return candles_frame([
+            [t.strftime('%Y-%m-%dT%H:%M:%S+0530'), 1, 1, 1, t.minute, 100]
+            for t in times if t.minute % 5 == 0
+        ])
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HistoricalDataCache(tmp_path)
+
+
+class TestCandlesFrame:
+    """Test cases for columnar candle parsing"""
+
+    def test_parses_candle_arrays(self):
+        """Raw candle arrays become typed columns"""
+        frame = candles_frame([
+            ['2024-01-01T09:15:00+0530', 100, 101.5, 99, 101, 1200],
+            ['2024-01-01T09:20:00+0530', 101, 102, 100.5, 101.5, 800],
+        ])
+
+        assert frame.columns.tolist() == ['date', 'open', 'high', 'low', 'close', 'volume']
+        assert frame['date'].iloc[1] == datetime(2024, 1, 1, 9, 20, tzinfo=IST)
+        assert frame['open'].dtype == 'float64'
+        assert frame['volume'].dtype == 'int64'
+
+    def test_parses_candle_dicts(self):
+        """Candles from kite.historical_data() give the same frame"""
+        frame = candles_frame([
+            {'date': datetime(2024, 1, 1, 9, 15, tzinfo=IST), 'open': 100, 'high': 101.5,
+             'low': 99, 'close': 101, 'volume': 1200},
+        ])
+
+        assert frame['date'].iloc[0] == datetime(2024, 1, 1, 9, 15, tzinfo=IST)
+        assert frame['close'].tolist() == [101.0]
+
+    def test_empty_response(self):
+        """No candles gives an empty frame with the same columns"""
+        assert candles_frame([]).columns.tolist() == ['date', 'open', 'high', 'low', 'close', 'volume']
+
+
+class TestHistoricalDataCache:
+    """Test cases for HistoricalDataCache"""
+
+    def get(self, cache, fetch, start, end):
+        return cache.get(fetch, 'INFY', start, end, '5minute', 'NSE')
+
+    def test_repeated_range_served_from_disk(self, cache):
+        """A range inside the cached one makes no request"""
+        fetch = FakeHistory()
+        first = self.get(cache, fetch, datetime(2024, 1, 1, 9, 15), datetime(2024, 1, 1, 10, 0))
+        second = self.get(cache, fetch, datetime(2024, 1, 1, 9, 30), datetime(2024, 1, 1, 9, 45))
+
+        assert len(fetch.requests) == 1
+        pd.testing.assert_frame_equal(second, first.iloc[3:7].reset_index(drop=True))
+        assert second['date'].iloc[0] == datetime(2024, 1, 1, 9, 30, tzinfo=IST)
+
+    def test_only_tail_is_fetched(self, cache):
+        """Extending the range fetches from the last cached candle onwards"""
+        fetch = FakeHistory()
+        self.get(cache, fetch, datetime(2024, 1, 1, 9, 15), datetime(2024, 1, 1, 10, 0))
+
+        candles = self.get(cache, fetch, datetime(2024, 1, 1, 9, 15), datetime(2024, 1, 1, 11, 0))
+
+        assert fetch.requests[-1] == (datetime(2024, 1, 1, 10, 0), datetime(2024, 1, 1, 11, 0))
+        assert len(candles) == 22
+        assert candles['date'].is_unique
+
+    def test_no_refetch_before_next_candle(self, cache):
+        """A to_date before the next candle is due does not hit the broker"""
+        fetch = FakeHistory()
+        self.get(cache, fetch, datetime(2024, 1, 1, 9, 15), datetime(2024, 1, 1, 10, 0))
+
+        self.get(cache, fetch, datetime(2024, 1, 1, 9, 15), datetime(2024, 1, 1, 10, 4))
+
+        assert len(fetch.requests) == 1
+
+    def test_only_head_is_fetched(self, cache):
+        """An earlier start fetches up to the start of the cached range"""
+        fetch = FakeHistory()
+        self.get(cache, fetch, datetime(2024, 1, 1, 10, 0), datetime(2024, 1, 1, 11, 0))
+
+        candles = self.get(cache, fetch, datetime(2024, 1, 1, 9, 15), datetime(2024, 1, 1, 10, 30))
+
+        assert fetch.requests[-1] == (datetime(2024, 1, 1, 9, 15), datetime(2024, 1, 1, 10, 0))
+        assert candles['date'].iloc[0] == datetime(2024, 1, 1, 9, 15, tzinfo=IST)
+        assert len(candles) == 16
+
+    def test_later_range_keeps_cached_candles(self, cache):
+        """A request past the cached range fetches the gap instead of replacing the series"""
+        fetch = FakeHistory()
+        self.get(cache, fetch, datetime(2024, 1, 1, 9, 15), datetime(2024, 1, 1, 10, 0))
+        self.get(cache, fetch, datetime(2024, 1, 1, 12, 0), datetime(2024, 1, 1, 12, 30))
+
+        candles = self.get(cache, fetch, datetime(2024, 1, 1, 9, 15), datetime(2024, 1, 1, 12, 30))
+
+        assert fetch.requests[-1] == (datetime(2024, 1, 1, 10, 0), datetime(2024, 1, 1, 12, 30))
+        assert len(fetch.requests) == 2
+        assert len(candles) == 40
+
+    def test_save_leaves_no_temp_files(self, cache, tmp_path):
+        """Writes go through a unique temp file that is renamed into place"""
+        self.get(cache, FakeHistory(), datetime(2024, 1, 1, 9, 15), datetime(2024, 1, 1, 10, 0))
+
+        assert [p.name for p in tmp_path.iterdir()] == ['NSE_INFY_5minute.feather']
+
+    def test_unknown_interval_is_not_cached(self, cache, tmp_path):
+        """Intervals without a known candle length go straight to the broker"""
+        fetch = FakeHistory()
+        cache.get(fetch, 'INFY', datetime(2024, 1, 1, 9, 15), datetime(2024, 1, 1, 10, 0), 'week', 'NSE')
+
+        assert list(tmp_path.iterdir()) == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
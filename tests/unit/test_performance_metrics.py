@@ -0,0 +1,156 @@
+"""
+Unit Tests for Performance Analyzer
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.backtest.backtest_engine import BacktestEngine
+from src.backtest.performance_metrics import PerformanceAnalyzer
+
+
+@pytest.fixture
+def result():
+    """Backtest with alternating winning and losing trades"""
+    close = np.tile([100.0, 101.0, 102.0, 101.0, 100.0, 99.0], 10)
+    candles = pd.DataFrame({
+        'time': pd.date_range('2024-01-31 09:15', periods=len(close), freq='4h'),
+        'open': close,
+        'high': close,
+        'low': close,
+        'close': close,
+        'volume': 1000
+    })
+
+    def strategy(data, params):
+        idx = len(data) - 1
+        if idx % 3 == 0:
+            return {'action': 'BUY', 'symbol': 'TEST'}
+        if idx % 3 == 2:
+            return {'action': 'CLOSE', 'symbol': 'TEST'}
+        return None
+
+    return BacktestEngine(initial_capital=100000, commission_per_trade=0).run_backtest(candles, strategy)
+
+
+class TestPerformanceAnalyzer:
+    """Test cases for PerformanceAnalyzer"""
+
+    def test_monthly_performance(self, result):
+        """Trades are grouped by the month they exited in"""
+        monthly = PerformanceAnalyzer.analyze_monthly_performance(result)
+        exit_months = pd.Series([t.exit_time.strftime('%Y-%m') for t in result.trades])
+        pnl = pd.Series([t.pnl for t in result.trades])
+
+        assert monthly['month'].tolist() == ['2024-01', '2024-02']
+        assert monthly['num_trades'].tolist() == exit_months.value_counts().sort_index().tolist()
+        assert monthly['total_pnl'].tolist() == pnl.groupby(exit_months).sum().round(2).tolist()
+
+    def test_monthly_performance_local_calendar(self):
+        """Tz-aware exits are grouped by their local month, not the UTC one"""
+        candles = pd.DataFrame({
+            'time': pd.date_range('2024-02-01 00:15', periods=3, freq='h', tz='Asia/Kolkata'),
+            'open': 100.0, 'high': 100.0, 'low': 100.0, 'close': 100.0, 'volume': 1000
+        })
+
+        def strategy(data, params):
+            return {'action': 'BUY', 'symbol': 'TEST'} if len(data) == 1 else None
+
+        result = BacktestEngine(initial_capital=100000, commission_per_trade=0).run_backtest(candles, strategy)
+        monthly = PerformanceAnalyzer.analyze_monthly_performance(result)
+
+        assert monthly['month'].tolist() == ['2024-02']
+
+    def test_trade_distribution(self, result):
+        """Distribution statistics match the trade P&L values"""
+        pnl = [t.pnl for t in result.trades]
+        distribution = PerformanceAnalyzer.analyze_trade_distribution(result)
+
+        assert distribution['pnl_mean'] == pytest.approx(np.mean(pnl))
+        assert distribution['pnl_min'] == min(pnl)
+        assert distribution['pnl_max'] == max(pnl)
+        assert distribution['pnl_75th_percentile'] == pytest.approx(np.percentile(pnl, 75))
+
+    def test_exit_reasons(self, result):
+        """Counts and P&L are grouped by exit reason"""
+        result.ledger['exit_reason'][:3] = 0  # stop_loss
+
+        reasons = PerformanceAnalyzer.analyze_exit_reasons(result)
+
+        assert reasons['counts'] == {'stop_loss': 3, 'signal': result.total_trades - 3}
+        assert reasons['total_pnl']['stop_loss'] == pytest.approx(result.ledger['pnl'][:3].sum())
+        assert reasons['avg_pnl']['signal'] == pytest.approx(result.ledger['pnl'][3:].mean())
+
+    def test_holding_periods(self, result):
+        """Every trade in the fixture is held for two 4-hour candles"""
+        periods = PerformanceAnalyzer.analyze_holding_periods(result)
+
+        assert periods['min_hours'] == periods['max_hours'] == pytest.approx(8.0)
+        assert periods['std_hours'] == pytest.approx(0.0)
+
+    def test_consecutive_streaks(self, result):
+        """Longest winning and losing runs are counted from the trade sequence"""
+        result.ledger['pnl'][:7] = [5, 5, -1, 0, -2, 3, -1]
+
+        streaks = PerformanceAnalyzer.calculate_consecutive_wins_losses(result)
+
+        assert streaks == {'max_consecutive_wins': 2, 'max_consecutive_losses': 3}
+
+    def test_trade_log(self, result):
+        """The trade log has one rounded row per trade and callers get their own copy"""
+        log = PerformanceAnalyzer.generate_trade_log(result)
+
+        assert len(log) == result.total_trades
+        assert log['trade_num'].tolist() == list(range(1, result.total_trades + 1))
+        assert log['pnl'].tolist() == [round(t.pnl, 2) for t in result.trades]
+        assert log['exit_time'].tolist() == [t.exit_time for t in result.trades]
+        assert (log['exit_reason'] == 'signal').all()
+        assert log['target'].isna().all()
+
+        log.loc[0, 'pnl'] = 0.0
+        assert PerformanceAnalyzer.generate_trade_log(result)['pnl'].iloc[0] == round(result.trades[0].pnl, 2)
+
+    def test_stream_trade_log(self, result, tmp_path):
+        """Streaming in chunks writes the same CSV as the full trade log"""
+        expected = tmp_path / 'expected.csv'
+        streamed = tmp_path / 'streamed.csv'
+        PerformanceAnalyzer.generate_trade_log(result).to_csv(expected, index=False)
+
+        PerformanceAnalyzer.stream_trade_log(result, streamed, chunk_size=7)
+
+        assert streamed.read_text() == expected.read_text()
+
+    def test_comprehensive_report_cached(self, result):
+        """The report is built once per result and each caller gets its own copy"""
+        report = PerformanceAnalyzer.generate_comprehensive_report(result)
+
+        assert report['basic_metrics'] == result.to_dict()
+        assert report['consecutive_streaks'] == PerformanceAnalyzer.calculate_consecutive_wins_losses(result)
+
+        report['basic_metrics']['total_trades'] = -1
+        assert PerformanceAnalyzer.generate_comprehensive_report(result)['basic_metrics'] == result.to_dict()
+
+    def test_no_trades(self):
+        """Analyzers return empty results without trades"""
+        empty = BacktestEngine().run_backtest(
+            pd.DataFrame({'time': pd.date_range('2024-01-01', periods=3), 'open': 1.0,
+                          'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 0}),
+            lambda data, params: None
+        )
+
+        assert PerformanceAnalyzer.analyze_monthly_performance(empty).empty
+        assert PerformanceAnalyzer.analyze_trade_distribution(empty) == {}
+        assert PerformanceAnalyzer.analyze_exit_reasons(empty) == {}
+        assert PerformanceAnalyzer.analyze_holding_periods(empty) == {}
+        assert PerformanceAnalyzer.calculate_consecutive_wins_losses(empty) == {}
+        assert PerformanceAnalyzer.generate_trade_log(empty).empty
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,185 @@
+"""
+Unit Tests for Strategy Backtester
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.backtest.strategy_runner import StrategyBacktester, _ema, _rolling_max_min, _wilder_rsi
+
+
+def buy_every_nth_bar(data, params):
+    """Per-bar strategy that buys every params['every'] bars"""
+    if (len(data) - 1) % params['every'] == 0:
+        return {'action': 'BUY', 'symbol': 'TEST', 'target': data['close'].iloc[-1] * 1.002}
+    return None
+
+
+class TestRollingMaxMin:
+    """Test cases for the breakout rolling window kernel"""
+
+    def test_matches_pandas_rolling(self):
+        """Rolling high/low equal pandas rolling max/min"""
+        rng = np.random.default_rng(3)
+        high = 100 + rng.normal(0, 1, 200).cumsum()
+        low = high - np.abs(rng.normal(0, 1, 200))
+
+        rolling_high, rolling_low = _rolling_max_min(high, low, 20)
+
+        np.testing.assert_array_equal(rolling_high, pd.Series(high).rolling(20).max().to_numpy())
+        np.testing.assert_array_equal(rolling_low, pd.Series(low).rolling(20).min().to_numpy())
+
+
+
+class TestEma:
+    """Test cases for the EMA kernel"""
+
+    def test_matches_pandas_ewm(self):
+        """EMA equals pandas ewm(span, adjust=False).mean()"""
+        close = 100 + np.random.default_rng(9).normal(0, 1, 300).cumsum()
+
+        expected = pd.Series(close).ewm(span=21, adjust=False).mean().to_numpy()
+
+        np.testing.assert_allclose(_ema(close, 21), expected, rtol=1e-12)
+
+
+class TestWilderRsi:
+    """Test cases for the Wilder RSI kernel"""
+
+    def test_matches_sma_seeded_ewm(self):
+        """RSI equals an SMA seed followed by pandas Wilder smoothing"""
+        period = 14
+        rng = np.random.default_rng(5)
+        close = pd.Series(100 + rng.normal(0, 1, 300).cumsum())
+
+        delta = close.diff()
+        averages = []
+        for moves in (delta.clip(lower=0), (-delta).clip(lower=0)):
+            seeded = moves.copy()
+            seeded.iloc[:period] = np.nan
+            seeded.iloc[period] = moves.iloc[1:period + 1].mean()
+            averages.append(seeded.ewm(alpha=1 / period, adjust=False).mean())
+        expected = 100 - 100 / (1 + averages[0] / averages[1])
+
+        rsi = _wilder_rsi(close.to_numpy(), period)
+
+        assert np.isnan(rsi[:period]).all()
+        np.testing.assert_allclose(rsi[period:], expected.to_numpy()[period:])
+
+
+
+class TestIndicatorCache:
+    """Test cases for walk-forward indicator reuse"""
+
+    @pytest.fixture
+    def candles(self):
+        """Random-walk 5-minute candles"""
+        rng = np.random.default_rng(7)
+        close = 100 + rng.normal(0, 0.5, 400).cumsum()
+        return pd.DataFrame({
+            'time': pd.date_range('2024-01-01 09:15', periods=400, freq='5min'),
+            'open': close,
+            'high': close + 0.3,
+            'low': close - 0.3,
+            'close': close,
+            'volume': 1000
+        })
+
+    def test_windows_slice_precomputed_indicators(self, candles):
+        """Windows reuse one full-series computation per indicator"""
+        backtester = StrategyBacktester()
+        backtester.precompute_indicators(candles)
+
+        for start in range(0, 300, 50):
+            backtester.backtest_ema_crossover(candles.iloc[start:start + 100])
+            backtester.backtest_rsi_strategy(candles.iloc[start:start + 100])
+
+        assert set(backtester._indicator_cache) == {('ema', 9), ('ema', 21), ('rsi', 14)}
+
+    def test_window_at_start_matches_uncached(self, candles):
+        """A window starting at the first bar gives the same result as without the cache"""
+        window = candles.iloc[:250]
+        expected = StrategyBacktester().backtest_ema_crossover(window)
+
+        backtester = StrategyBacktester()
+        backtester.precompute_indicators(candles)
+        result = backtester.backtest_ema_crossover(window)
+
+        assert result.total_trades == expected.total_trades > 0
+        assert result.to_dict() == expected.to_dict()
+
+    def test_other_data_is_not_sliced(self, candles):
+        """Data that is not a window of the precomputed series is computed directly"""
+        backtester = StrategyBacktester()
+        backtester.precompute_indicators(candles)
+
+        shifted = candles.assign(close=candles['close'] + 1)
+        backtester.backtest_rsi_strategy(shifted)
+
+        assert backtester._indicator_cache == {}
+
+
+
+class TestRunGrid:
+    """Test cases for process-parallel parameter grids"""
+
+    @pytest.fixture
+    def candles(self):
+        """Random-walk 5-minute candles"""
+        rng = np.random.default_rng(11)
+        close = 100 + rng.normal(0, 0.5, 300).cumsum()
+        return pd.DataFrame({
+            'time': pd.date_range('2024-01-01 09:15', periods=300, freq='5min'),
+            'open': close,
+            'high': close + 0.3,
+            'low': close - 0.3,
+            'close': close,
+            'volume': 1000
+        })
+
+    def test_builtin_matches_serial(self, candles):
+        """Grid results equal running each parameter set directly"""
+        backtester = StrategyBacktester()
+        grid = [{'fast_period': 5, 'slow_period': 20}, {'fast_period': 9, 'slow_period': 30}]
+
+        results = backtester.run_grid(candles, 'ema_crossover', grid, n_workers=2)
+
+        for result, params in zip(results, grid):
+            assert result.to_dict() == backtester.backtest_ema_crossover(candles, **params).to_dict()
+
+    def test_custom_strategy(self, candles):
+        """Module-level strategy functions run in the workers"""
+        backtester = StrategyBacktester()
+        grid = [{'every': 10}, {'every': 25}]
+
+        results = backtester.run_grid(candles, buy_every_nth_bar, grid, n_workers=2)
+
+        expected = [backtester.backtest_custom_strategy(candles, buy_every_nth_bar, p) for p in grid]
+        assert [r.trades for r in results] == [e.trades for e in expected]
+
+    def test_timezone_matches_serial(self, candles):
+        """Tz-aware candle times reach the workers in their own timezone"""
+        candles['time'] = candles['time'].dt.tz_localize('Asia/Kolkata')
+        backtester = StrategyBacktester()
+        grid = [{'every': 10}]
+
+        results = backtester.run_grid(candles, buy_every_nth_bar, grid, n_workers=1)
+
+        expected = backtester.backtest_custom_strategy(candles, buy_every_nth_bar, grid[0])
+        assert results[0].trades == expected.trades
+        assert results[0].to_dict() == expected.to_dict()
+
+    def test_unknown_strategy(self, candles):
+        """Unknown built-in names are rejected before starting workers"""
+        with pytest.raises(ValueError):
+            StrategyBacktester().run_grid(candles, 'macd', [{}])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,273 @@
+"""
+Unit Tests for Zerodha Broker
+"""
+
+import asyncio
+import json
+import struct
+import pytest
+import requests
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.brokers.zerodha_broker import ZerodhaBroker, _AsyncKiteSocket
+
+
+class FakeTicker:
+    """Records the frames a KiteTicker would send"""
+
+    MODE_LTP = 'ltp'
+    MODE_QUOTE = 'quote'
+    MODE_FULL = 'full'
+
+    def __init__(self):
+        self.frames = []
+
+    def subscribe(self, tokens):
+        self.frames.append(('subscribe', tokens))
+
+    def unsubscribe(self, tokens):
+        self.frames.append(('unsubscribe', tokens))
+
+    def set_mode(self, mode, tokens):
+        self.frames.append(('mode', mode, tokens))
+
+
+@pytest.fixture
+def broker():
+    broker = ZerodhaBroker('key', 'secret')
+    broker.websocket = FakeTicker()
+    return broker
+
+
+class TestSubscriptions:
+    """Test cases for batched WebSocket subscriptions"""
+
+    def test_subscribe_sends_one_frame(self, broker):
+        """The whole list goes out in one subscribe frame"""
+        broker.subscribe_symbols([1, 2, 3], mode='full')
+
+        assert broker.websocket.frames == [('subscribe', [1, 2, 3]), ('mode', 'full', [1, 2, 3])]
+
+    def test_resubscribe_only_sends_new_tokens(self, broker):
+        """Tokens already subscribed are not sent again"""
+        broker.subscribe_symbols([1, 2])
+        broker.subscribe_symbols([2, 3, 3])
+
+        assert broker.websocket.frames[2] == ('subscribe', [3])
+        assert broker._subscribed == {1, 2, 3}
+
+    def test_unsubscribe_is_idempotent(self, broker):
+        """Only subscribed tokens are unsubscribed, and only once"""
+        broker.subscribe_symbols([1, 2])
+        broker.websocket.frames.clear()
+
+        broker.unsubscribe_symbols([2, 4])
+        broker.unsubscribe_symbols([2])
+
+        assert broker.websocket.frames == [('unsubscribe', [2])]
+        assert broker._subscribed == {1}
+
+
+class TestSession:
+    """Test cases for the pooled REST session"""
+
+    def test_kite_uses_pooled_session(self, broker):
+        """Kite REST calls go through the broker's keep-alive session"""
+        assert broker.kite.reqsession is broker.http
+        assert broker.http.get_adapter('https://api.kite.trade')._pool_maxsize == 20
+
+    def test_responses_parse_json(self, broker):
+        """Responses from the session parse the same through the JSON hook"""
+        response = requests.Response()
+        response._content = b'{"status": "success", "data": {"last_price": 101.5, "volume": 12}}'
+
+        response = requests.hooks.dispatch_hook('response', broker.http.hooks, response)
+
+        assert response.json() == {'status': 'success', 'data': {'last_price': 101.5, 'volume': 12}}
+        assert broker._parse_json(b'[1, 2.5]') == [1, 2.5]
+
+
+class TestOrders:
+    """Test cases for Kite order placement"""
+
+    def test_order_request_maps_to_kite(self, broker):
+        """OrderRequest fields are passed to kite.place_order"""
+        calls = []
+        broker.kite.place_order = lambda **params: calls.append(params) or '250101000001'
+
+        response = broker.place_order('INFY', 'NSE', 'SELL', 3, product='CNC', tag='exit')
+
+        assert response == {'order_id': '250101000001', 'status': 'success'}
+        assert calls[0]['tradingsymbol'] == 'INFY'
+        assert calls[0]['product'] == 'CNC'
+        assert calls[0]['tag'] == 'exit'
+
+
+class TestInstruments:
+    """Test cases for the daily instrument token index"""
+
+    @pytest.fixture
+    def calls(self, broker, tmp_path, monkeypatch):
+        monkeypatch.setattr(ZerodhaBroker, '_instruments_cache_dir', tmp_path)
+        monkeypatch.setattr(ZerodhaBroker, '_token_index', {})
+        calls = []
+
+        def instruments(exchange):
+            calls.append(exchange)
+            return [{'tradingsymbol': 'INFY', 'instrument_token': 408065},
+                    {'tradingsymbol': 'TCS', 'instrument_token': 2953217}]
+
+        broker.kite.instruments = instruments
+        return calls
+
+    def test_dump_downloaded_once(self, broker, calls):
+        """Lookups after the first are served from the in-memory index"""
+        assert broker._get_instrument_token('INFY') == 408065
+        assert broker._get_instrument_token('TCS') == 2953217
+        assert calls == ['NSE']
+
+        with pytest.raises(ValueError):
+            broker._get_instrument_token('MISSING')
+
+    def test_index_reused_from_disk(self, broker, calls, tmp_path):
+        """A new process loads today's index from disk instead of downloading"""
+        stale = tmp_path / 'instruments_NSE_20000101.json'
+        stale.write_text('{}')
+        broker._get_instrument_token('INFY')
+        ZerodhaBroker._token_index.clear()
+
+        assert broker._get_instrument_token('TCS') == 2953217
+        assert calls == ['NSE']
+        assert not stale.exists()
+
+
+class TestAccountCache:
+    """Test cases for account state kept current by order updates"""
+
+    @pytest.fixture
+    def calls(self, broker):
+        calls = []
+        orders = [{'order_id': '1', 'status': 'OPEN', 'filled_quantity': 0}]
+        broker.kite.orders = lambda: calls.append('orders') or orders
+        broker.kite.positions = lambda: calls.append('positions') or {'net': [], 'day': []}
+        broker.kite.trades = lambda: calls.append('trades') or []
+        broker._set_ws_connected(True)
+        return calls
+
+    def test_order_updates_applied_in_place(self, broker, calls):
+        """Pushed order updates replace polling the order book"""
+        broker.get_orders()
+        broker._decode_ws_message(json.dumps({
+            'type': 'order',
+            'data': {'order_id': '2', 'status': 'OPEN', 'filled_quantity': 0}
+        }))
+
+        assert [o['order_id'] for o in broker.get_orders()] == ['1', '2']
+        assert calls == ['orders']
+
+    def test_fill_refreshes_trades_once(self, broker, calls):
+        """Trades are served from memory until an order fills; positions stay live"""
+        broker.get_orders()
+        broker.get_positions()
+        broker.get_positions()
+        broker.get_trades()
+        broker.get_trades()
+        assert calls == ['orders', 'positions', 'positions', 'trades']
+
+        broker._on_order_update({'order_id': '1', 'status': 'COMPLETE', 'filled_quantity': 5})
+        broker.get_trades()
+        broker.get_trades()
+
+        assert calls == ['orders', 'positions', 'positions', 'trades', 'trades']
+        assert broker.get_orders()[0]['status'] == 'COMPLETE'
+
+    def test_update_during_order_fetch(self, broker, calls):
+        """A REST order book that raced an order update isn't cached"""
+        def orders():
+            calls.append('orders')
+            broker._on_order_update({'order_id': '1', 'status': 'COMPLETE', 'filled_quantity': 5})
+            return [{'order_id': '1', 'status': 'OPEN', 'filled_quantity': 0}]
+
+        broker.kite.orders = orders
+        broker.get_orders()
+        broker.get_orders()
+
+        assert calls == ['orders', 'orders']
+
+    def test_rest_without_websocket(self, broker, calls):
+        """Nothing is cached once the WebSocket is down"""
+        broker._set_ws_connected(False)
+        broker.get_orders()
+        broker.get_orders()
+
+        assert calls == ['orders', 'orders']
+
+
+class FakeSocket:
+    """Records the text frames sent over an asyncio WebSocket"""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+
+class TestAsyncWebSocket:
+    """Test cases for the asyncio WebSocket path"""
+
+    def test_subscriptions_go_through_event_loop(self, broker):
+        """subscribe_symbols sends Kite frames over the async socket"""
+        from kiteconnect import KiteTicker
+
+        async def run():
+            ws = FakeSocket()
+            broker.websocket = _AsyncKiteSocket(ws, asyncio.get_running_loop(), KiteTicker('key', 'token'))
+            broker.subscribe_symbols([408065], mode='ltp')
+            await asyncio.sleep(0)
+            return ws.sent
+
+        assert asyncio.run(run()) == [
+            {'a': 'subscribe', 'v': [408065]},
+            {'a': 'mode', 'v': ['ltp', [408065]]}
+        ]
+
+    def test_decode_frames(self, broker):
+        """Binary frames decode to ticks; heartbeats and text frames carry none"""
+        from kiteconnect import KiteTicker
+
+        broker.websocket = _AsyncKiteSocket(FakeSocket(), None, KiteTicker('key', 'token'))
+        frame = struct.pack('>HHii', 1, 8, 408065, 150125)
+
+        ticks = broker._decode_ws_message(frame)
+
+        assert ticks[0]['instrument_token'] == 408065
+        assert ticks[0]['last_price'] == 1501.25
+        assert broker._decode_ws_message(b'\x00') == []
+        assert broker._decode_ws_message('{"type": "order", "data": {}}') == []
+
+    def test_missing_binary_parser(self, broker, monkeypatch):
+        """A kiteconnect without KiteTicker._parse_binary fails before connecting"""
+        from kiteconnect import KiteTicker
+        from src.utils.exceptions import BrokerConnectionError
+
+        monkeypatch.delattr(KiteTicker, '_parse_binary')
+
+        with pytest.raises(BrokerConnectionError, match='_parse_binary'):
+            asyncio.run(broker.connect_websocket_async(lambda ws, ticks: None))
+
+
+class TestSlots:
+    """Test cases for the slotted attribute layout"""
+
+    def test_no_instance_dict(self, broker):
+        """Every attribute is a declared slot"""
+        assert not hasattr(broker, '__dict__')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])